@@ -0,0 +1,169 @@
+"""분석 함수 벤치마크 (실행 시간 + 메모리).
+
+합성 데이터(benchmarks/synthetic_data.py)를 크기별로 만들고 대시보드 분석 단계를 순서대로 실행하며
+단계별 최소 실행 시간(--repeat회)과 tracemalloc 최대 메모리를 측정해 JSON으로 저장합니다.
+--compare로 이전 커밋의 결과 파일을 주면 단계별 변화율을 출력하고, 기준보다 느려진 단계가 있으면 실패합니다.
+
+    python benchmarks/analytics_bench.py --sizes 10k 100k 1m --repeat 3
+    python benchmarks/analytics_bench.py --sizes 10k 100k --compare benchmarks/results/analytics-<commit>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_data import parse_size, write_reviews_csv  # noqa: E402
+from src.analysis import build_cluster_stats, build_cube, build_strengths_weaknesses, preprocess_data  # noqa: E402
+from src.keyword_index import build_keyword_index  # noqa: E402
+from src.loader import read_reviews  # noqa: E402
+from src.tokens import tokenize_nouns  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _keyword_counts(state):
+    # 대시보드의 키워드 조회 패턴: 전체/기간별 감성 빈도표 + 상위 키워드 + 군집별 상위 키워드
+    index = build_keyword_index(state["processed_df"], state["noun_tokens"])  # 메모이즈 없는 새 인덱스
+    for sentiment in ("추천", "비추천"):
+        index.frequencies(sentiment=sentiment)
+        index.top_k(10, sentiment=sentiment, month=5)
+    for cell in index.cells.drop_duplicates(["SeatType", "sentiment", "ClusterID"]).itertuples(index=False):
+        index.top_k(8, SeatType=cell.SeatType, sentiment=cell.sentiment, ClusterID=cell.ClusterID)
+    mask = (state["processed_df"]["sentiment"] == "추천").to_numpy()
+    return state["noun_tokens"].top_k(mask, 10)
+
+
+# (이름, 함수(state) -> 결과, 결과를 저장할 state 키)
+STAGES = [
+    ("read_reviews", lambda s: read_reviews(s["path"]), "frame"),
+    ("preprocess_data", lambda s: preprocess_data(s["frame"].copy()), "processed_df"),
+    ("tokenize_nouns", lambda s: tokenize_nouns(s["processed_df"]["Nouns"]), "noun_tokens"),
+    ("build_cube", lambda s: build_cube(s["processed_df"]), "cube"),
+    ("build_keyword_index", lambda s: build_keyword_index(s["processed_df"], s["noun_tokens"]), "keyword_index"),
+    ("build_strengths_weaknesses", lambda s: build_strengths_weaknesses(s["processed_df"], s["noun_tokens"]), None),
+    ("keyword_counts", _keyword_counts, None),
+    ("build_cluster_stats", lambda s: build_cluster_stats(s["processed_df"]), None),
+]
+
+
+def dataset_path(rows: int, seed: int) -> str:
+    """크기/seed별 합성 CSV (처음 한 번만 생성하고 재사용)"""
+    path = os.path.join(DATA_DIR, f"synthetic_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        print(f"합성 데이터 생성 중: {rows:,}행 → {path}", file=sys.stderr)
+        write_reviews_csv(path + ".tmp", rows, seed=seed)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def measure_stage(fn, state, repeat: int, trace_memory: bool):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(state)
+        timings.append(time.perf_counter() - start)
+
+    peak = None
+    if trace_memory:
+        # 메모리 추적은 실행을 느리게 하므로 시간 측정과 별도로 한 번 더 실행
+        tracemalloc.start()
+        fn(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, {"seconds": min(timings), "mean_seconds": float(np.mean(timings)), "peak_bytes": peak}
+
+
+def run_size(rows: int, seed: int, repeat: int, trace_memory: bool) -> dict:
+    state = {"path": dataset_path(rows, seed)}
+    stages = {}
+    for name, fn, key in STAGES:
+        result, stats = measure_stage(fn, state, repeat, trace_memory)
+        if key:
+            state[key] = result
+        stages[name] = stats
+        peak = f", peak {stats['peak_bytes'] / 2**20:.1f}MB" if stats["peak_bytes"] is not None else ""
+        print(f"  {rows:>10,} {name:<28} {stats['seconds']:8.3f}s{peak}", file=sys.stderr)
+    return stages
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta: float = 0.01) -> list:
+    """tolerance 비율 이상, min_delta초 이상 느려진 (크기, 단계, 기준 시간, 현재 시간, 비율) 목록 반환"""
+    regressions = []
+    print(f"\n기준 {baseline.get('commit')} 대비:")
+    for size, stages in current["results"].items():
+        for name, stats in stages.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if not base:
+                continue
+            ratio = stats["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+            flag = ""
+            # 수 ms짜리 단계는 측정 노이즈가 비율로 크게 보이므로 절대 증가량도 함께 확인
+            if ratio > 1 + tolerance and stats["seconds"] - base["seconds"] > min_delta:
+                regressions.append((size, name, base["seconds"], stats["seconds"], ratio))
+                flag = " ← 느려짐"
+            print(f"  {size:>10} {name:<28} {base['seconds']:8.3f}s → {stats['seconds']:8.3f}s ({ratio:5.2f}x){flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="분석 함수 벤치마크")
+    parser.add_argument("--sizes", nargs="+", default=["10k", "100k", "1m"], help="행 수 (10k ~ 10m)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 메모리 측정 생략")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: benchmarks/results/analytics-<commit>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="--compare 시 허용 증가 비율")
+    parser.add_argument("--min-delta", type=float, default=0.01, help="--compare 시 무시할 증가량(초)")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": {},
+    }
+    for size in args.sizes:
+        rows = parse_size(size)
+        report["results"][str(rows)] = run_size(rows, args.seed, args.repeat, trace_memory=not args.no_memory)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"analytics-{commit}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"결과를 {out}에 저장했습니다.")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance, args.min_delta)
+        if regressions:
+            print(f"{len(regressions)}개 단계가 {args.tolerance:.0%} 이상 느려졌습니다.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
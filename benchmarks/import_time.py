@@ -0,0 +1,125 @@
+"""진입점(main.py, Streamlit 페이지)의 cold start import 시간 측정.
+
+각 파일의 최상위 import 문만 뽑아 새 파이썬 프로세스에서 `python -X importtime`으로 실행하고,
+최상위 모듈들의 누적 import 시간 합계를 기준값(import_budget.json)과 비교합니다.
+기준값보다 허용 비율 이상 느려지거나, 첫 사용 시점으로 미뤄 둔 무거운 모듈(DEFERRED_MODULES)이
+import 시점에 불리면 종료 코드 1로 실패합니다. 시간 기준값은 측정한 머신에 따라 다르므로 --update로 갱신합니다.
+
+    python benchmarks/import_time.py            # 측정 + 기준값과 비교
+    python benchmarks/import_time.py --update   # 현재 측정값을 기준값으로 저장
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+ENTRY_POINTS = [
+    "main.py",
+    "streamlit_app.py",
+    "pages/1_review_upload_and_analysis.py",
+    "pages/2_generate_report.py",
+]
+# 진입점 import 시점에는 불리면 안 되는 모듈 (API 호출/워드클라우드 렌더링 시 처음 import)
+DEFERRED_MODULES = ["openai", "matplotlib", "seaborn", "wordcloud", "tiktoken"]
+# import time: self [us] | cumulative | imported package
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def top_level_imports(path: str) -> str:
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in imports)
+
+
+def _importtime(code: str):
+    """code를 새 프로세스에서 실행하고 ({최상위 모듈: 누적 import 시간(초)}, import된 전체 모듈 이름) 반환"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import 실패:\n{result.stderr[-2000:]}")
+
+    modules, imported = {}, set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        imported.add(match.group(4))
+        # 들여쓰기가 없는 줄이 최상위 import (누적 시간에 하위 모듈 포함)
+        if not match.group(3):
+            modules[match.group(4)] = int(match.group(2)) / 1e6
+    return modules, imported
+
+
+def measure(path: str, startup_modules=frozenset()) -> dict:
+    """진입점 하나의 import 시간(초). {"total": 합계, "modules": {최상위 모듈: 누적 시간}, "deferred": [...]}"""
+    modules, imported = _importtime(top_level_imports(path))
+    modules = {
+        module: seconds for module, seconds in modules.items()
+        if module not in startup_modules  # 인터프리터 시작 시 항상 불리는 모듈(site 등) 제외
+    }
+    deferred = [module for module in DEFERRED_MODULES if module in imported]
+    return {"total": sum(modules.values()), "modules": modules, "deferred": deferred}
+
+
+def best_of(path: str, repeat: int, startup_modules=frozenset()) -> dict:
+    # 디스크 캐시/스케줄링 노이즈를 줄이기 위해 가장 빠른 측정값 사용
+    return min((measure(path, startup_modules) for _ in range(repeat)), key=lambda m: m["total"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="진입점 import 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="기준값 대비 허용 증가 비율")
+    parser.add_argument("--update", action="store_true", help="측정값을 기준값으로 저장")
+    parser.add_argument("--top", type=int, default=5, help="진입점마다 출력할 느린 모듈 수")
+    args = parser.parse_args(argv)
+
+    budget = {}
+    if os.path.exists(BUDGET_PATH):
+        with open(BUDGET_PATH, encoding="utf-8") as f:
+            budget = json.load(f)
+
+    startup_modules = frozenset(_importtime("pass")[0])
+    results, failed = {}, []
+    for path in ENTRY_POINTS:
+        measured = best_of(path, args.repeat, startup_modules)
+        results[path] = round(measured["total"], 3)
+        line = f"{path}: {measured['total']:.3f}s"
+        if path in budget:
+            limit = budget[path] * (1 + args.tolerance)
+            line += f" (기준 {budget[path]:.3f}s, 한도 {limit:.3f}s)"
+            if measured["total"] > limit and not args.update:
+                failed.append(path)
+                line += " ← 느려짐"
+        if measured["deferred"]:
+            failed.append(path)
+            line += f" ← import 시점에 불림: {', '.join(measured['deferred'])}"
+        print(line)
+        slowest = sorted(measured["modules"].items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for module, seconds in slowest:
+            print(f"    {module}: {seconds:.3f}s")
+
+    if args.update:
+        with open(BUDGET_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"기준값을 {BUDGET_PATH}에 저장했습니다.")
+        return 0
+
+    if failed:
+        print(f"import 시간 검사에 실패한 진입점: {', '.join(dict.fromkeys(failed))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
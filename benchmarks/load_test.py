@@ -0,0 +1,236 @@
+"""리포트 생성 경로 부하 테스트.
+
+목 서버(benchmarks/mock_openai.py)를 띄우고(또는 --endpoint로 지정한 서버에 대해) 동시성 단계별로
+처리량, 지연 시간 p50/p95/p99, 에러 비율을 측정합니다.
+
+경로:
+    library   get_report_from_gpt_async (단건 완성 응답)
+    stream    stream_report_from_gpt_async (첫 토큰까지 시간 TTFT도 측정)
+    reports   generate_reports_async (CSV → 마케팅/서비스 리포트 2건)
+    cli       python main.py report <csv> (프로세스 실행 전체)
+
+    python benchmarks/load_test.py --paths library stream --concurrency 1 4 16 --requests 64
+    python benchmarks/load_test.py --rate-429 0.1 --json load_test.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.mock_openai import build_parser as mock_parser, config_from_args, serve_in_background  # noqa: E402
+
+PATHS = ["library", "stream", "reports", "cli"]
+SAMPLE_REVIEWS = {
+    "yes": ["comfortable seat", "friendly crew", "great food", "clean cabin", "good value", "on time"],
+    "no": ["delayed flight", "rude staff", "cramped seat", "cold meal", "lost baggage", "broken screen"],
+}
+
+
+def write_sample_csv(path: str, rows: int = 200, seed: int = 0):
+    """cli/reports 경로용 작은 리뷰 CSV"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("SeatType,Recommended,ClusterID,Adjectives/Adverbs\n")
+        for _ in range(rows):
+            recommended = rng.choice(("yes", "no"))
+            review = " ".join(rng.sample(SAMPLE_REVIEWS[recommended], 2))
+            f.write(f"{rng.choice(('Economy Class', 'Business Class'))},{recommended},{rng.randint(0, 3)},{review}\n")
+
+
+def summarize(latencies: list, errors: int, duration: float, ttfts: list = None) -> dict:
+    ok = np.asarray(latencies, dtype=float)
+    total = len(latencies) + errors
+    result = {
+        "requests": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "duration_s": duration,
+        "throughput_rps": len(latencies) / duration if duration else 0.0,
+    }
+    for q in (50, 95, 99):
+        result[f"p{q}_s"] = float(np.percentile(ok, q)) if len(ok) else None
+    if ttfts is not None:
+        ttft = np.asarray(ttfts, dtype=float)
+        for q in (50, 95):
+            result[f"ttft_p{q}_s"] = float(np.percentile(ttft, q)) if len(ttft) else None
+    return result
+
+
+async def _run_async(make_call, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, ttfts, errors = [], [], []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                ttft = await make_call(i, start)
+            except Exception as e:
+                errors.append(type(e).__name__)
+                return
+            latencies.append(time.perf_counter() - start)
+            if ttft is not None:
+                ttfts.append(ttft)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, ttfts, errors, time.perf_counter() - start
+
+
+def run_library(requests: int, concurrency: int, csv_path: str) -> dict:
+    from src.gpt_client import get_report_from_gpt_async, run_sync
+
+    async def call(i, start):
+        # 요청마다 프롬프트를 다르게 해서 캐시/중복 제거 영향을 배제
+        await get_report_from_gpt_async(f"부하 테스트 요청 {i}: 좌석 리뷰를 요약해주세요.", use_cache=False)
+
+    latencies, _, errors, duration = run_sync(_run_async(call, requests, concurrency))
+    return summarize(latencies, len(errors), duration) | {"error_types": _count(errors)}
+
+
+def run_stream(requests: int, concurrency: int, csv_path: str) -> dict:
+    from src.gpt_client import run_sync, stream_report_from_gpt_async
+
+    async def call(i, start):
+        ttft = None
+        async for _ in stream_report_from_gpt_async(f"부하 테스트 스트리밍 요청 {i}", use_cache=False):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+        return ttft
+
+    latencies, ttfts, errors, duration = run_sync(_run_async(call, requests, concurrency))
+    return summarize(latencies, len(errors), duration, ttfts) | {"error_types": _count(errors)}
+
+
+def run_reports(requests: int, concurrency: int, csv_path: str) -> dict:
+    from src.gpt_client import run_sync
+    from src.report_generator import generate_reports_async
+
+    async def call(i, start):
+        await generate_reports_async(csv_path, use_cache=False)
+
+    latencies, _, errors, duration = run_sync(_run_async(call, requests, concurrency))
+    return summarize(latencies, len(errors), duration) | {"error_types": _count(errors)}
+
+
+def run_cli(requests: int, concurrency: int, csv_path: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+
+    def one(i):
+        # 리포트 파일이 겹치지 않도록 실행마다 별도 작업 디렉터리 사용
+        with tempfile.TemporaryDirectory() as workdir:
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "report", csv_path],
+                                    cwd=workdir, env=env, capture_output=True, text=True)
+            return time.perf_counter() - start, result.returncode
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(one, range(requests)))
+    duration = time.perf_counter() - start
+    latencies = [latency for latency, code in outcomes if code == 0]
+    errors = [code for _, code in outcomes if code != 0]
+    return summarize(latencies, len(errors), duration) | {"error_types": _count(f"exit {c}" for c in errors)}
+
+
+RUNNERS = {"library": run_library, "stream": run_stream, "reports": run_reports, "cli": run_cli}
+
+
+def _count(items) -> dict:
+    counts = {}
+    for item in items:
+        counts[item] = counts.get(item, 0) + 1
+    return counts
+
+
+def _fmt(value) -> str:
+    return "-" if value is None else f"{value * 1000:.0f}ms"
+
+
+def print_table(rows: list):
+    print(f"{'path':<8} {'conc':>4} {'req':>5} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'ttft50':>8} {'err%':>6}")
+    for row in rows:
+        print(f"{row['path']:<8} {row['concurrency']:>4} {row['requests']:>5} {row['throughput_rps']:>7.2f} "
+              f"{_fmt(row['p50_s']):>8} {_fmt(row['p95_s']):>8} {_fmt(row['p99_s']):>8} "
+              f"{_fmt(row.get('ttft_p50_s')):>8} {row['error_rate'] * 100:>5.1f}%")
+
+
+def build_parser():
+    # 목 서버 옵션(--latency-ms, --rate-429 등)을 그대로 받음
+    parser = argparse.ArgumentParser(description="리포트 생성 경로 부하 테스트", parents=[mock_parser()],
+                                     conflict_handler="resolve")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--endpoint", help="목 서버 대신 사용할 엔드포인트 (지정 시 목 서버를 띄우지 않음)")
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=["library", "stream", "reports"])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="동시성 단계마다 보낼 요청 수 (cli는 실행 횟수)")
+    parser.add_argument("--csv", help="reports/cli 경로에 사용할 CSV (없으면 작은 샘플 생성)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    server = None
+    if args.endpoint:
+        os.environ["AZURE_OPENAI_ENDPOINT"] = args.endpoint
+    else:
+        server = serve_in_background(config_from_args(args), host=args.host, port=args.port)
+        os.environ.update({
+            "AZURE_OPENAI_ENDPOINT": server.url,
+            "AZURE_OPENAI_API_KEY": "mock",
+            "AZURE_OPENAI_API_VERSION": os.getenv("AZURE_OPENAI_API_VERSION", "2025-01-01-preview"),
+            "AZURE_OPENAI_DEPLOYMENT": os.getenv("AZURE_OPENAI_DEPLOYMENT", "mock-deployment"),
+        })
+    # 캐시 적중으로 측정이 왜곡되지 않도록 (cli 하위 프로세스 포함) 응답 캐시 우회
+    os.environ["REVIEWDOCTOR_LLM_CACHE_BYPASS"] = "1"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(tmp, "load_test_reviews.csv")
+            write_sample_csv(csv_path)
+
+        rows = []
+        for path in args.paths:
+            for concurrency in args.concurrency:
+                before = server.stats.snapshot() if server else None
+                row = {"path": path, "concurrency": concurrency}
+                row.update(RUNNERS[path](args.requests, concurrency, os.path.abspath(csv_path)))
+                if server:
+                    after = server.stats.snapshot()
+                    row["server_status_counts"] = {
+                        str(status): count - before["status_counts"].get(status, 0)
+                        for status, count in after["status_counts"].items()
+                    }
+                rows.append(row)
+                print(f"{path} 동시성 {concurrency}: {row['throughput_rps']:.2f} req/s, "
+                      f"p95 {_fmt(row['p95_s'])}, 에러 {row['errors']}건", file=sys.stderr)
+
+    print_table(rows)
+    if args.json:
+        config = {"endpoint": args.endpoint} if args.endpoint else vars(server.config)
+        report = {"config": config, "results": rows}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"결과를 {args.json}에 저장했습니다.")
+    if server:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""Azure OpenAI 호환 chat completions 목(mock) 서버.
+
+실제 Azure 엔드포인트 없이 리포트 생성 경로를 측정/테스트하기 위한 로컬 서버입니다.
+`AZURE_OPENAI_ENDPOINT`를 이 서버 주소로 바꾸면 src.gpt_client가 그대로 이 서버를 호출합니다.
+
+    python benchmarks/mock_openai.py --port 8000 --latency-ms 300 --tokens-per-second 80 --rate-429 0.05
+    AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8000 python main.py report
+
+응답 지연(첫 토큰까지 시간)은 분포(fixed/normal/lognormal/exponential)에서 뽑고,
+이후 토큰은 tokens-per-second 속도로 보냅니다. 설정한 비율만큼 429(Retry-After 포함)/500/503 에러를 돌려줍니다.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# /openai/deployments/<배포 이름>/chat/completions (Azure) 또는 /v1/chat/completions (OpenAI)
+_CHAT_PATH = re.compile(r"^/(?:openai/deployments/(?P<deployment>[^/]+)|v1)/chat/completions$")
+_WORDS = ("좌석", "승무원", "서비스", "기내식", "라운지", "지연", "편안함", "가격", "만족", "개선",
+          "추천", "청결", "수하물", "엔터테인먼트", "친절")
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 200.0           # 첫 토큰까지 평균 지연
+    latency_dist: str = "lognormal"     # fixed / normal / lognormal / exponential
+    latency_jitter: float = 0.3         # normal/lognormal의 상대 표준편차
+    tokens_per_second: float = 100.0    # 생성 속도 (0이면 지연 없이 한 번에)
+    completion_tokens: int = 200        # 응답 토큰 수 (요청의 max_tokens가 더 작으면 그 값)
+    rate_429: float = 0.0               # 429 비율
+    rate_5xx: float = 0.0               # 500/503 비율
+    retry_after: float = 1.0            # 429 응답의 Retry-After(초)
+    seed: int = None
+
+    def sample_latency(self, rng: random.Random) -> float:
+        mean = self.latency_ms / 1000
+        if mean <= 0 or self.latency_dist == "fixed":
+            return max(mean, 0.0)
+        if self.latency_dist == "normal":
+            return max(0.0, rng.gauss(mean, mean * self.latency_jitter))
+        if self.latency_dist == "exponential":
+            return rng.expovariate(1 / mean)
+        # lognormal: 평균이 mean이 되도록 mu 보정
+        sigma = self.latency_jitter
+        return rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+
+
+class MockStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.status_counts = {}
+
+    def record(self, status: int):
+        with self._lock:
+            self.requests += 1
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "status_counts": dict(self.status_counts)}
+
+
+def _fake_tokens(n: int, rng: random.Random) -> list:
+    return [f"{rng.choice(_WORDS)} " for _ in range(n)]
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (SDK 커넥션 풀 재사용)
+    server_version = "MockOpenAI/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stats.record(status)
+
+    def _error(self, status: int, message: str, headers: dict = None):
+        self._send_json(status, {"error": {"code": str(status), "message": message}}, headers)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b"{}"
+        match = _CHAT_PATH.match(self.path.split("?", 1)[0])
+        if not match:
+            self._error(404, f"unknown path {self.path}")
+            return
+        try:
+            body = json.loads(raw)
+        except json.JSONDecodeError:
+            self._error(400, "invalid JSON body")
+            return
+
+        config, rng = self.server.config, self.server.rng()
+        roll = rng.random()
+        if roll < config.rate_429:
+            self._error(429, "Rate limit is exceeded. (mock)", {"Retry-After": f"{config.retry_after:g}"})
+            return
+        if roll < config.rate_429 + config.rate_5xx:
+            status = rng.choice((500, 503))
+            self._error(status, "The server had an error while processing your request. (mock)")
+            return
+
+        model = match.group("deployment") or body.get("model", "mock")
+        messages = body.get("messages", [])
+        prompt_tokens = sum(len(str(m.get("content", ""))) // 2 + 1 for m in messages)
+        completion_tokens = min(config.completion_tokens, body.get("max_tokens") or config.completion_tokens)
+        tokens = _fake_tokens(completion_tokens, rng)
+        time.sleep(config.sample_latency(rng))
+
+        if body.get("stream"):
+            self._stream(model, tokens, config)
+        else:
+            if config.tokens_per_second > 0:
+                time.sleep(len(tokens) / config.tokens_per_second)
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(tokens),
+                    "total_tokens": prompt_tokens + len(tokens),
+                },
+            })
+
+    def _stream(self, model: str, tokens: list, config: MockConfig):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")  # 스트림 길이를 모르므로 연결 종료로 끝을 알림
+        self.end_headers()
+        self.close_connection = True
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        interval = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+
+        def send(delta: dict, finish_reason=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            send({"role": "assistant", "content": ""})
+            for i, token in enumerate(tokens):
+                if i and interval:
+                    time.sleep(interval)
+                send({"content": token})
+            send({}, finish_reason="stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 스트림을 중간에 끊음
+        self.server.stats.record(200)
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: MockConfig):
+        super().__init__(address, MockHandler)
+        self.config = config
+        self.stats = MockStats()
+        self._seed = random.Random(config.seed)
+        self._seed_lock = threading.Lock()
+
+    def rng(self) -> random.Random:
+        # 요청(스레드)마다 별도 난수 생성기 (seed를 주면 요청 순서 기준으로 재현 가능)
+        with self._seed_lock:
+            return random.Random(self._seed.random())
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve_in_background(config: MockConfig = None, host: str = "127.0.0.1", port: int = 0) -> MockOpenAIServer:
+    """백그라운드 스레드에서 서버를 띄우고 반환합니다. (port=0이면 빈 포트 사용, 종료는 server.shutdown())"""
+    server = MockOpenAIServer((host, port), config or MockConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Azure OpenAI 호환 목 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=MockConfig.latency_ms)
+    parser.add_argument("--latency-dist", choices=["fixed", "normal", "lognormal", "exponential"],
+                        default=MockConfig.latency_dist)
+    parser.add_argument("--latency-jitter", type=float, default=MockConfig.latency_jitter)
+    parser.add_argument("--tokens-per-second", type=float, default=MockConfig.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=MockConfig.completion_tokens)
+    parser.add_argument("--rate-429", type=float, default=MockConfig.rate_429)
+    parser.add_argument("--rate-5xx", type=float, default=MockConfig.rate_5xx)
+    parser.add_argument("--retry-after", type=float, default=MockConfig.retry_after)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_jitter=args.latency_jitter,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    server = MockOpenAIServer((args.host, args.port), config_from_args(args))
+    print(f"mock OpenAI 서버 실행 중: {server.url} (AZURE_OPENAI_ENDPOINT로 지정)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats.snapshot(), ensure_ascii=False))
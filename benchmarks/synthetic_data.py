@@ -0,0 +1,153 @@
+"""대시보드 입력과 같은 형식의 합성 리뷰 데이터 생성기.
+
+좌석별 추천 비율, 추천 여부에 따른 서비스 평점 분포, 빈도가 Zipf 분포를 따르는 명사 어휘 등
+실제 데이터와 비슷한 분포로 SeatType, Recommended, TypeOfTraveller, Nouns, Adjectives/Adverbs,
+TargetFeature, ClusterID, 5개 서비스 평점, OverallRating 컬럼을 만듭니다.
+
+    python benchmarks/synthetic_data.py --rows 1m --out data/synthetic_1m.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.analysis import SERVICE_COLUMNS  # noqa: E402
+
+SEAT_TYPES = ['Economy Class', 'Premium Economy', 'Business Class', 'First Class']
+SEAT_SHARES = [0.55, 0.15, 0.25, 0.05]
+# 좌석별 추천(yes) 비율
+RECOMMEND_RATE = [0.45, 0.5, 0.65, 0.7]
+TRAVELLER_TYPES = ['Solo Leisure', 'Couple Leisure', 'Family Leisure', 'Business']
+TRAVELLER_SHARES = [0.3, 0.3, 0.2, 0.2]
+CLUSTERS_PER_SEGMENT = 3
+# 서비스 항목별 결측 비율 (기내 엔터테인먼트는 단거리 노선 등에서 자주 비어 있음)
+MISSING_RATE = {'SeatComfort': 0.02, 'CabinStaffService': 0.02, 'Food&Beverages': 0.1,
+                'GroundService': 0.05, 'InflightEntertainment': 0.2}
+
+BASE_NOUNS = [
+    'seat', 'food', 'staff', 'crew', 'legroom', 'meal', 'service', 'delay', 'entertainment', 'lounge',
+    'wifi', 'boarding', 'baggage', 'check-in', 'flight', 'cabin', 'screen', 'drink', 'blanket', 'pillow',
+    'toilet', 'space', 'aisle', 'window', 'upgrade', 'price', 'ticket', 'gate', 'connection', 'transfer',
+    'bed', 'recline', 'noise', 'temperature', 'movie', 'menu', 'wine', 'coffee', 'breakfast', 'dinner',
+    'attendant', 'pilot', 'announcement', 'queue', 'security', 'app', 'website', 'refund', 'compensation',
+    'schedule', 'aircraft', 'cleanliness', 'amenity', 'kit', 'headphone', 'charger', 'socket', 'tray', 'snack',
+]
+POSITIVE_ADJECTIVES = ['comfortable', 'friendly', 'delicious', 'clean', 'spacious', 'helpful', 'quick',
+                       'excellent', 'attentive', 'smooth', 'great', 'pleasant']
+NEGATIVE_ADJECTIVES = ['uncomfortable', 'rude', 'cold', 'dirty', 'cramped', 'slow', 'poor', 'broken',
+                       'delayed', 'noisy', 'bland', 'disappointing']
+
+
+def parse_size(text: str) -> int:
+    """"10k", "1m", "2500000" 형식의 행 수"""
+    text = str(text).strip().lower().replace("_", "")
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+def _noun_vocabulary(size: int) -> np.ndarray:
+    tail = [f"{BASE_NOUNS[i % len(BASE_NOUNS)]}{i}" for i in range(max(size - len(BASE_NOUNS), 0))]
+    return np.array(BASE_NOUNS[:size] + tail, dtype=object)
+
+
+def _join_columns(parts: list, lengths: np.ndarray, sep: str = ", ") -> np.ndarray:
+    """parts[j][i]를 행 i의 앞쪽 lengths[i]개만 sep로 이어 붙임 (object 배열 연산으로 벡터화)"""
+    result = np.full(len(lengths), "", dtype=object)
+    for j, part in enumerate(parts):
+        has = lengths > j
+        if j == 0:
+            result[has] = part[has]
+        else:
+            result[has] = result[has] + sep + part[has]
+    return result
+
+
+def generate_reviews(rows: int, seed: int = 0, vocab_size: int = 2000, start: int = 0) -> pd.DataFrame:
+    """합성 리뷰 DataFrame. 같은 (rows, seed, start)면 항상 같은 결과"""
+    rng = np.random.default_rng([seed, start])
+    seat_idx = rng.choice(len(SEAT_TYPES), size=rows, p=SEAT_SHARES)
+    recommended = rng.random(rows) < np.asarray(RECOMMEND_RATE)[seat_idx]
+    cluster = rng.integers(0, CLUSTERS_PER_SEGMENT, size=rows)
+
+    # 서비스 평점: 추천 여부에 따라 평균이 다르고, 클러스터마다 약한 편차, 상위 좌석일수록 약간 높음
+    base = np.where(recommended, 4.0, 2.2)[:, None]
+    seat_bonus = (seat_idx * 0.15)[:, None]
+    # 클러스터 성향은 청크(start)와 무관하게 seed로만 정해 파일 전체에서 일관되게 유지
+    cluster_profile = np.random.default_rng(seed).normal(0, 0.4, size=(CLUSTERS_PER_SEGMENT, len(SERVICE_COLUMNS)))
+    cluster_offset = cluster_profile[cluster]
+    ratings = np.clip(np.rint(base + seat_bonus + cluster_offset + rng.normal(0, 0.9, size=(rows, len(SERVICE_COLUMNS)))), 1, 5)
+    overall = np.clip(np.rint(ratings.mean(axis=1) * 2 + rng.normal(0, 1.0, rows)), 1, 10)
+
+    frame = pd.DataFrame({
+        'SeatType': np.asarray(SEAT_TYPES, dtype=object)[seat_idx],
+        'Recommended': np.where(recommended, 'yes', 'no').astype(object),
+        'TypeOfTraveller': np.asarray(TRAVELLER_TYPES, dtype=object)[rng.choice(len(TRAVELLER_TYPES), size=rows, p=TRAVELLER_SHARES)],
+    })
+    for i, col in enumerate(SERVICE_COLUMNS):
+        values = ratings[:, i].astype(np.float32)
+        values[rng.random(rows) < MISSING_RATE[col]] = np.nan
+        frame[col] = values
+    frame['OverallRating'] = overall.astype(np.float32)
+
+    # 가장 낮은(비추천) / 높은(추천) 평점 항목을 리뷰의 주요 관심 항목으로 사용
+    filled = np.nan_to_num(ratings, nan=3.0)
+    target = np.where(recommended, filled.argmax(axis=1), filled.argmin(axis=1))
+    frame['TargetFeature'] = np.asarray(SERVICE_COLUMNS, dtype=object)[target]
+    frame['ClusterID'] = cluster
+
+    # 명사: 행마다 0~8개, Zipf 분포로 자주 나오는 단어와 드문 단어가 섞이게 함
+    vocab = _noun_vocabulary(vocab_size)
+    max_nouns = 8
+    noun_counts = np.minimum(rng.poisson(3, rows), max_nouns)
+    noun_ids = (rng.zipf(1.3, size=(rows, max_nouns)) - 1) % len(vocab)
+    frame['Nouns'] = _join_columns([vocab[noun_ids[:, j]] for j in range(max_nouns)], noun_counts)
+
+    # 형용사/부사: "형용사(서비스 항목)" 1~3개 (원본 데이터의 TopAdjectives 형식)
+    max_adjectives = 3
+    adjective_counts = rng.integers(1, max_adjectives + 1, rows)
+    positive = np.asarray([f"{a}({c})" for c in SERVICE_COLUMNS for a in POSITIVE_ADJECTIVES], dtype=object)
+    negative = np.asarray([f"{a}({c})" for c in SERVICE_COLUMNS for a in NEGATIVE_ADJECTIVES], dtype=object)
+    parts = []
+    for _ in range(max_adjectives):
+        pos_pick = positive[rng.integers(0, len(positive), rows)]
+        neg_pick = negative[rng.integers(0, len(negative), rows)]
+        # 추천 리뷰에도 가끔 부정 표현이, 비추천 리뷰에도 가끔 긍정 표현이 섞임
+        flip = rng.random(rows) < 0.15
+        parts.append(np.where(recommended ^ flip, pos_pick, neg_pick))
+    frame['Adjectives/Adverbs'] = _join_columns(parts, adjective_counts)
+
+    frame.index = pd.RangeIndex(start, start + rows)
+    return frame
+
+
+def write_reviews_csv(path: str, rows: int, seed: int = 0, chunk_rows: int = 1_000_000, vocab_size: int = 2000):
+    """대용량도 메모리에 다 올리지 않도록 chunk_rows씩 생성해서 이어 씁니다."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for start in range(0, rows, chunk_rows):
+            chunk = generate_reviews(min(chunk_rows, rows - start), seed=seed, vocab_size=vocab_size, start=start)
+            chunk.to_csv(f, index=False, header=start == 0)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 리뷰 CSV 생성")
+    parser.add_argument("--rows", default="10k", help="행 수 (예: 10k, 1m, 10m)")
+    parser.add_argument("--out", help="저장 경로 (기본: data/synthetic_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vocab-size", type=int, default=2000, help="명사 어휘 크기")
+    args = parser.parse_args(argv)
+
+    rows = parse_size(args.rows)
+    out = args.out or os.path.join("data", f"synthetic_{args.rows}.csv")
+    write_reviews_csv(out, rows, seed=args.seed, vocab_size=args.vocab_size)
+    print(f"{rows:,}행을 {out}에 저장했습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,205 @@
-from src.report_generator import generate_reports
+import argparse
+import os
 
-if __name__ == "__main__":
-    marketing, service = generate_reports("data/adjectives_with_service_ratings.csv")
+DATA_PATH = "data/adjectives_with_service_ratings.csv"
+REPORT_FILES = {"marketing": "marketing_report.txt", "service": "service_report.txt"}
+
+
+def run_report(args):
+    from src.report_generator import build_report_prompts, build_summary_prompts, stream_prompts
 
-    with open("marketing_report.txt", "w", encoding="utf-8") as f:
-        f.write(marketing)
+    if args.summarize:
+        print("전체 리뷰 요약 중...")
+        prompts = build_summary_prompts(args.csv)
+    else:
+        prompts = build_report_prompts(args.csv)
+    for report_type, prompt in prompts.items():
+        print(f"{report_type} 프롬프트: {prompt.token_count} 토큰, 리뷰 {prompt.review_count}/{prompt.total_reviews}개 사용")
 
-    with open("service_report.txt", "w", encoding="utf-8") as f:
-        f.write(service)
+    # 임시 파일에 스트리밍한 뒤 다 받으면 교체 (중간에 실패해도 이전 리포트 파일은 그대로 남음)
+    files = {report_type: open(path + ".tmp", "w", encoding="utf-8") for report_type, path in REPORT_FILES.items()}
+    completed = False
+    try:
+        # 토큰이 도착하는 대로 각 리포트 파일에 바로 기록
+        for report_type, token in stream_prompts(prompts):
+            f = files[report_type]
+            if f.tell() == 0:
+                print(f"{REPORT_FILES[report_type]} 작성 시작...")
+            f.write(token)
+            f.flush()
+        completed = True
+    finally:
+        for f in files.values():
+            f.close()
+        for path in REPORT_FILES.values():
+            if completed:
+                os.replace(path + ".tmp", path)
+            else:
+                try:
+                    os.remove(path + ".tmp")
+                except OSError:
+                    pass
 
     print("리포트 생성 완료! marketing_report.txt / service_report.txt 확인하세요.")
+
+
+def run_batch(args):
+    from src import batch
+
+    if args.batch_command == "prepare":
+        requests = batch.collect_batch_requests(args.inputs, include_segments=not args.no_segments)
+        batch.write_batch_file(requests, args.out)
+        total_tokens = sum(request.prompt.token_count for request in requests)
+        print(f"{len(requests)}개 요청(프롬프트 {total_tokens} 토큰)을 {args.out}에 저장했습니다.")
+
+    elif args.batch_command == "run":
+        output_path = batch.EXECUTORS[args.executor]().run(args.requests, args.out)
+        print(f"배치 결과를 {output_path}에 저장했습니다.")
+
+    elif args.batch_command == "submit":
+        batch_id = batch.AzureBatchExecutor().submit(args.requests)
+        print(f"배치 제출 완료: {batch_id}")
+
+    elif args.batch_command == "fetch":
+        output_path = batch.AzureBatchExecutor().fetch(args.batch_id, args.out, wait=args.wait)
+        if output_path is None:
+            print("아직 배치가 완료되지 않았습니다.")
+        else:
+            print(f"배치 결과를 {output_path}에 저장했습니다.")
+
+    elif args.batch_command == "collect":
+        paths = batch.write_reports(batch.ingest_results(args.results), args.out_dir)
+        print(f"{len(paths)}개 리포트를 {args.out_dir}에 저장했습니다.")
+
+
+def run_precompute(args):
+    from src.snapshot import AnalysisSnapshot, merge_snapshots, precompute
+
+    if args.command == "merge":
+        path = merge_snapshots(args.snapshots, name=args.name, out_root=args.out)
+    else:
+        path = precompute(args.source, out_root=args.out, name=args.name, base=args.append)
+        if args.append and path == args.append:
+            print(f"새로 추가할 파일이 없습니다. ({path})")
+            return
+    snapshot = AnalysisSnapshot.open(path)
+    tables = ", ".join(f"{name} {info['rows']}행" for name, info in snapshot.manifest["tables"].items())
+    print(f"리뷰 {len(snapshot)}개(파일 {len(snapshot.manifest['sources'])}개)의 집계를 {path}에 저장했습니다. ({tables})")
+
+
+def run_cluster(args):
+    from src.clustering import cluster_csv
+
+    rows = cluster_csv(args.csv, args.out, model_path=args.model)
+    print(f"리뷰 {rows}개에 ClusterID를 매겨 {args.out}에 저장했습니다." + (f" (모델: {args.model})" if args.model else ""))
+
+
+def run_similar(args):
+    from src.cache import cache_key
+    from src.dataset import ReviewDataset
+    from src.vector_index import load_or_build_index
+
+    dataset = ReviewDataset.from_path(args.csv)
+    index = load_or_build_index(dataset, cache_key(dataset.content_hash))
+    rows, scores = index.nearest_to_keywords(args.keywords, k=args.k)
+    for row, score in zip(rows, scores):
+        review = dataset.frame.iloc[row]
+        print(f"{row}\t{score:.3f}\t{review.get('Nouns')} / {review.get('Adjectives/Adverbs')}")
+
+
+def run_telemetry(args):
+    import json
+    import time
+
+    from src.telemetry import format_summary, summarize, telemetry
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    records = telemetry.read(since=since)
+    if not records:
+        print(f"기록된 GPT 호출이 없습니다. ({telemetry.path})")
+        return
+    summary = summarize(records)
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print(format_summary(summary))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="리뷰 CSV 기반 GPT 리포트 생성")
+    subparsers = parser.add_subparsers(dest="command")
+
+    report = subparsers.add_parser("report", help="마케팅/서비스 리포트를 바로 생성 (기본 동작)")
+    report.add_argument("csv", nargs="?", default=DATA_PATH)
+    report.add_argument("--summarize", action="store_true",
+                        help="전체 리뷰를 청크별로 요약(map-reduce)한 뒤 리포트 작성 (대용량 데이터용)")
+    report.set_defaults(func=run_report)
+
+    # 야간 대량 처리용 배치 모드: prepare → run(또는 submit/fetch) → collect
+    batch_parser = subparsers.add_parser("batch", help="Batch API용 요청 파일 생성/실행/결과 수집")
+    batch_commands = batch_parser.add_subparsers(dest="batch_command", required=True)
+
+    prepare = batch_commands.add_parser("prepare", help="CSV 파일/디렉터리의 모든 프롬프트를 requests.jsonl로 저장")
+    prepare.add_argument("inputs", nargs="+")
+    prepare.add_argument("--out", default="batch/requests.jsonl")
+    prepare.add_argument("--no-segments", action="store_true", help="군집별 리포트 프롬프트 제외")
+
+    run = batch_commands.add_parser("run", help="실행기로 요청 파일을 처리하고 결과 파일이 나올 때까지 대기")
+    run.add_argument("requests", nargs="?", default="batch/requests.jsonl")
+    run.add_argument("--executor", choices=["local", "azure"], default="local")
+    run.add_argument("--out", default="batch/results.jsonl")
+
+    submit = batch_commands.add_parser("submit", help="Azure Batch API에 제출만 하고 배치 ID 출력")
+    submit.add_argument("requests", nargs="?", default="batch/requests.jsonl")
+
+    fetch = batch_commands.add_parser("fetch", help="제출한 배치의 결과 파일 다운로드")
+    fetch.add_argument("batch_id")
+    fetch.add_argument("--out", default="batch/results.jsonl")
+    fetch.add_argument("--wait", action="store_true", help="완료될 때까지 대기")
+
+    collect = batch_commands.add_parser("collect", help="결과 파일을 데이터셋/군집별 리포트 파일로 저장")
+    collect.add_argument("results", nargs="?", default="batch/results.jsonl")
+    collect.add_argument("--out-dir", default="reports")
+
+    batch_parser.set_defaults(func=run_batch)
+
+    # 대용량 데이터는 미리 집계해 두고 대시보드에서 스냅샷으로 열기
+    precompute = subparsers.add_parser("precompute", help="CSV 파일/디렉터리를 분석해 대시보드용 집계 스냅샷(parquet) 저장")
+    precompute.add_argument("source", nargs="?", default=DATA_PATH)
+    precompute.add_argument("--out", help="스냅샷을 저장할 상위 디렉터리 (기본: REVIEWDOCTOR_SNAPSHOT_DIR 또는 snapshots)")
+    precompute.add_argument("--name", help="스냅샷 이름 (기본: 파일/디렉터리 이름)")
+    precompute.add_argument("--append", metavar="SNAPSHOT",
+                            help="기존 스냅샷에 새 파일의 집계만 더해 새 스냅샷 생성 (이미 포함된 파일은 건너뜀)")
+    precompute.set_defaults(func=run_precompute)
+
+    merge = subparsers.add_parser("merge", help="여러 스냅샷(예: 일별)을 원본 행 없이 합친 스냅샷(예: 월별) 저장")
+    merge.add_argument("snapshots", nargs="+")
+    merge.add_argument("--name", required=True)
+    merge.add_argument("--out", help="스냅샷을 저장할 상위 디렉터리")
+    merge.set_defaults(func=run_precompute)
+
+    cluster = subparsers.add_parser("cluster", help="내장 군집화(해시 TF-IDF + 미니배치 k-means)로 CSV에 ClusterID 컬럼 채우기")
+    cluster.add_argument("csv")
+    cluster.add_argument("--out", required=True, help="ClusterID를 채운 CSV 저장 경로")
+    cluster.add_argument("--model", help="군집화 모델 파일(.npz). 있으면 불러와 이어서 학습하고, 끝나면 저장")
+    cluster.set_defaults(func=run_cluster)
+
+    similar = subparsers.add_parser("similar", help="키워드 묶음과 가장 비슷한 리뷰 검색 (근접 이웃 인덱스는 캐시 디렉터리에 저장)")
+    similar.add_argument("csv")
+    similar.add_argument("--keywords", nargs="+", required=True)
+    similar.add_argument("-k", type=int, default=5)
+    similar.set_defaults(func=run_similar)
+
+    stats = subparsers.add_parser("telemetry", help="GPT 호출 기록 요약 (배포별 토큰 사용량, 지연 시간 백분위수)")
+    stats.add_argument("--hours", type=float, help="최근 N시간 기록만 집계")
+    stats.add_argument("--json", action="store_true", help="JSON으로 출력")
+    stats.set_defaults(func=run_telemetry)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    if args.command is None:
+        # 인자 없이 실행하면 기존처럼 샘플 데이터로 리포트 생성
+        args = build_parser().parse_args(["report"])
+    args.func(args)
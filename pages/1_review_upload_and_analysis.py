@@ -1,16 +1,19 @@
 import streamlit as st
 import plotly.graph_objects as go
-import pandas as pd
 import numpy as np
-import re
-from collections import Counter
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
+from src.cache import pipeline_cache, cache_key
+from src.snapshot import AnalysisSnapshot, run_analysis
+from src.clustering import can_cluster
+from src.vector_index import load_or_build_index
+from src.wordcloud_render import render_wordcloud
+from src.profiling import profiler, render_section_panel, render_sidebar_panel, span
 
 st.set_page_config(page_title="리뷰 분석", page_icon="📊")
 st.title("항공사 좌석별 리뷰 데이터 분석")
 
+# 이번 실행에서 기록되는 단계별 시간/메모리 (사이드바 "성능" 패널)
+perf_run = profiler.start_run()
+
 # 파란색 버튼 스타일 CSS 추가
 st.markdown("""
 <style>
@@ -72,163 +75,40 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # 세션에서 파일 불러오기
-if "uploaded_file" not in st.session_state:
+if "dataset" not in st.session_state:
     st.warning("메인 페이지에서 CSV 파일을 먼저 업로드해주세요.")
     st.stop()
 
-uploaded_file = st.session_state["uploaded_file"]
-uploaded_file.seek(0)
-df = pd.read_csv(uploaded_file)
-
-# 1. 데이터 전처리 함수
-def preprocess_data(df):
-    # 컬럼명 공백 제거
-    df.columns = df.columns.str.strip()
-    
-    # SeatType 열의 내용을 한글로 변경
-    seat_type_mapping = {
-        'Business Class': '비즈니스',
-        'Economy Class': '이코노미',
-        'First Class': '퍼스트',
-        'Premium Economy': '프리미엄 이코노미'
-    }
-    df['SeatType'] = df['SeatType'].map(seat_type_mapping).fillna(df['SeatType'])
-    
-    # 날짜 생성: 홀수 행은 2025년 5월, 짝수 행은 2025년 6월
-    df['year'] = 2025
-    df['month'] = df.index.map(lambda x: 5 if x % 2 == 0 else 6)
-    
-    # Recommended를 추천/비추천으로 매핑
-    df['sentiment'] = df['Recommended'].map({'yes': '추천', 'no': '비추천'})
-    
-    # 명사(Nouns) 전처리
-    df['Nouns'] = df['Nouns'].fillna('').apply(lambda x: [word.strip() for word in str(x).split(',')])
-    
-    return df
-
-# 2. 리뷰 데이터 생성 함수
-def build_review_data(df):
-    review_data = {}
-    
-    for (year, month, seat_class), group in df.groupby(['year', 'month', 'SeatType']):
-        if year not in review_data:
-            review_data[year] = {}
-        if month not in review_data[year]:
-            review_data[year][month] = {}
-        
-        good_data = group[group['sentiment'] == '추천']
-        bad_data = group[group['sentiment'] == '비추천']
-        
-        # 여행객 유형 분포
-        traveller_dist = group['TypeOfTraveller'].value_counts(normalize=True).to_dict()
-        
-        # 감성 분포
-        sentiment_dist = group['sentiment'].value_counts(normalize=True).to_dict()
-        
-        review_data[year][month][seat_class] = {
-            "traveller_dist": traveller_dist,
-            "sentiment_dist": sentiment_dist
-        }
-    
-    return review_data
-
-# 3. 강점/약점 분석 함수
-def build_strengths_weaknesses(df):
-    strengths = {}
-    weaknesses = {}
-    
-    for seat_class in df['SeatType'].unique():
-        # 긍정 리뷰 명사 추출
-        good_nouns = []
-        for nouns in df[(df['SeatType'] == seat_class) & (df['sentiment'] == '추천')]['Nouns']:
-            good_nouns.extend(nouns)
-        
-        # 부정 리뷰 명사 추출
-        bad_nouns = []
-        for nouns in df[(df['SeatType'] == seat_class) & (df['sentiment'] == '비추천')]['Nouns']:
-            bad_nouns.extend(nouns)
-        
-        # 상위 5개 명사 추출 (빈도순)
-        top_good = [word for word, _ in Counter(good_nouns).most_common(5)] if good_nouns else ["데이터 없음"]
-        top_bad = [word for word, _ in Counter(bad_nouns).most_common(5)] if bad_nouns else ["데이터 없음"]
-        
-        strengths[seat_class] = ", ".join(top_good)
-        weaknesses[seat_class] = ", ".join(top_bad)
-    
-    return strengths, weaknesses
-
-# 4. 평점 데이터 생성 함수
-def build_rating_data(df):
-    rating_data = {}
-    # 서비스 항목 컬럼
-    service_columns = ['SeatComfort', 'CabinStaffService', 'Food&Beverages', 'GroundService', 'InflightEntertainment']
-    
-    for (year, month, seat_class), group in df.groupby(['year', 'month', 'SeatType']):
-        if year not in rating_data:
-            rating_data[year] = {}
-        if month not in rating_data[year]:
-            rating_data[year][month] = {}
-        
-        # 서비스 항목별 평균 평점 계산
-        avg_ratings = {}
-        for col in service_columns:
-            if col in group.columns:
-                avg_ratings[col] = group[col].mean()
-            else:
-                avg_ratings[col] = 0.0  # 컬럼이 없는 경우 기본값
-        
-        # 전체 평점
-        avg_ratings['OverallRating'] = group['OverallRating'].mean()
-        
-        rating_data[year][month][seat_class] = avg_ratings
-    
-    return rating_data
-
-# 5. 여행객 유형 데이터 생성
-def build_traveller_data(df):
-    traveller_data = {}
-    
-    for (year, month), group in df.groupby(['year', 'month']):
-        if year not in traveller_data:
-            traveller_data[year] = {}
-        if month not in traveller_data[year]:
-            traveller_data[year][month] = {}
-        
-        # 좌석 타입별 여행객 유형 분포
-        for seat_class in group['SeatType'].unique():
-            class_group = group[group['SeatType'] == seat_class]
-            dist = class_group['TypeOfTraveller'].value_counts(normalize=True).to_dict()
-            traveller_data[year][month][seat_class] = dist
-    
-    return traveller_data
-
-# 6. 전체 여행객 유형 분포 계산
-def build_overall_traveller_dist(df):
-    return df['TypeOfTraveller'].value_counts(normalize=True).to_dict()
+dataset = st.session_state["dataset"]
 
 # 6. 데이터 전처리 및 분석
 try:
-    # 데이터 전처리
-    processed_df = preprocess_data(df)
-    
-    # 분석 데이터 생성
-    review_data = build_review_data(processed_df)
-    strengths, weaknesses = build_strengths_weaknesses(processed_df)
-    rating_data = build_rating_data(processed_df)
-    traveller_data = build_traveller_data(processed_df)
-    overall_traveller_dist = build_overall_traveller_dist(processed_df)
+    if isinstance(dataset, AnalysisSnapshot):
+        # precompute로 미리 계산한 스냅샷은 집계 결과를 그대로 사용 (원본 행 없음)
+        analysis = dataset.analysis
+    else:
+        # 파일 내용 해시 + 파이프라인 버전으로 캐시 조회 (재실행/동일 파일 재업로드 시 재계산 생략)
+        with span("analysis"):
+            analysis = pipeline_cache.get_or_compute(
+                cache_key(dataset.content_hash),
+                lambda: run_analysis(dataset.frame),
+            )
+    processed_df = analysis.get("processed_df")
+    cube = analysis["cube"]
+    keyword_index = analysis["keyword_index"]
+    strengths, weaknesses = analysis["strengths_weaknesses"]
     
     # 디버깅 정보 출력
     # st.success("리뷰 분석 완료!")
     
 except Exception as e:
     st.error(f"리뷰 csv 분석 중 오류 발생: {str(e)}")
-    st.write("데이터프레임 컬럼 목록:", df.columns.tolist())
+    st.write("데이터프레임 컬럼 목록:", dataset.columns)
     st.stop()
 
 # --- UI 및 시각화  -------------------------------------
 # 좌석 종류 선택
-seat_classes = processed_df['SeatType'].unique().tolist()
+seat_classes = analysis["seat_classes"]
 
 # 좌석 종류를 버튼 스타일로 표시
 # st.markdown("**좌석 종류를 골라주세요.**")
@@ -247,7 +127,7 @@ for i, seat_type in enumerate(seat_classes):
         #     if st.button(
         #         seat_type, 
         #         key=f"seat_{seat_type}",
-        #         use_container_width=True
+        #         width="stretch"
         #     ):
         #         st.session_state.selected_seat_class = seat_type
         #     st.markdown('</span>', unsafe_allow_html=True)
@@ -255,7 +135,7 @@ for i, seat_type in enumerate(seat_classes):
             if st.button(
                 seat_type, 
                 key=f"seat_{seat_type}",
-                use_container_width=True
+                width="stretch"
             ):
                 st.session_state.selected_seat_class = seat_type
 
@@ -266,11 +146,11 @@ st.markdown('</div>', unsafe_allow_html=True)
 st.markdown(' <div class="date_box">', unsafe_allow_html=True)
 col1, col2 = st.columns(2)
 with col1:
-    available_years = list(review_data.keys())
+    available_years = cube.years()
     selected_year = st.selectbox("**연도를 선택해주세요.**", available_years)
 with col2:
-    if selected_year in review_data:
-        available_months = list(review_data[selected_year].keys())
+    if selected_year in available_years:
+        available_months = cube.months(selected_year)
         selected_month = st.selectbox("**월을 선택해주세요.**", available_months)
     else:
         st.warning("선택한 연도에 데이터가 없습니다.")
@@ -279,12 +159,11 @@ with col2:
 st.markdown(' </div>', unsafe_allow_html=True)
 
 # 선택한 데이터 가져오기
-current_review = review_data[selected_year][selected_month].get(seat_class)
-current_rating = rating_data[selected_year][selected_month].get(seat_class)
-current_traveller = traveller_data[selected_year][selected_month].get(seat_class)
+current_rating = cube.rating_means(year=selected_year, month=selected_month, SeatType=seat_class)
+current_traveller = cube.traveller_dist(year=selected_year, month=selected_month, SeatType=seat_class)
 
 # 데이터가 없는 경우 에러 처리
-if not current_review or not current_rating or not current_traveller:
+if not current_rating or not current_traveller:
     st.warning("선택한 조건에 해당하는 데이터가 없습니다.")
     st.stop()
 
@@ -322,7 +201,8 @@ fig_traveller = go.Figure(data=[go.Pie(
     values=traveller_values,
     hole=0.3
 )])
-st.plotly_chart(fig_traveller)
+with span("chart.traveller"):
+    st.plotly_chart(fig_traveller)
 
 # 3. 서비스 평점 레이더 차트 -----------------------------------
 st.markdown("---")
@@ -336,8 +216,8 @@ current_ratings = [current_rating[cat] for cat in service_categories]
 prev_month = selected_month - 1
 prev_ratings = None
 
-if prev_month > 0 and selected_year in rating_data and prev_month in rating_data[selected_year]:
-    prev_rating_data = rating_data[selected_year][prev_month].get(seat_class)
+if prev_month > 0:
+    prev_rating_data = cube.rating_means(year=selected_year, month=prev_month, SeatType=seat_class)
     if prev_rating_data:
         prev_ratings = [prev_rating_data[cat] for cat in service_categories]
 
@@ -372,7 +252,8 @@ fig_radar.update_layout(
     height=500
 )
 
-st.plotly_chart(fig_radar)
+with span("chart.radar"):
+    st.plotly_chart(fig_radar)
 
 # 4. 전월 대비 평점 변화 분석 -----------------------------------
 st.markdown("---")
@@ -398,7 +279,8 @@ if prev_ratings:
         height=400
     )
     
-    st.plotly_chart(fig_change)
+    with span("chart.change"):
+        st.plotly_chart(fig_change)
     
     # 개선 여부 분석
     improvements = [cat for cat, change in zip(service_categories, rating_changes) if change > 0]
@@ -412,386 +294,332 @@ else:
     st.info("이전 달 데이터가 없어 비교 분석을 수행할 수 없습니다.")
 
 # 5. 명사 워드클라우드 및 막대그래프 -----------------------------------
-st.markdown("---")
-st.subheader("리뷰 키워드 분석")
-
-# 시각화 방식 선택 버튼
-col_btn1, col_btn2 = st.columns(2)
-with col_btn1:
-    show_wordcloud = st.button("워드 클라우드로 보기")
-with col_btn2:
-    show_chart = st.button("그래프로 보기")
-
-# 세션 상태 초기화
-if 'visualization_mode' not in st.session_state:
-    st.session_state.visualization_mode = 'wordcloud'
-
-# 버튼 클릭에 따른 모드 변경
-if show_wordcloud:
-    st.session_state.visualization_mode = 'wordcloud'
-elif show_chart:
-    st.session_state.visualization_mode = 'chart'
-
-# 긍정/부정 리뷰 데이터 추출
-good_df = processed_df[(processed_df['SeatType'] == seat_class) & 
-                      (processed_df['sentiment'] == '추천') &
-                      (processed_df['year'] == selected_year) &
-                      (processed_df['month'] == selected_month)]
-
-bad_df = processed_df[(processed_df['SeatType'] == seat_class) & 
-                     (processed_df['sentiment'] == '비추천') &
-                     (processed_df['year'] == selected_year) &
-                     (processed_df['month'] == selected_month)]
-
-# 긍정 리뷰 명사 추출 및 빈도 계산
-good_nouns = []
-for nouns in good_df['Nouns']:
-    good_nouns.extend(nouns)
-good_counter = Counter(good_nouns)
-
-# 부정 리뷰 명사 추출 및 빈도 계산
-bad_nouns = []
-for nouns in bad_df['Nouns']:
-    bad_nouns.extend(nouns)
-bad_counter = Counter(bad_nouns)
+# 버튼을 누르면 이 섹션만 다시 실행 (위의 차트는 다시 그리지 않음)
+@st.fragment
+def render_keyword_section(keyword_index, period_filter):
+    # 이 섹션 실행의 스팬을 따로 모아 섹션 안에 표시 (fragment만 다시 실행될 때도 갱신됨)
+    with profiler.section() as section_spans:
+        st.markdown("---")
+        st.subheader("리뷰 키워드 분석")
+
+        # 시각화 방식 선택 버튼
+        col_btn1, col_btn2 = st.columns(2)
+        with col_btn1:
+            show_wordcloud = st.button("워드 클라우드로 보기")
+        with col_btn2:
+            show_chart = st.button("그래프로 보기")
+
+        # 세션 상태 초기화
+        if 'visualization_mode' not in st.session_state:
+            st.session_state.visualization_mode = 'wordcloud'
+
+        # 버튼 클릭에 따른 모드 변경
+        if show_wordcloud:
+            st.session_state.visualization_mode = 'wordcloud'
+        elif show_chart:
+            st.session_state.visualization_mode = 'chart'
+
+        # 긍정/부정 리뷰 명사 빈도 (키워드 인덱스에서 조회)
+        good_counter = keyword_index.frequencies(sentiment='추천', **period_filter)
+        bad_counter = keyword_index.frequencies(sentiment='비추천', **period_filter)
 
-col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-if st.session_state.visualization_mode == 'wordcloud':
-    # 워드클라우드 표시
-    with col1:
-        st.markdown("#### :green[추천해요]")
-        if good_nouns:
-            text = ' '.join(good_nouns)
-            # 긍정 리뷰용 green 계열 색상 함수
-            def green_color_func(word, font_size, position, orientation, random_state=None, **kwargs):
-                return f"hsl({np.random.randint(90, 150)}, {np.random.randint(70, 100)}%, {np.random.randint(30, 70)}%)"
-            
-            wordcloud = WordCloud(
-                width=400, 
-                height=300, 
-                background_color='white',
-                color_func=green_color_func
-            ).generate(text)
-            plt.figure(figsize=(10, 8))
-            plt.imshow(wordcloud, interpolation='bilinear')
-            plt.axis("off")
-            st.pyplot(plt)
-        else:
-            st.info("긍정 리뷰 데이터가 없습니다.")
-
-    with col2:
-        st.markdown("#### :red[추천하지 않아요]")
-        if bad_nouns:
-            text = ' '.join(bad_nouns)
-            # 부정 리뷰용 red 계열 색상 함수
-            def red_color_func(word, font_size, position, orientation, random_state=None, **kwargs):
-                return f"hsl({np.random.randint(0, 30)}, {np.random.randint(70, 100)}%, {np.random.randint(30, 70)}%)"
-            
-            wordcloud = WordCloud(
-                width=400, 
-                height=300, 
-                background_color='white',
-                color_func=red_color_func
-            ).generate(text)
-            plt.figure(figsize=(10, 8))
-            plt.imshow(wordcloud, interpolation='bilinear')
-            plt.axis("off")
-            st.pyplot(plt)
-        else:
-            st.info("부정 리뷰 데이터가 없습니다.")
+        if st.session_state.visualization_mode == 'wordcloud':
+            # 워드클라우드 표시 (빈도표 기반 PNG, 캐시됨)
+            with col1:
+                st.markdown("#### :green[추천해요]")
+                if good_counter:
+                    st.image(render_wordcloud(good_counter, 'green'), width="stretch")
+                else:
+                    st.info("긍정 리뷰 데이터가 없습니다.")
+
+            with col2:
+                st.markdown("#### :red[추천하지 않아요]")
+                if bad_counter:
+                    st.image(render_wordcloud(bad_counter, 'red'), width="stretch")
+                else:
+                    st.info("부정 리뷰 데이터가 없습니다.")
 
-else:
-    # 막대그래프 표시
-    with col1:
-        if good_counter:
-            # 상위 10개 키워드
-            top_good = good_counter.most_common(10)
-            words, counts = zip(*top_good)
-            
-            fig_good = go.Figure(go.Bar(
-                x=list(counts),
-                y=list(words),
-                orientation='h',
-                marker_color='green',
-                text=list(counts),
-                textposition='auto'
-            ))
-            fig_good.update_layout(
-                title="긍정 키워드 빈도",
-                xaxis_title="빈도",
-                height=400,
-                yaxis={'categoryorder': 'total ascending'}
-            )
-            st.plotly_chart(fig_good, use_container_width=True)
-        else:
-            st.info("긍정 리뷰 데이터가 없습니다.")
-
-    with col2:
-        if bad_counter:
-            # 상위 10개 키워드
-            top_bad = bad_counter.most_common(10)
-            words, counts = zip(*top_bad)
-            
-            fig_bad = go.Figure(go.Bar(
-                x=list(counts),
-                y=list(words),
-                orientation='h',
-                marker_color='red',
-                text=list(counts),
-                textposition='auto'
-            ))
-            fig_bad.update_layout(
-                title="부정 키워드 빈도",
-                xaxis_title="빈도",
-                height=400,
-                yaxis={'categoryorder': 'total ascending'}
-            )
-            st.plotly_chart(fig_bad, use_container_width=True)
         else:
-            st.info("부정 리뷰 데이터가 없습니다.")
+            # 막대그래프 표시
+            with col1:
+                if good_counter:
+                    # 상위 10개 키워드
+                    top_good = keyword_index.top_k(10, sentiment='추천', **period_filter)
+                    words, counts = zip(*top_good)
+
+                    fig_good = go.Figure(go.Bar(
+                        x=list(counts),
+                        y=list(words),
+                        orientation='h',
+                        marker_color='green',
+                        text=list(counts),
+                        textposition='auto'
+                    ))
+                    fig_good.update_layout(
+                        title="긍정 키워드 빈도",
+                        xaxis_title="빈도",
+                        height=400,
+                        yaxis={'categoryorder': 'total ascending'}
+                    )
+                    with span("chart.good"):
+                        st.plotly_chart(fig_good, width="stretch")
+                else:
+                    st.info("긍정 리뷰 데이터가 없습니다.")
+
+            with col2:
+                if bad_counter:
+                    # 상위 10개 키워드
+                    top_bad = keyword_index.top_k(10, sentiment='비추천', **period_filter)
+                    words, counts = zip(*top_bad)
+
+                    fig_bad = go.Figure(go.Bar(
+                        x=list(counts),
+                        y=list(words),
+                        orientation='h',
+                        marker_color='red',
+                        text=list(counts),
+                        textposition='auto'
+                    ))
+                    fig_bad.update_layout(
+                        title="부정 키워드 빈도",
+                        xaxis_title="빈도",
+                        height=400,
+                        yaxis={'categoryorder': 'total ascending'}
+                    )
+                    with span("chart.bad"):
+                        st.plotly_chart(fig_bad, width="stretch")
+                else:
+                    st.info("부정 리뷰 데이터가 없습니다.")
+
+    render_section_panel(section_spans, "리뷰 키워드 분석", key="perf_keywords")
+
+
+render_keyword_section(keyword_index, dict(year=selected_year, month=selected_month, SeatType=seat_class))
 
 # 6. 전체 클러스터링 분석 섹션 -----------------------------------
-st.markdown("---")
-# 클러스터링 분석 섹션 표시 상태 초기화
-if 'show_clustering' not in st.session_state:
-    st.session_state.show_clustering = False
-
-# 분석 결과 보러 가기 버튼
-if st.button("분석 결과 보러 가기", key="main_report_button"):
-    st.session_state.show_clustering = True
-
-# 클러스터링 분석 섹션 표시
-if st.session_state.show_clustering:
-    st.subheader("전체 고객 군집 분석 (K-means 클러스터링)")
-    st.markdown("**BERT 기반 텍스트 클러스터링으로 발견된 24개 고객 군집 (2개 추천여부 × 4개 좌석타입 × 3개 클러스터)**")
-
-    # 전체 클러스터 데이터 사용
-    cluster_df = processed_df.copy()
-
-    # 클러스터별 통계 계산 (좌석타입과 추천여부 포함)
-    cluster_stats = []
-    for (seat_type, recommended, cluster_id), group in cluster_df.groupby(['SeatType', 'sentiment', 'ClusterID']):
-        # 기본 통계
-        stats = {
-            'SeatType': seat_type,
-            'Sentiment': recommended,
-            'ClusterID': cluster_id,
-            'UniqueID': f"{seat_type}_{recommended}_{cluster_id}",
-            'Count': len(group),
-            'AvgOverallRating': group['OverallRating'].mean(),
-            'RecommendationRate': (group['sentiment'] == '추천').mean() * 100,
-            'DominantTraveller': group['TypeOfTraveller'].mode().iloc[0] if len(group) > 0 else 'N/A'
-        }
-    
-        # 서비스 항목별 평균 점수
-        service_cols = ['SeatComfort', 'CabinStaffService', 'Food&Beverages', 'GroundService', 'InflightEntertainment']
-        for col in service_cols:
-            stats[col] = group[col].mean()
-    
-        cluster_stats.append(stats)
-
-    cluster_stats_df = pd.DataFrame(cluster_stats)
-
-    # 1) 전체 클러스터 분포 시각화 
-    # st.markdown("#### 📊 전체 클러스터 분포")
-
-    # col1, col2 = st.columns(2)
-
-    # with col1:
-    #     # 좌석 타입별 클러스터 개수 및 고객 수
-    #     seat_summary = cluster_stats_df.groupby('SeatType').agg({
-    #         'Count': 'sum',
-    #         'ClusterID': 'count'
-    #     }).reset_index()
-    #     seat_summary.columns = ['SeatType', 'TotalCustomers', 'ClusterCount']
-    
-    #     fig_seat_dist = go.Figure()
-    #     fig_seat_dist.add_trace(go.Bar(
-    #         x=seat_summary['SeatType'],
-    #         y=seat_summary['TotalCustomers'],
-    #         marker_color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'],
-    #         text=seat_summary['TotalCustomers'],
-    #         textposition='auto',
-    #         name='총 고객 수'
-    #     ))
-    #     fig_seat_dist.update_layout(
-    #         title="좌석 타입별 총 고객 수",
-    #         xaxis_title="좌석 타입",
-    #         yaxis_title="고객 수",
-    #         height=400
-    #     )
-    #     st.plotly_chart(fig_seat_dist, use_container_width=True)
-
-    # with col2:
-    #     # 추천/비추천 분포
-    #     sentiment_summary = cluster_stats_df.groupby('Sentiment')['Count'].sum().reset_index()
-    
-    #     fig_sentiment_dist = go.Figure(data=[go.Pie(
-    #         labels=sentiment_summary['Sentiment'],
-    #         values=sentiment_summary['Count'],
-    #         hole=0.4,
-    #         marker_colors=['lightcoral', 'lightgreen'],
-    #         textinfo='label+percent+value'
-    #     )])
-    #     fig_sentiment_dist.update_layout(
-    #         title="전체 추천/비추천 분포",
-    #         height=400
-    #     )
-    #     st.plotly_chart(fig_sentiment_dist, use_container_width=True)
-
-    # 2) 클러스터별 평점 분포 히트맵
-    st.markdown("#### 🔥 24개 군집 평점 히트맵")
-
-    # 히트맵을 위한 데이터 준비
-    heatmap_data = cluster_stats_df.pivot_table(
-        index=['SeatType', 'Sentiment'], 
-        columns='ClusterID', 
-        values='AvgOverallRating'
-    ).fillna(0)
-
-    # 인덱스를 문자열로 변환
-    heatmap_labels = [f"{seat}_{sent}" for seat, sent in heatmap_data.index]
-
-    fig_heatmap_all = go.Figure(data=go.Heatmap(
-        z=heatmap_data.values,
-        x=[f"클러스터 {i}" for i in heatmap_data.columns],
-        y=heatmap_labels,
-        colorscale='RdYlGn',
-        text=np.round(heatmap_data.values, 2),
-        texttemplate="%{text}",
-        textfont={"size":10},
-        colorbar=dict(title="평점")
-    ))
+@st.fragment
+def render_clustering_section(analysis, processed_df, keyword_index, dataset):
+    # 이 섹션 실행의 스팬을 따로 모아 섹션 안에 표시 (fragment만 다시 실행될 때도 갱신됨)
+    with profiler.section() as section_spans:
+        st.markdown("---")
+        # 클러스터링 분석 섹션 표시 상태 초기화
+        if 'show_clustering' not in st.session_state:
+            st.session_state.show_clustering = False
+
+        # 분석 결과 보러 가기 버튼
+        if st.button("분석 결과 보러 가기", key="main_report_button"):
+            st.session_state.show_clustering = True
+
+        # 클러스터링 분석 섹션 표시
+        if st.session_state.show_clustering:
+            st.subheader("전체 고객 군집 분석 (K-means 클러스터링)")
+            st.markdown("**BERT 기반 텍스트 클러스터링으로 발견된 24개 고객 군집 (2개 추천여부 × 4개 좌석타입 × 3개 클러스터)**")
+
+            # 클러스터별 통계 계산 (좌석타입과 추천여부 포함)
+            cluster_stats_df = analysis["cluster_stats"]
+
+            # 1) 전체 클러스터 분포 시각화 
+            # st.markdown("#### 📊 전체 클러스터 분포")
+
+            # col1, col2 = st.columns(2)
+
+            # with col1:
+            #     # 좌석 타입별 클러스터 개수 및 고객 수
+            #     seat_summary = cluster_stats_df.groupby('SeatType').agg({
+            #         'Count': 'sum',
+            #         'ClusterID': 'count'
+            #     }).reset_index()
+            #     seat_summary.columns = ['SeatType', 'TotalCustomers', 'ClusterCount']
+
+            #     fig_seat_dist = go.Figure()
+            #     fig_seat_dist.add_trace(go.Bar(
+            #         x=seat_summary['SeatType'],
+            #         y=seat_summary['TotalCustomers'],
+            #         marker_color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'],
+            #         text=seat_summary['TotalCustomers'],
+            #         textposition='auto',
+            #         name='총 고객 수'
+            #     ))
+            #     fig_seat_dist.update_layout(
+            #         title="좌석 타입별 총 고객 수",
+            #         xaxis_title="좌석 타입",
+            #         yaxis_title="고객 수",
+            #         height=400
+            #     )
+            #     st.plotly_chart(fig_seat_dist, width="stretch")
+
+            # with col2:
+            #     # 추천/비추천 분포
+            #     sentiment_summary = cluster_stats_df.groupby('Sentiment')['Count'].sum().reset_index()
+
+            #     fig_sentiment_dist = go.Figure(data=[go.Pie(
+            #         labels=sentiment_summary['Sentiment'],
+            #         values=sentiment_summary['Count'],
+            #         hole=0.4,
+            #         marker_colors=['lightcoral', 'lightgreen'],
+            #         textinfo='label+percent+value'
+            #     )])
+            #     fig_sentiment_dist.update_layout(
+            #         title="전체 추천/비추천 분포",
+            #         height=400
+            #     )
+            #     st.plotly_chart(fig_sentiment_dist, width="stretch")
+
+            # 2) 클러스터별 평점 분포 히트맵
+            st.markdown("#### 🔥 24개 군집 평점 히트맵")
+
+            # 히트맵을 위한 데이터 준비
+            heatmap_data = analysis["heatmap"]
+
+            # 인덱스를 문자열로 변환
+            heatmap_labels = [f"{seat}_{sent}" for seat, sent in heatmap_data.index]
+
+            fig_heatmap_all = go.Figure(data=go.Heatmap(
+                z=heatmap_data.values,
+                x=[f"클러스터 {i}" for i in heatmap_data.columns],
+                y=heatmap_labels,
+                colorscale='RdYlGn',
+                text=np.round(heatmap_data.values, 2),
+                texttemplate="%{text}",
+                textfont={"size":10},
+                colorbar=dict(title="평점")
+            ))
 
-    fig_heatmap_all.update_layout(
-        title="24개 군집별 전체 평점 히트맵",
-        height=600,
-        xaxis_title="클러스터 ID",
-        yaxis_title="좌석타입_추천여부"
-    )
-    st.plotly_chart(fig_heatmap_all, use_container_width=True)
+            fig_heatmap_all.update_layout(
+                title="24개 군집별 전체 평점 히트맵",
+                height=600,
+                xaxis_title="클러스터 ID",
+                yaxis_title="좌석타입_추천여부"
+            )
+            with span("chart.heatmap_all"):
+                st.plotly_chart(fig_heatmap_all, width="stretch")
 
-    # 3) 서비스 항목별 클러스터 성과 분석
-    st.markdown("#### 🎯 서비스 항목별 클러스터 성과")
+            # 3) 서비스 항목별 클러스터 성과 분석
+            st.markdown("#### 🎯 서비스 항목별 클러스터 성과")
 
-    service_cols = ['SeatComfort', 'CabinStaffService', 'Food&Beverages', 'GroundService', 'InflightEntertainment']
-    service_labels = ['좌석 편안함', '승무원 서비스', '식음료', '지상 서비스', '기내 엔터테인먼트']
+            service_cols = ['SeatComfort', 'CabinStaffService', 'Food&Beverages', 'GroundService', 'InflightEntertainment']
+            service_labels = ['좌석 편안함', '승무원 서비스', '식음료', '지상 서비스', '기내 엔터테인먼트']
 
-    # 각 서비스 항목별 최고/최저 클러스터 찾기
-    service_analysis = {}
-    for i, col in enumerate(service_cols):
-        best_idx = cluster_stats_df[col].idxmax()
-        worst_idx = cluster_stats_df[col].idxmin()
-    
-        service_analysis[service_labels[i]] = {
-            'best': {
-                'cluster': cluster_stats_df.loc[best_idx, 'UniqueID'],
-                'score': cluster_stats_df.loc[best_idx, col],
-                'seat_type': cluster_stats_df.loc[best_idx, 'SeatType'],
-                'sentiment': cluster_stats_df.loc[best_idx, 'Sentiment']
-            },
-            'worst': {
-                'cluster': cluster_stats_df.loc[worst_idx, 'UniqueID'],
-                'score': cluster_stats_df.loc[worst_idx, col],
-                'seat_type': cluster_stats_df.loc[worst_idx, 'SeatType'],
-                'sentiment': cluster_stats_df.loc[worst_idx, 'Sentiment']
+            # 각 서비스 항목별 최고/최저 클러스터 (분석 결과와 함께 계산/캐시됨)
+            service_rankings = analysis["service_rankings"]
+            service_analysis = {
+                label: service_rankings[col] for col, label in zip(service_cols, service_labels) if col in service_rankings
             }
-        }
 
-    # 서비스별 최고/최저 성과 표시
-    for service, data in service_analysis.items():
-        col1, col2 = st.columns(2)
-        with col1:
-            st.success(f"""
-            **🏆 {service} 최고 성과**
-            - 클러스터: {data['best']['cluster']}
-            - 점수: {data['best']['score']:.2f}
-            - 좌석: {data['best']['seat_type']} ({data['best']['sentiment']})
-            """)
-        with col2:
-            st.error(f"""
-            **⚠️ {service} 개선 필요**
-            - 클러스터: {data['worst']['cluster']}
-            - 점수: {data['worst']['score']:.2f}
-            - 좌석: {data['worst']['seat_type']} ({data['worst']['sentiment']})
-            """)
-
-    # 4) 상위/하위 성과 클러스터 TOP 5
-    st.markdown("#### 🏅 전체 성과 순위")
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**⭐ TOP 5 우수 클러스터**")
-        top_clusters = cluster_stats_df.nlargest(5, 'AvgOverallRating')[
-            ['UniqueID', 'SeatType', 'Sentiment', 'AvgOverallRating', 'Count', 'DominantTraveller']
-        ]
-        for idx, row in top_clusters.iterrows():
-            st.success(f"""
-            **{row['UniqueID']}**
-            - 평점: {row['AvgOverallRating']:.2f} | 고객수: {row['Count']}명
-            - 주요 여행객: {row['DominantTraveller']}
-            """)
-
-    with col2:
-        st.markdown("**⚠️ 개선 필요 클러스터 TOP 5**")
-        bottom_clusters = cluster_stats_df.nsmallest(5, 'AvgOverallRating')[
-            ['UniqueID', 'SeatType', 'Sentiment', 'AvgOverallRating', 'Count', 'DominantTraveller']
-        ]
-        for idx, row in bottom_clusters.iterrows():
-            st.error(f"""
-            **{row['UniqueID']}**
-            - 평점: {row['AvgOverallRating']:.2f} | 고객수: {row['Count']}명
-            - 주요 여행객: {row['DominantTraveller']}
-            """)
-
-    # 5) 클러스터 세부 정보 (선택적 확장)
-    st.markdown("#### 🔍 클러스터 세부 분석")
-
-    # 좌석 타입별로 그룹화하여 표시
-    for seat_type in cluster_stats_df['SeatType'].unique():
-        seat_clusters = cluster_stats_df[cluster_stats_df['SeatType'] == seat_type]
-    
-        with st.expander(f"📋 {seat_type} 클러스터 상세 정보"):
-            for _, row in seat_clusters.iterrows():
-                cluster_data = cluster_df[
-                    (cluster_df['SeatType'] == row['SeatType']) & 
-                    (cluster_df['sentiment'] == row['Sentiment']) & 
-                    (cluster_df['ClusterID'] == row['ClusterID'])
-                ]
-            
-                status_emoji = "✅" if row['Sentiment'] == '추천' else "❌"
-            
-                st.markdown(f"**{status_emoji} 클러스터 {row['ClusterID']} ({row['Sentiment']})**")
-            
-                col1, col2, col3, col4 = st.columns(4)
+            # 서비스별 최고/최저 성과 표시
+            for service, data in service_analysis.items():
+                col1, col2 = st.columns(2)
                 with col1:
-                    st.metric("고객 수", f"{row['Count']}명")
-                    st.metric("전체 평점", f"{row['AvgOverallRating']:.2f}")
+                    st.success(f"""
+                    **🏆 {service} 최고 성과**
+                    - 클러스터: {data['best']['cluster']}
+                    - 점수: {data['best']['score']:.2f}
+                    - 좌석: {data['best']['seat_type']} ({data['best']['sentiment']})
+                    """)
                 with col2:
-                    st.metric("좌석 편안함", f"{row['SeatComfort']:.2f}")
-                    st.metric("승무원 서비스", f"{row['CabinStaffService']:.2f}")
-                with col3:
-                    st.metric("식음료", f"{row['Food&Beverages']:.2f}")
-                    st.metric("지상 서비스", f"{row['GroundService']:.2f}")
-                with col4:
-                    st.metric("기내 엔터테인먼트", f"{row['InflightEntertainment']:.2f}")
-                    st.metric("주요 여행객", row['DominantTraveller'])
-
-                # 대표 키워드 표시
-                if len(cluster_data) > 0:
-                    cluster_nouns = []
-                    for nouns in cluster_data['Nouns']:
-                        cluster_nouns.extend(nouns)
-                
-                    if cluster_nouns:
-                        top_keywords = [word for word, _ in Counter(cluster_nouns).most_common(8)]
-                        st.markdown(f"**🔑 대표 키워드:** {', '.join(top_keywords)}")
-            
-                st.markdown("---")
+                    st.error(f"""
+                    **⚠️ {service} 개선 필요**
+                    - 클러스터: {data['worst']['cluster']}
+                    - 점수: {data['worst']['score']:.2f}
+                    - 좌석: {data['worst']['seat_type']} ({data['worst']['sentiment']})
+                    """)
+
+            # 4) 상위/하위 성과 클러스터 TOP 5
+            st.markdown("#### 🏅 전체 성과 순위")
+
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.markdown("**⭐ TOP 5 우수 클러스터**")
+                top_clusters = cluster_stats_df.nlargest(5, 'AvgOverallRating')[
+                    ['UniqueID', 'SeatType', 'Sentiment', 'AvgOverallRating', 'Count', 'DominantTraveller']
+                ]
+                for idx, row in top_clusters.iterrows():
+                    st.success(f"""
+                    **{row['UniqueID']}**
+                    - 평점: {row['AvgOverallRating']:.2f} | 고객수: {row['Count']}명
+                    - 주요 여행객: {row['DominantTraveller']}
+                    """)
+
+            with col2:
+                st.markdown("**⚠️ 개선 필요 클러스터 TOP 5**")
+                bottom_clusters = cluster_stats_df.nsmallest(5, 'AvgOverallRating')[
+                    ['UniqueID', 'SeatType', 'Sentiment', 'AvgOverallRating', 'Count', 'DominantTraveller']
+                ]
+                for idx, row in bottom_clusters.iterrows():
+                    st.error(f"""
+                    **{row['UniqueID']}**
+                    - 평점: {row['AvgOverallRating']:.2f} | 고객수: {row['Count']}명
+                    - 주요 여행객: {row['DominantTraveller']}
+                    """)
+
+            # 5) 클러스터 세부 정보 (선택적 확장)
+            st.markdown("#### 🔍 클러스터 세부 분석")
+
+            # 대표 리뷰 검색용 근접 이웃 인덱스 (원본 행이 없는 스냅샷에서는 생략)
+            review_index = None
+            if processed_df is not None and can_cluster(dataset.columns):
+                with span("review_index"):
+                    review_index = load_or_build_index(dataset, cache_key(dataset.content_hash))
+                cluster_rows = analysis["cluster_rows"]
+
+            # 좌석 타입별로 그룹화하여 표시
+            for seat_type in cluster_stats_df['SeatType'].unique():
+                seat_clusters = cluster_stats_df[cluster_stats_df['SeatType'] == seat_type]
+
+                with st.expander(f"📋 {seat_type} 클러스터 상세 정보"):
+                    for _, row in seat_clusters.iterrows():
+
+                        status_emoji = "✅" if row['Sentiment'] == '추천' else "❌"
+
+                        st.markdown(f"**{status_emoji} 클러스터 {row['ClusterID']} ({row['Sentiment']})**")
+
+                        col1, col2, col3, col4 = st.columns(4)
+                        with col1:
+                            st.metric("고객 수", f"{row['Count']}명")
+                            st.metric("전체 평점", f"{row['AvgOverallRating']:.2f}")
+                        with col2:
+                            st.metric("좌석 편안함", f"{row['SeatComfort']:.2f}")
+                            st.metric("승무원 서비스", f"{row['CabinStaffService']:.2f}")
+                        with col3:
+                            st.metric("식음료", f"{row['Food&Beverages']:.2f}")
+                            st.metric("지상 서비스", f"{row['GroundService']:.2f}")
+                        with col4:
+                            st.metric("기내 엔터테인먼트", f"{row['InflightEntertainment']:.2f}")
+                            st.metric("주요 여행객", row['DominantTraveller'])
+
+                        # 대표 키워드 표시
+                        top_keywords = [word for word, _ in keyword_index.top_k(
+                            8, SeatType=row['SeatType'], sentiment=row['Sentiment'], ClusterID=row['ClusterID']
+                        )]
+                        if top_keywords:
+                            st.markdown(f"**🔑 대표 키워드:** {', '.join(top_keywords)}")
+
+                        # 군집 중심에 가장 가까운 리뷰
+                        rows = None
+                        if review_index is not None:
+                            rows = cluster_rows.get((row['SeatType'], row['Sentiment'], row['ClusterID']))
+                        if rows is not None and len(rows):
+                            nearest, _ = review_index.nearest_to_centroid(rows, k=3)
+                            reviews = processed_df.iloc[nearest].astype(object).fillna('-')
+                            lines = [
+                                f"- {review.get('Nouns') or '-'} / {review.get('Adjectives/Adverbs', '-')} (평점 {review.get('OverallRating', '-')})"
+                                for _, review in reviews.iterrows()
+                            ]
+                            st.markdown("**💬 대표 리뷰:**\n" + "\n".join(lines))
+
+                        st.markdown("---")
+
+    render_section_panel(section_spans, "군집 분석", key="perf_clustering")
+
+
+render_clustering_section(analysis, processed_df, keyword_index, dataset)
 
 # 7. 리포트 생성 페이지로 이동 버튼
 st.markdown("---")
 if st.button("리포트 생성하러 가기"):
-    st.switch_page("pages/2_generate_report.py")
\ No newline at end of file
+    st.switch_page("pages/2_generate_report.py")
+
+render_sidebar_panel(perf_run)
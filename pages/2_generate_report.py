@@ -1,37 +1,87 @@
 import streamlit as st
-import pandas as pd
-from src.report_generator import generate_reports
-import tempfile
+from src.report_generator import build_report_prompts, build_summary_prompts, stream_prompts, generate_segment_reports
+from src.snapshot import AnalysisSnapshot
 
 st.set_page_config(page_title="리포트 생성", page_icon="📝")
 st.title("GPT 기반 마케팅 리포트 생성")
 
 # CSV 파일이 세션에 있는지 확인
-if "uploaded_file" not in st.session_state:
+if "dataset" not in st.session_state:
     st.warning("메인 페이지에서 CSV 파일을 먼저 업로드해주세요.")
     st.stop()
 
-uploaded_file = st.session_state["uploaded_file"]
-uploaded_file.seek(0)
+# 메인 페이지에서 파싱해 둔 데이터셋을 그대로 사용
+dataset = st.session_state["dataset"]
+if isinstance(dataset, AnalysisSnapshot):
+    st.warning("스냅샷에는 리뷰 원문이 없어 리포트를 생성할 수 없습니다. 메인 페이지에서 CSV 파일을 업로드해주세요.")
+    st.stop()
+
+REPORT_SECTIONS = {
+    "marketing": ("마케팅 전략 리포트", "Marketing Report", "marketing_report.txt"),
+    "service": ("서비스 개선 전략 리포트", "Service Report", "service_report.txt"),
+}
 
-# Streamlit에서 바로 읽은 업로드 파일은 generate_reports에 쓸 수 없기 때문에, 임시 저장 필요
-with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
-    tmp.write(st.session_state["uploaded_file"].read())
-    tmp_path = tmp.name
+# 같은 데이터로 다시 생성하면 캐시된 리포트를 바로 보여줌 (체크 시 새로 생성)
+regenerate = st.checkbox("캐시 무시하고 새로 생성하기", value=False)
+# 리뷰가 많으면 일부만 프롬프트에 들어가므로, 전체를 나눠 요약한 뒤 리포트를 작성
+summarize = st.checkbox("전체 리뷰 요약 후 생성하기 (대용량 데이터)", value=False)
 
 if st.button("리포트 생성하기"):
-    with st.spinner("GPT-4o로 리포트 생성 중..."):
-        try:
-            marketing_report, service_report = generate_reports(tmp_path)
+    status = st.empty()
+    prompt_info = st.empty()
+    placeholders = {}
+    for report_type, (subheader, _, _) in REPORT_SECTIONS.items():
+        st.subheader(subheader)
+        placeholders[report_type] = st.empty()
+
+    reports = {report_type: "" for report_type in REPORT_SECTIONS}
+    try:
+        if summarize:
+            with st.spinner("전체 리뷰를 나눠서 요약하는 중..."):
+                prompts = build_summary_prompts(dataset, use_cache=not regenerate)
+        else:
+            prompts = build_report_prompts(dataset)
+        prompt_info.caption(" / ".join(
+            f"{REPORT_SECTIONS[report_type][1]}: 프롬프트 {prompt.token_count} 토큰, 리뷰 {prompt.review_count}/{prompt.total_reviews}개"
+            for report_type, prompt in prompts.items()
+        ))
+        # 두 리포트를 동시에 스트리밍하면서 도착한 토큰을 바로 화면에 반영
+        with st.spinner("GPT-4o로 리포트 생성 중..."):
+            for report_type, token in stream_prompts(prompts, use_cache=not regenerate):
+                reports[report_type] += token
+                placeholders[report_type].markdown(reports[report_type])
 
-            st.success("리포트 생성 완료!")
-            st.subheader("마케팅 전략 리포트")
-            st.text_area("Marketing Report", marketing_report, height=400)
-            st.download_button("⬇다운로드", marketing_report, file_name="marketing_report.txt")
+        status.success("리포트 생성 완료!")
+        for report_type, (_, label, file_name) in REPORT_SECTIONS.items():
+            with placeholders[report_type].container():
+                st.text_area(label, reports[report_type], height=400)
+                st.download_button("⬇다운로드", reports[report_type], file_name=file_name, key=f"download_{report_type}")
 
-            st.subheader("서비스 개선 전략 리포트")
-            st.text_area("Service Report", service_report, height=400)
-            st.download_button("⬇다운로드", service_report, file_name="service_report.txt")
+    except Exception as e:
+        st.error(f"오류 발생: {e}")
 
+# 세그먼트(좌석 × 추천여부 × 클러스터)별 리포트
+st.markdown("---")
+st.subheader("군집별 리포트")
+if st.button("군집별 리포트 생성하기"):
+    with st.spinner("군집별 리포트 생성 중..."):
+        try:
+            segment_results = generate_segment_reports(dataset, use_cache=not regenerate)
         except Exception as e:
-            st.error(f"오류 발생: {e}")
\ No newline at end of file
+            st.error(f"오류 발생: {e}")
+            st.stop()
+
+    failed = [r for r in segment_results.values() if r.error]
+    if failed:
+        st.warning(f"{len(failed)}개 군집의 리포트 생성에 실패했습니다.")
+    else:
+        st.success(f"{len(segment_results)}개 군집 리포트 생성 완료!")
+
+    for segment_id, result in segment_results.items():
+        with st.expander(f"📋 {segment_id}"):
+            if result.error:
+                st.error(f"오류 발생: {result.error}")
+            else:
+                st.markdown(result.report)
+                st.download_button("⬇다운로드", result.report, file_name=f"{segment_id}_report.txt",
+                                   key=f"download_segment_{segment_id}")
@@ -0,0 +1,58 @@
+from src.analysis import build_cluster_views, build_cube, preprocess_data
+from src.keyword_index import build_keyword_index
+from src.tokens import tokenize_nouns
+
+
+class AggregateState:
+    """리뷰 묶음(배치) 하나의 합산 가능한 집계 상태.
+
+    셀별 건수/평점 합계/여행객 유형 건수(큐브)와 셀별 단어 빈도(키워드 인덱스)만 보관하므로,
+    merge는 두 상태의 셀 목록만으로 계산되고 결합 법칙이 성립합니다. (일별 상태를 합쳐 월/연 단위 보기 가능)
+    강점/약점, 군집 통계, 히트맵, 서비스별 순위는 합쳐진 상태에서 다시 계산합니다.
+    """
+
+    def __init__(self, cube, keyword_index, seat_classes, rows):
+        self.cube = cube
+        self.keyword_index = keyword_index
+        self.seat_classes = list(seat_classes)
+        self.rows = rows
+
+    @classmethod
+    def from_frame(cls, frame):
+        processed_df = preprocess_data(frame.copy())
+        noun_tokens = tokenize_nouns(processed_df['Nouns'])
+        return cls(
+            cube=build_cube(processed_df),
+            keyword_index=build_keyword_index(processed_df, noun_tokens),
+            seat_classes=processed_df['SeatType'].dropna().unique().tolist(),
+            rows=len(processed_df),
+        )
+
+    def merge(self, other):
+        return AggregateState(
+            cube=self.cube.merge(other.cube),
+            keyword_index=self.keyword_index.merge(other.keyword_index),
+            seat_classes=self.seat_classes + [s for s in other.seat_classes if s not in self.seat_classes],
+            rows=self.rows + other.rows,
+        )
+
+    def strengths_weaknesses(self):
+        """build_strengths_weaknesses와 같은 결과를 (좌석, 감성)별 단어 빈도로 계산"""
+        strengths = {}
+        weaknesses = {}
+        for seat_class in self.seat_classes:
+            top_good, top_bad = ([word for word, _ in self.keyword_index.top_k(5, SeatType=seat_class, sentiment=s)]
+                                 or ["데이터 없음"] for s in ('추천', '비추천'))
+            strengths[seat_class] = ", ".join(top_good)
+            weaknesses[seat_class] = ", ".join(top_bad)
+        return strengths, weaknesses
+
+    def analysis(self) -> dict:
+        """리뷰 분석 페이지가 읽는 형식 (원본 행 없음)"""
+        return {
+            "seat_classes": self.seat_classes,
+            "cube": self.cube,
+            "keyword_index": self.keyword_index,
+            "strengths_weaknesses": self.strengths_weaknesses(),
+            **build_cluster_views(self.cube.cluster_stats()),
+        }
@@ -0,0 +1,335 @@
+import numpy as np
+import pandas as pd
+
+from src.tokens import top_k_from_counts
+from src.profiling import timed
+
+# 서비스 항목 컬럼
+SERVICE_COLUMNS = ['SeatComfort', 'CabinStaffService', 'Food&Beverages', 'GroundService', 'InflightEntertainment']
+RATING_COLUMNS = SERVICE_COLUMNS + ['OverallRating']
+
+SEAT_TYPE_MAPPING = {
+    'Business Class': '비즈니스',
+    'Economy Class': '이코노미',
+    'First Class': '퍼스트',
+    'Premium Economy': '프리미엄 이코노미'
+}
+SENTIMENT_MAPPING = {'yes': '추천', 'no': '비추천'}
+
+# 집계 큐브의 차원 (순서대로 MultiIndex 레벨이 됨)
+CUBE_DIMENSIONS = ['year', 'month', 'SeatType', 'sentiment', 'ClusterID']
+# ClusterID 컬럼이 없는 데이터에서 사용하는 값
+NO_CLUSTER = -1
+
+
+def _map_labels(series, mapping, keep_unmapped):
+    # category 컬럼은 카테고리 목록만 변환하고 코드는 그대로 재사용
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        mapped = pd.Index([mapping.get(c, c if keep_unmapped else None) for c in series.cat.categories])
+        categories = mapped.dropna().unique()
+        new_codes = categories.get_indexer(mapped)
+        codes = series.cat.codes.to_numpy()
+        codes = np.where(codes >= 0, new_codes[codes], -1)
+        return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index)
+    if keep_unmapped:
+        return series.map(mapping).fillna(series)
+    return series.map(mapping)
+
+
+# 1. 데이터 전처리 함수
+@timed("preprocess_data")
+def preprocess_data(df):
+    # 컬럼명 공백 제거
+    df.columns = df.columns.str.strip()
+
+    # SeatType 열의 내용을 한글로 변경
+    df['SeatType'] = _map_labels(df['SeatType'], SEAT_TYPE_MAPPING, keep_unmapped=True)
+
+    # 날짜 생성: 홀수 행은 2025년 5월, 짝수 행은 2025년 6월
+    df['year'] = 2025
+    df['month'] = np.where(np.asarray(df.index) % 2 == 0, 5, 6)
+
+    # Recommended를 추천/비추천으로 매핑
+    df['sentiment'] = _map_labels(df['Recommended'], SENTIMENT_MAPPING, keep_unmapped=False)
+
+    # 명사(Nouns)는 문자열 그대로 두고, 토큰화는 src.tokens.tokenize_nouns에서 한 번에 수행
+    df['Nouns'] = df['Nouns'].fillna('')
+
+    return df
+
+
+# 2. 단일 패스 집계 큐브
+@timed("build_cube")
+def build_cube(df):
+    """(연도, 월, 좌석, 감성, 클러스터) 셀별 건수/평점 합계/여행객 유형 건수를 한 번의 groupby로 계산합니다."""
+    keys = pd.DataFrame({dim: df[dim] for dim in CUBE_DIMENSIONS if dim in df.columns}, index=df.index)
+    if 'ClusterID' not in keys.columns:
+        keys['ClusterID'] = NO_CLUSTER
+
+    # 합산만 하면 되는 값들을 하나의 넓은 프레임으로 만든 뒤 한 번에 groupby
+    values = {'count': np.ones(len(df), dtype=np.int64)}
+    missing_ratings = []
+    for col in RATING_COLUMNS:
+        if col in df.columns:
+            ratings = pd.to_numeric(df[col], errors='coerce')
+            values[f'{col}_sum'] = ratings.fillna(0).to_numpy(dtype=np.float64)
+            values[f'{col}_n'] = ratings.notna().to_numpy(dtype=np.int64)
+        else:
+            missing_ratings.append(col)
+    wide = pd.DataFrame(values, index=df.index)
+
+    traveller = pd.get_dummies(df['TypeOfTraveller'], dtype=np.int64)
+    traveller_types = [str(t) for t in traveller.columns]
+    traveller.columns = [f'traveller::{t}' for t in traveller_types]
+
+    wide = pd.concat([keys, wide, traveller], axis=1)
+    table = wide.groupby(CUBE_DIMENSIONS, sort=True, dropna=False, observed=True).sum()
+
+    return AggregateCube(table, traveller_types, missing_ratings)
+
+
+class AggregateCube:
+    def __init__(self, table, traveller_types, missing_ratings=()):
+        self.table = table
+        self.traveller_types = list(traveller_types)
+        self.missing_ratings = list(missing_ratings)
+        self._rollups = {}
+
+    def merge(self, other):
+        """같은 차원을 가진 두 큐브의 셀별 합 (청크 단위 집계 결과를 합칠 때 사용)"""
+        table = pd.concat([self.table, other.table]).fillna(0)
+        table = table.groupby(level=CUBE_DIMENSIONS, sort=True, dropna=False, observed=True).sum()
+        traveller_types = self.traveller_types + [t for t in other.traveller_types if t not in self.traveller_types]
+        missing_ratings = [col for col in self.missing_ratings if col in other.missing_ratings]
+        return AggregateCube(table, traveller_types, missing_ratings)
+
+    def rollup(self, dims):
+        # 지정한 차원만 남기고 나머지 차원은 합산 (결측 키는 제외, 결과는 메모이즈)
+        dims = tuple(dims)
+        if dims not in self._rollups:
+            if dims:
+                self._rollups[dims] = self.table.groupby(level=list(dims), sort=True, observed=True).sum()
+            else:
+                self._rollups[dims] = self.table.sum().to_frame().T
+        return self._rollups[dims]
+
+    def cell(self, **filters):
+        """필터에 해당하는 셀들의 합계 행. 데이터가 없으면 None."""
+        dims = [dim for dim in CUBE_DIMENSIONS if dim in filters]
+        rolled = self.rollup(dims)
+        if not dims:
+            return rolled.iloc[0]
+        key = tuple(filters[dim] for dim in dims)
+        try:
+            return rolled.loc[key if len(key) > 1 else key[0]]
+        except KeyError:
+            return None
+
+    def values(self, dim, **filters):
+        """필터 조건에서 데이터가 존재하는 차원 값 목록"""
+        dims = [d for d in CUBE_DIMENSIONS if d in filters or d == dim]
+        rolled = self.rollup(dims)
+        for d, value in filters.items():
+            rolled = rolled[rolled.index.get_level_values(d) == value]
+        return [v.item() if hasattr(v, 'item') else v for v in rolled.index.get_level_values(dim).unique()]
+
+    def years(self):
+        return self.values('year')
+
+    def months(self, year):
+        return self.values('month', year=year)
+
+    def rating_means(self, **filters):
+        row = self.cell(**filters)
+        if row is None:
+            return None
+        ratings = {}
+        for col in RATING_COLUMNS:
+            if col in self.missing_ratings:
+                ratings[col] = 0.0  # 컬럼이 없는 경우 기본값
+            elif row[f'{col}_n'] > 0:
+                ratings[col] = row[f'{col}_sum'] / row[f'{col}_n']
+            else:
+                ratings[col] = float('nan')
+        return ratings
+
+    def traveller_dist(self, **filters):
+        row = self.cell(**filters)
+        if row is None:
+            return None
+        counts = pd.Series(
+            [row[f'traveller::{t}'] for t in self.traveller_types], index=self.traveller_types, dtype=np.float64
+        )
+        counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+        total = counts.sum()
+        return (counts / total).to_dict() if total else {}
+
+    def cluster_stats(self):
+        """(좌석, 감성, 클러스터)별 통계를 셀 합계만으로 계산 (build_cluster_stats와 같은 형식, 행 데이터 불필요)"""
+        rolled = self.rollup(['SeatType', 'sentiment', 'ClusterID'])
+        rolled = rolled[rolled['count'] > 0]
+        index = rolled.index.to_frame(index=False)
+
+        def mean(col):
+            if col in self.missing_ratings:
+                return np.full(len(rolled), np.nan)
+            n = rolled[f'{col}_n'].to_numpy(dtype=np.float64)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(n > 0, rolled[f'{col}_sum'].to_numpy() / np.where(n > 0, n, 1), np.nan)
+
+        # 최빈 여행객 유형: 동률이면 앞선 유형 (Series.mode()의 첫 값과 같음)
+        traveller = rolled[[f'traveller::{t}' for t in self.traveller_types]].to_numpy()
+        dominant = np.asarray(self.traveller_types + ['N/A'], dtype=object)[
+            np.where(traveller.sum(axis=1) > 0, traveller.argmax(axis=1), len(self.traveller_types))
+        ] if self.traveller_types else np.full(len(rolled), 'N/A', dtype=object)
+
+        stats = pd.DataFrame({
+            'SeatType': index['SeatType'].astype(object),
+            'Sentiment': index['sentiment'].astype(object),
+            'ClusterID': index['ClusterID'],
+            'UniqueID': [f"{seat}_{sentiment}_{cluster}" for seat, sentiment, cluster in rolled.index],
+            'Count': rolled['count'].to_numpy(dtype=np.int64),
+            'AvgOverallRating': mean('OverallRating'),
+            'RecommendationRate': np.where(index['sentiment'].astype(object) == '추천', 100.0, 0.0),
+            'DominantTraveller': dominant,
+        })
+        for col in SERVICE_COLUMNS:
+            stats[col] = mean(col)
+        return stats
+
+    def sentiment_dist(self, **filters):
+        filters.pop('sentiment', None)
+        dims = [dim for dim in CUBE_DIMENSIONS if dim in filters]
+        rolled = self.rollup(dims + ['sentiment'])
+        for dim, value in filters.items():
+            rolled = rolled[rolled.index.get_level_values(dim) == value]
+        counts = rolled.groupby(level='sentiment', observed=True)['count'].sum().sort_values(ascending=False, kind='stable')
+        total = counts.sum()
+        return (counts / total).to_dict() if total else {}
+
+
+# 3. 강점/약점 분석 함수
+@timed("build_strengths_weaknesses")
+def build_strengths_weaknesses(df, noun_tokens):
+    strengths = {}
+    weaknesses = {}
+
+    # (좌석, 감성) 그룹별 명사 빈도를 토큰 배열 위에서 한 번에 계산
+    seat_classes = list(df['SeatType'].dropna().unique())
+    sentiments = ['추천', '비추천']
+    seat_codes = pd.Categorical(df['SeatType'], categories=seat_classes).codes.astype(np.int64)
+    sentiment_codes = pd.Categorical(df['sentiment'], categories=sentiments).codes.astype(np.int64)
+    group_codes = np.where((seat_codes >= 0) & (sentiment_codes >= 0), seat_codes * 2 + sentiment_codes, -1)
+    counts = noun_tokens.grouped_counts(group_codes, len(seat_classes) * 2)
+    first_seen = noun_tokens.grouped_first_seen(group_codes, len(seat_classes) * 2)
+
+    def top_nouns(group):
+        # 상위 5개 명사 추출 (빈도순, 동률이면 그룹 안에서 먼저 등장한 명사)
+        top = top_k_from_counts(noun_tokens.vocab, counts[group], 5, first_seen[group])
+        return [word for word, _ in top] or ["데이터 없음"]
+
+    for i, seat_class in enumerate(seat_classes):
+        top_good = top_nouns(i * 2)
+        top_bad = top_nouns(i * 2 + 1)
+
+        strengths[seat_class] = ", ".join(top_good)
+        weaknesses[seat_class] = ", ".join(top_bad)
+
+    return strengths, weaknesses
+
+
+# 4. 클러스터별 통계 (좌석타입 × 추천여부 × 클러스터)
+CLUSTER_KEYS = ['SeatType', 'sentiment', 'ClusterID']
+
+
+def _dominant_traveller(crosstab):
+    """(군집 × 여행객 유형) 교차표의 행별 argmax. 동률이면 앞선 유형 (Series.mode()의 첫 값과 같음)"""
+    if crosstab.shape[1] == 0:
+        return np.full(len(crosstab), 'N/A', dtype=object)
+    counts = crosstab.to_numpy()
+    types = np.asarray(list(crosstab.columns) + ['N/A'], dtype=object)
+    return types[np.where(counts.sum(axis=1) > 0, counts.argmax(axis=1), crosstab.shape[1])]
+
+
+@timed("build_cluster_stats")
+def build_cluster_stats(df):
+    """(좌석, 감성, 클러스터)별 건수/평균 평점/추천율/최빈 여행객 유형을 한 번의 groupby로 계산합니다.
+
+    평균은 float64로 계산해 집계 큐브(AggregateCube.cluster_stats)와 같은 값이 나옵니다.
+    """
+    keys = pd.DataFrame({key: df[key] for key in CLUSTER_KEYS if key in df.columns}, index=df.index)
+    if 'ClusterID' not in keys.columns:
+        keys['ClusterID'] = NO_CLUSTER
+    values = pd.DataFrame({
+        col: pd.to_numeric(df[col], errors='coerce').astype(np.float64) if col in df.columns else np.nan
+        for col in RATING_COLUMNS
+    }, index=df.index)
+    values['recommended'] = (df['sentiment'] == '추천').astype(np.float64)
+
+    group_keys = [keys[key] for key in CLUSTER_KEYS]
+    aggregated = values.groupby(group_keys, observed=True, sort=True).agg(
+        Count=('recommended', 'size'),
+        AvgOverallRating=('OverallRating', 'mean'),
+        RecommendationRate=('recommended', 'mean'),
+        **{col: (col, 'mean') for col in SERVICE_COLUMNS},
+    )
+    # 여행객 유형 교차표도 같은 키 + 유형으로 한 번의 groupby
+    traveller = df['TypeOfTraveller'] if 'TypeOfTraveller' in df.columns else pd.Series(np.nan, index=df.index)
+    crosstab = values['recommended'].groupby(group_keys + [traveller], observed=True, sort=True).size() \
+        .unstack(fill_value=0).reindex(aggregated.index, fill_value=0)
+
+    index = aggregated.index.to_frame(index=False)
+    stats = pd.DataFrame({
+        'SeatType': index['SeatType'].astype(object),
+        'Sentiment': index['sentiment'].astype(object),
+        'ClusterID': index['ClusterID'],
+        'UniqueID': [f"{seat}_{sentiment}_{cluster}" for seat, sentiment, cluster in aggregated.index],
+        'Count': aggregated['Count'].to_numpy(dtype=np.int64),
+        'AvgOverallRating': aggregated['AvgOverallRating'].to_numpy(),
+        'RecommendationRate': aggregated['RecommendationRate'].to_numpy() * 100,
+        'DominantTraveller': _dominant_traveller(crosstab),
+    })
+    for col in SERVICE_COLUMNS:
+        stats[col] = aggregated[col].to_numpy()
+    return stats
+
+
+@timed("build_cluster_rows")
+def build_cluster_rows(df) -> dict:
+    """(좌석, 감성, 클러스터) → 행 위치 배열. 군집 상세의 대표 리뷰 검색에 사용 (ClusterID가 없으면 빈 dict)"""
+    if 'ClusterID' not in df.columns:
+        return {}
+    return df.groupby(CLUSTER_KEYS, observed=True).indices
+
+
+# 5. 군집 평점 히트맵 행렬 ((좌석타입, 추천여부) × 클러스터)
+def build_heatmap(cluster_stats_df):
+    return cluster_stats_df.set_index(['SeatType', 'Sentiment', 'ClusterID'])['AvgOverallRating'] \
+        .unstack('ClusterID').fillna(0)
+
+
+# 6. 서비스 항목별 최고/최저 군집
+def build_service_rankings(cluster_stats_df):
+    """서비스 항목 → {'best': {...}, 'worst': {...}} (평균 점수가 모두 비어 있는 항목은 제외)"""
+    scores = cluster_stats_df[SERVICE_COLUMNS].dropna(axis=1, how='all')
+    rankings = {}
+    for col, best_idx, worst_idx in zip(scores.columns, scores.idxmax(), scores.idxmin()):
+        rankings[col] = {
+            rank: {
+                'cluster': cluster_stats_df.at[idx, 'UniqueID'],
+                'score': cluster_stats_df.at[idx, col],
+                'seat_type': cluster_stats_df.at[idx, 'SeatType'],
+                'sentiment': cluster_stats_df.at[idx, 'Sentiment'],
+            }
+            for rank, idx in (('best', best_idx), ('worst', worst_idx))
+        }
+    return rankings
+
+
+def build_cluster_views(cluster_stats_df) -> dict:
+    """군집 섹션이 읽는 통계표/히트맵/서비스별 순위를 한 번에 계산 (분석 결과와 함께 캐시됨)"""
+    return {
+        "cluster_stats": cluster_stats_df,
+        "heatmap": build_heatmap(cluster_stats_df),
+        "service_rankings": build_service_rankings(cluster_stats_df),
+    }
@@ -0,0 +1,190 @@
+import glob
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from src.gpt_client import COMPLETION_PARAMS, deployment_name, get_client
+
+BATCH_ENDPOINT = "/chat/completions"
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    dataset: str
+    segment: str
+    prompt: str
+
+    def to_line(self) -> dict:
+        return {
+            "custom_id": self.custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": deployment_name(),
+                "messages": [{"role": "user", "content": self.prompt}],
+                **COMPLETION_PARAMS,
+            },
+        }
+
+
+def dataset_key(dataset) -> str:
+    # 파일 이름 + 내용 해시 앞부분: 같은 파일이면 항상 같은 키 (custom_id가 실행마다 바뀌지 않음)
+    stem = os.path.splitext(os.path.basename(dataset.name))[0]
+    return f"{stem}-{dataset.content_hash[:12]}"
+
+
+def split_custom_id(custom_id: str):
+    dataset, _, segment = custom_id.partition("/")
+    return dataset, segment
+
+
+def find_csv_files(inputs) -> list:
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            paths.extend(sorted(glob.glob(os.path.join(path, "*.csv"))))
+        else:
+            paths.append(path)
+    return paths
+
+
+def collect_batch_requests(inputs, include_segments: bool = True) -> list:
+    """입력 파일(또는 디렉터리)마다 전체 리포트 2개 + 군집별 리포트 프롬프트를 만듭니다."""
+    # pandas/군집화를 불러오는 모듈은 프롬프트를 만들 때만 import (run/fetch/collect는 필요 없음)
+    from src.dataset import ReviewDataset
+    from src.report_generator import build_report_prompts, build_segment_prompts
+
+    requests = []
+    for path in find_csv_files(inputs):
+        dataset = ReviewDataset.from_path(path)
+        key = dataset_key(dataset)
+        prompts = dict(build_report_prompts(dataset))
+        if include_segments and "SeatType" in dataset.columns:
+            prompts.update(build_segment_prompts(dataset))
+        for segment, prompt in prompts.items():
+            requests.append(BatchRequest(f"{key}/{segment}", key, segment, prompt))
+    return requests
+
+
+def write_batch_file(requests, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for request in requests:
+            f.write(json.dumps(request.to_line(), ensure_ascii=False) + "\n")
+
+
+def read_jsonl(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class LocalExecutor:
+    """네트워크 없이 배치 흐름을 검증하기 위한 대체 실행기.
+
+    Batch API와 같은 형식의 결과 파일을 만들며, 응답 내용은 responder(prompt) 로 생성합니다.
+    """
+
+    def __init__(self, responder=None):
+        self.responder = responder or (lambda prompt: f"[local] {prompt.splitlines()[0]}")
+
+    def run(self, input_path: str, output_path: str) -> str:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as out:
+            for i, line in enumerate(read_jsonl(input_path)):
+                prompt = line["body"]["messages"][-1]["content"]
+                result = {
+                    "id": f"local-{i}",
+                    "custom_id": line["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "request_id": f"local-{i}",
+                        "body": {
+                            "object": "chat.completion",
+                            "model": line["body"]["model"],
+                            "choices": [{
+                                "index": 0,
+                                "message": {"role": "assistant", "content": self.responder(prompt)},
+                                "finish_reason": "stop",
+                            }],
+                        },
+                    },
+                    "error": None,
+                }
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        return output_path
+
+
+class AzureBatchExecutor:
+    """Azure OpenAI Batch API로 제출하고, 완료되면 결과 파일을 내려받습니다."""
+
+    def __init__(self, poll_interval: float = 60.0, completion_window: str = "24h"):
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    def submit(self, input_path: str) -> str:
+        client = get_client()
+        with open(input_path, "rb") as f:
+            batch_file = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def fetch(self, batch_id: str, output_path: str, wait: bool = True):
+        """배치가 끝났으면 결과를 output_path에 저장하고 경로를, 아직이면 None을 반환합니다."""
+        client = get_client()
+        while True:
+            batch = client.batches.retrieve(batch_id)
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"배치 {batch_id} 실패: {batch.status}")
+            if batch.status == "completed":
+                break
+            if not wait:
+                return None
+            time.sleep(self.poll_interval)
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as out:
+            # 성공 결과와 실패 결과는 별도 파일로 오므로 하나로 합쳐서 저장
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    out.write(client.files.content(file_id).text)
+        return output_path
+
+    def run(self, input_path: str, output_path: str) -> str:
+        return self.fetch(self.submit(input_path), output_path, wait=True)
+
+
+EXECUTORS = {"local": LocalExecutor, "azure": AzureBatchExecutor}
+
+
+def ingest_results(output_path: str) -> dict:
+    """결과 파일을 {데이터셋 키: {세그먼트: 리포트}} 로 묶습니다. 실패한 요청은 "오류: ..." 문자열로 기록."""
+    reports = {}
+    for line in read_jsonl(output_path):
+        dataset, segment = split_custom_id(line["custom_id"])
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or response.get("body", {}).get("error")
+            text = f"오류: {error}"
+        else:
+            text = response["body"]["choices"][0]["message"]["content"]
+        reports.setdefault(dataset, {})[segment] = text
+    return reports
+
+
+def write_reports(reports: dict, out_dir: str) -> list:
+    """out_dir/<데이터셋 키>/<세그먼트>.txt 로 저장하고 저장한 경로 목록을 반환합니다."""
+    paths = []
+    for dataset, segments in reports.items():
+        os.makedirs(os.path.join(out_dir, dataset), exist_ok=True)
+        for segment, text in segments.items():
+            path = os.path.join(out_dir, dataset, f"{segment}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            paths.append(path)
+    return paths
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+# 분석 파이프라인(전처리/집계) 로직이 바뀌면 이 값을 올려서 기존 캐시를 무효화합니다.
+PIPELINE_VERSION = "9"
+
+CACHE_DIR = os.getenv("REVIEWDOCTOR_CACHE_DIR", os.path.join(".cache", "reviewdoctor"))
+MAX_MEMORY_BYTES = int(os.getenv("REVIEWDOCTOR_CACHE_MEMORY_MB", "512")) * 1024 * 1024
+MAX_DISK_BYTES = int(os.getenv("REVIEWDOCTOR_CACHE_DISK_MB", "4096")) * 1024 * 1024
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_key(data_hash: str, version: str = PIPELINE_VERSION) -> str:
+    return f"v{version}-{data_hash}"
+
+
+class PipelineCache:
+    """메모리(LRU) + 디스크 2단 캐시. 크기는 pickle 직렬화 바이트 기준으로 제한합니다.
+
+    메모리 캐시는 값을 복사하지 않고 같은 객체(DataFrame 등)를 모든 호출자에게 돌려주므로,
+    get/get_or_compute로 받은 값은 직접 수정하지 말고 필요하면 복사해서 사용합니다.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_memory_bytes: int = MAX_MEMORY_BYTES,
+                 max_disk_bytes: int = MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()  # key -> (value, size)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _remember(self, key: str, value, size: int):
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = (value, size)
+        self._memory_bytes += size
+        # 가장 오래 사용되지 않은 항목부터 제거
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key][0]
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+        except OSError:
+            return default
+        try:
+            value = pickle.loads(payload)
+        except Exception:
+            # 깨진 파일이나 이전 코드 버전의 pickle(AttributeError, ImportError 등)은 없는 것으로 보고 삭제
+            self.invalidate(key)
+            return default
+
+        # 디스크 LRU 판단을 위해 접근 시각 갱신
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._remember(key, value, len(payload))
+        return value
+
+    def put(self, key: str, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, value, len(payload))
+
+        if len(payload) > self.max_disk_bytes:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 다른 세션이 동시에 읽어도 깨진 파일을 보지 않도록 임시 파일에 쓰고 교체
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except OSError:
+            # 디스크 캐시는 부가 기능이므로 실패해도 메모리 캐시로 계속 진행
+            pass
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def invalidate(self, key: str):
+        """key 항목을 메모리와 디스크에서 지웁니다."""
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get_or_compute(self, key: str, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pkl"):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+
+
+# Streamlit 재실행 사이에도 모듈은 유지되므로 프로세스 단위 싱글톤으로 공유
+pipeline_cache = PipelineCache()
@@ -0,0 +1,259 @@
+import json
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from src.loader import DEFAULT_CHUNKSIZE, iter_review_chunks
+from src.profiling import timed
+
+# 리뷰 벡터를 만들 텍스트 컬럼 (명사 + 형용사/부사)
+CLUSTER_TEXT_COLUMNS = ['Nouns', 'Adjectives/Adverbs']
+# 좌석 × 추천여부 세그먼트마다 찾을 군집 수 (4 좌석 × 2 추천여부 × 3 = 24개 군집)
+CLUSTERS_PER_SEGMENT = int(os.getenv("REVIEWDOCTOR_CLUSTERS_PER_SEGMENT", "3"))
+# 해시 TF-IDF 차원 수 (단어 사전 없이 고정 크기 벡터)
+HASH_FEATURES = 2 ** 11
+# 한 번에 밀집 행렬로 만드는 리뷰 수 (메모리 상한 = BATCH_SIZE × HASH_FEATURES × 4바이트)
+BATCH_SIZE = 4096
+
+
+def can_cluster(columns) -> bool:
+    """세그먼트 컬럼(SeatType, Recommended)과 텍스트 컬럼이 하나 이상 있는지"""
+    columns = set(columns)
+    return {'SeatType', 'Recommended'} <= columns and any(col in columns for col in CLUSTER_TEXT_COLUMNS)
+
+
+def _tokens(frame):
+    """행별 단어를 (행 위치, 단어) 쌍으로 펼침. 영문은 소문자로 바꾸고 글자가 아닌 문자는 구분자로 취급"""
+    columns = [col for col in CLUSTER_TEXT_COLUMNS if col in frame.columns]
+    if not columns:
+        raise KeyError(f"군집화에 필요한 텍스트 컬럼이 없습니다: {CLUSTER_TEXT_COLUMNS}")
+    text = frame[columns[0]].astype(object).fillna('').astype(str)
+    for col in columns[1:]:
+        text = text + ' ' + frame[col].astype(object).fillna('').astype(str)
+    words = text.str.lower().str.replace(r'[^a-z가-힣]+', ' ', regex=True).str.split()
+    words = pd.Series(words.to_numpy(), index=np.arange(len(frame))).explode().dropna()
+    return words.index.to_numpy(dtype=np.int64), words.to_numpy(dtype=object)
+
+
+class HashedTfidfVectorizer:
+    """단어를 crc32로 고정 크기 벡터에 해시하는 TF-IDF (사전 없이 스트리밍으로 학습 가능).
+
+    partial_fit은 문서 빈도만 누적하므로 새 데이터가 들어와도 전체를 다시 읽을 필요가 없습니다.
+    """
+
+    def __init__(self, n_features: int = HASH_FEATURES):
+        self.n_features = n_features
+        self.n_docs = 0
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+
+    def _hash(self, words):
+        # 배치 안의 고유 단어만 해시하고, 상위 비트로 부호를 정해 해시 충돌이 한쪽으로 쌓이지 않게 함
+        # (crc32는 충분히 싸므로 배치 간 해시 캐시는 두지 않음 → 메모리가 어휘 크기에 따라 늘지 않음)
+        codes, uniques = pd.factorize(words)
+        buckets = np.empty(len(uniques), dtype=np.int64)
+        signs = np.empty(len(uniques), dtype=np.float32)
+        for i, word in enumerate(uniques):
+            h = zlib.crc32(word.encode('utf-8'))
+            buckets[i] = h % self.n_features
+            signs[i] = 1.0 if h >> 31 else -1.0
+        return buckets[codes], signs[codes]
+
+    def _counts(self, frame):
+        rows, words = _tokens(frame)
+        buckets, signs = self._hash(words)
+        return rows, buckets, signs
+
+    def partial_fit(self, frame):
+        rows, buckets, _ = self._counts(frame)
+        pairs = np.unique(rows * self.n_features + buckets)
+        self.doc_freq += np.bincount(pairs % self.n_features, minlength=self.n_features)
+        self.n_docs += len(frame)
+        return self
+
+    @property
+    def idf(self):
+        return (np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1).astype(np.float32)
+
+    def transform(self, frame):
+        """(행 수, n_features) float32 행렬. 각 행은 L2 정규화 (단어가 없는 리뷰는 0 벡터)"""
+        rows, buckets, signs = self._counts(frame)
+        X = np.bincount(rows * self.n_features + buckets, weights=signs,
+                        minlength=len(frame) * self.n_features).astype(np.float32)
+        X = X.reshape(len(frame), self.n_features)
+        X *= self.idf
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        np.divide(X, norms, out=X, where=norms > 0)
+        return X
+
+
+class MiniBatchKMeans:
+    """미니배치 k-means (Sculley 2010). 배치마다 중심을 군집별 누적 건수에 반비례하는 학습률로 이동합니다."""
+
+    def __init__(self, n_clusters: int = CLUSTERS_PER_SEGMENT, seed: int = 0, init_iterations: int = 10):
+        self.n_clusters = n_clusters
+        self.seed = seed
+        self.init_iterations = init_iterations
+        self.centers = None
+        self.counts = None
+
+    def _init_centers(self, X):
+        # k-means++ 초기화 후 첫 배치에서 Lloyd 반복으로 다듬음
+        rng = np.random.default_rng(self.seed)
+        centers = [X[rng.integers(len(X))]]
+        # 가장 가까운 중심까지의 거리²를 ‖x‖² − 2x·c + ‖c‖²로 중심 하나씩 갱신 (배치 × 차원 외 추가 메모리 없음)
+        x_sq = (X ** 2).sum(axis=1)
+        dist = np.full(len(X), np.inf, dtype=np.float32)
+        for _ in range(1, self.n_clusters):
+            center = centers[-1]
+            np.minimum(dist, np.maximum(x_sq - 2 * (X @ center) + center @ center, 0), out=dist)
+            total = dist.sum(dtype=np.float64)
+            index = rng.choice(len(X), p=dist / total) if total > 0 else rng.integers(len(X))
+            centers.append(X[index])
+        self.centers = np.asarray(centers, dtype=np.float32)
+        for _ in range(self.init_iterations):
+            labels = self.predict(X)
+            sums, counts = self._cluster_sums(X, labels)
+            moved = counts > 0
+            self.centers[moved] = sums[moved] / counts[moved, None]
+        self.counts = np.zeros(self.n_clusters, dtype=np.int64)
+
+    def _cluster_sums(self, X, labels):
+        counts = np.bincount(labels, minlength=self.n_clusters)
+        one_hot = np.zeros((self.n_clusters, len(X)), dtype=np.float32)
+        one_hot[labels, np.arange(len(X))] = 1
+        return one_hot @ X, counts
+
+    def partial_fit(self, X):
+        if len(X) == 0:
+            return self
+        if self.centers is None:
+            self._init_centers(X)
+        labels = self.predict(X)
+        sums, counts = self._cluster_sums(X, labels)
+        self.counts += counts
+        moved = counts > 0
+        # c ← c + (배치 합 − n·c) / 누적 건수
+        self.centers[moved] += (sums[moved] - counts[moved, None] * self.centers[moved]) / self.counts[moved, None]
+        return self
+
+    def predict(self, X):
+        # ‖x − c‖² = ‖x‖² − 2x·c + ‖c‖² 에서 x마다 같은 ‖x‖²는 생략
+        scores = X @ self.centers.T * -2 + (self.centers ** 2).sum(axis=1)
+        return scores.argmin(axis=1)
+
+
+class ReviewClusterer:
+    """좌석 × 추천여부 세그먼트별 리뷰 군집화 (해시 TF-IDF + 미니배치 k-means, CPU/NumPy만 사용).
+
+    partial_fit/predict는 BATCH_SIZE 행씩 처리하므로 메모리는 배치 크기에만 비례합니다.
+    save/load로 모델을 보관하면 새 리뷰는 기존 중심에 이어서 학습(partial_fit)하고 같은 군집 번호 체계로 배정합니다.
+    """
+
+    def __init__(self, n_clusters: int = CLUSTERS_PER_SEGMENT, n_features: int = HASH_FEATURES, seed: int = 0):
+        self.n_clusters = n_clusters
+        self.seed = seed
+        self.vectorizer = HashedTfidfVectorizer(n_features)
+        self.models = {}  # (SeatType, Recommended) -> MiniBatchKMeans
+
+    @staticmethod
+    def _segments(frame):
+        # 저장/불러오기 후에도 같은 키가 되도록 세그먼트 값은 문자열로 통일
+        keys = frame[['SeatType', 'Recommended']].astype(object)
+        valid = keys.notna().all(axis=1).to_numpy()
+        positions = np.flatnonzero(valid)
+        groups = pd.Series(positions).groupby([keys['SeatType'].to_numpy()[valid].astype(str),
+                                               keys['Recommended'].to_numpy()[valid].astype(str)], sort=True)
+        return {key: indices.to_numpy() for key, indices in groups}
+
+    def _batches(self, frame, batch_size):
+        for key, positions in self._segments(frame).items():
+            for start in range(0, len(positions), batch_size):
+                batch = positions[start:start + batch_size]
+                yield key, batch, self.vectorizer.transform(frame.iloc[batch])
+
+    @timed("clustering.partial_fit")
+    def partial_fit(self, frame, batch_size: int = BATCH_SIZE):
+        # 문서 빈도(IDF)를 먼저 갱신한 뒤 같은 가중치로 벡터화해서 중심 갱신
+        self.vectorizer.partial_fit(frame)
+        for key, _, X in self._batches(frame, batch_size):
+            model = self.models.get(key)
+            if model is None:
+                model = self.models[key] = MiniBatchKMeans(self.n_clusters, seed=self.seed)
+            model.partial_fit(X)
+        return self
+
+    @timed("clustering.predict")
+    def predict(self, frame, batch_size: int = BATCH_SIZE):
+        """행별 ClusterID (좌석/추천여부가 비었거나 학습되지 않은 세그먼트는 -1)"""
+        labels = np.full(len(frame), -1, dtype=np.int64)
+        for key, batch, X in self._batches(frame, batch_size):
+            if key in self.models:
+                labels[batch] = self.models[key].predict(X)
+        return labels
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        keys = list(self.models)
+        meta = {
+            "n_clusters": self.n_clusters,
+            "seed": self.seed,
+            "n_features": self.vectorizer.n_features,
+            "n_docs": self.vectorizer.n_docs,
+            "segments": [list(map(str, key)) for key in keys],
+        }
+        arrays = {f"centers_{i}": self.models[key].centers for i, key in enumerate(keys)}
+        arrays.update({f"counts_{i}": self.models[key].counts for i, key in enumerate(keys)})
+        # np.savez는 확장자를 붙이므로 임시 파일도 .npz로 끝나게 함
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, meta=np.array(json.dumps(meta)), doc_freq=self.vectorizer.doc_freq, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            clusterer = cls(meta["n_clusters"], meta["n_features"], meta["seed"])
+            clusterer.vectorizer.n_docs = meta["n_docs"]
+            clusterer.vectorizer.doc_freq = data["doc_freq"].copy()
+            for i, key in enumerate(meta["segments"]):
+                model = MiniBatchKMeans(meta["n_clusters"], seed=meta["seed"])
+                model.centers = data[f"centers_{i}"].copy()
+                model.counts = data[f"counts_{i}"].copy()
+                clusterer.models[tuple(key)] = model
+        return clusterer
+
+
+def assign_cluster_ids(frame, clusterer: ReviewClusterer = None):
+    """ClusterID가 없는 리뷰에 군집 번호를 매깁니다. clusterer를 주면 이어서 학습(증분)하고, 없으면 새로 학습합니다.
+
+    (ClusterID 배열, clusterer) 반환
+    """
+    clusterer = clusterer or ReviewClusterer()
+    clusterer.partial_fit(frame)
+    return clusterer.predict(frame), clusterer
+
+
+def cluster_csv(source: str, out_path: str, model_path: str = None, chunksize: int = DEFAULT_CHUNKSIZE):
+    """대용량 CSV를 청크 단위로 두 번 읽어(학습 → 배정) ClusterID 컬럼을 채운 CSV를 저장합니다.
+
+    model_path에 모델이 있으면 불러와 이어서 학습하고, 끝나면 같은 경로에 저장합니다. 처리한 행 수 반환
+    """
+    clusterer = ReviewClusterer.load(model_path) if model_path and os.path.exists(model_path) else ReviewClusterer()
+    for chunk in iter_review_chunks(source, columns=CLUSTER_TEXT_COLUMNS + ['SeatType', 'Recommended'],
+                                    chunksize=chunksize):
+        clusterer.partial_fit(chunk)
+
+    rows = 0
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        # 원본의 모든 컬럼을 그대로 쓰고 ClusterID만 채움 (기존 ClusterID는 덮어씀)
+        for chunk in iter_review_chunks(source, columns=None, chunksize=chunksize):
+            chunk["ClusterID"] = clusterer.predict(chunk)
+            chunk.to_csv(f, index=False, header=rows == 0)
+            rows += len(chunk)
+    if model_path:
+        clusterer.save(model_path)
+    return rows
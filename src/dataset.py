@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.cache import cache_key, content_hash, pipeline_cache
+from src.clustering import assign_cluster_ids, can_cluster
+from src.loader import ANALYSIS_COLUMNS, SEGMENT_COLUMNS, read_reviews
+
+# 모든 페이지(분석 + 리포트)에서 사용하는 컬럼
+DATASET_COLUMNS = list(dict.fromkeys(ANALYSIS_COLUMNS + SEGMENT_COLUMNS))
+
+
+@dataclass(frozen=True, eq=False)
+class ReviewDataset:
+    """업로드된 리뷰 CSV를 한 번만 파싱해서 페이지 간에 공유하는 읽기 전용 핸들.
+
+    frame은 여러 페이지/캐시가 함께 참조하므로 직접 수정하지 말고, 변경이 필요하면 복사해서 사용합니다.
+    """
+
+    name: str
+    content_hash: str
+    frame: pd.DataFrame
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = "uploaded.csv"):
+        data_hash = content_hash(data)
+        frame = read_reviews(data, columns=DATASET_COLUMNS)
+        if 'ClusterID' not in frame.columns and can_cluster(frame.columns):
+            # 군집 번호가 없는 파일은 내장 군집화로 채움 (ClusterID가 있는 파일은 그대로 사용)
+            # 결과는 파일 해시로 캐시하므로 같은 파일을 다시 올리거나 새 세션에서 열면 군집화를 건너뜀
+            cluster_ids = pipeline_cache.get_or_compute(
+                cache_key(data_hash) + "-clusters",
+                lambda: assign_cluster_ids(frame)[0],
+            )
+            frame['ClusterID'] = cluster_ids.copy()
+        return cls(name=name, content_hash=data_hash, frame=frame)
+
+    @classmethod
+    def from_path(cls, path: str):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read(), name=path)
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def columns(self):
+        return self.frame.columns.tolist()
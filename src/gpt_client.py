@@ -1,22 +1,259 @@
+import asyncio
+import atexit
 import os
-from openai import AzureOpenAI
-from dotenv import load_dotenv
+import threading
+import time
+import weakref
+from functools import cache
+from src.llm_cache import llm_cache, request_key, LLM_CACHE_BYPASS
+from src.telemetry import CallRecord, telemetry
 
-load_dotenv()
+COMPLETION_PARAMS = dict(temperature=0.5, max_tokens=2048)
 
-client = AzureOpenAI(
-    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-    api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-    azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-)
+# 비동기 클라이언트는 이벤트 루프에 묶이므로 루프마다 하나씩 만들어 재사용 (커넥션 풀 공유)
+_async_clients = weakref.WeakKeyDictionary()
+# run_sync가 코루틴을 실행하는 프로세스 공용 이벤트 루프 (백그라운드 스레드에서 계속 실행)
+_loop = None
+_loop_lock = threading.Lock()
 
-DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT")
 
-def get_report_from_gpt(prompt: str) -> str:
-    response = client.chat.completions.create(
-        model=DEPLOYMENT_NAME,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.5,
-        max_tokens=2048,
+@cache
+def load_env():
+    """.env를 환경변수로 불러옵니다. (import 시점이 아니라 처음 클라이언트/배포 설정이 필요할 때 한 번)"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@cache
+def _settings():
+    load_env()
+    client_kwargs = dict(
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
     )
-    return response.choices[0].message.content
+    return client_kwargs, os.getenv("AZURE_OPENAI_DEPLOYMENT")
+
+
+def deployment_name() -> str:
+    return _settings()[1]
+
+
+# openai SDK는 import만 1초 가까이 걸리므로 실제로 API를 호출할 때 처음 불러옴
+@cache
+def get_client():
+    from openai import AzureOpenAI
+
+    return AzureOpenAI(**_settings()[0])
+
+
+def get_async_client():
+    from openai import AsyncAzureOpenAI
+
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        async_client = AsyncAzureOpenAI(**_settings()[0])
+        _async_clients[loop] = async_client
+    return async_client
+
+
+def __getattr__(name):
+    # 기존 코드의 `from src.gpt_client import client, DEPLOYMENT_NAME, CLIENT_KWARGS` 호환
+    if name == "client":
+        return get_client()
+    if name == "DEPLOYMENT_NAME":
+        return deployment_name()
+    if name == "CLIENT_KWARGS":
+        return _settings()[0]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _background_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="gpt-client-loop", daemon=True)
+            thread.start()
+            atexit.register(_close_background_loop, loop, thread)
+            _loop = loop
+    return _loop
+
+
+def _close_background_loop(loop, thread):
+    # 종료 시 공용 루프의 클라이언트(커넥션 풀)를 닫고 루프를 멈춤
+    try:
+        asyncio.run_coroutine_threadsafe(close_async_client(), loop).result(timeout=5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    if not thread.is_alive():
+        loop.close()
+
+
+async def close_async_client():
+    """현재 이벤트 루프의 비동기 클라이언트를 닫습니다. (run_sync 대신 직접 asyncio.run을 쓰는 경우 끝날 때 호출)"""
+    async_client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if async_client is not None:
+        await async_client.close()
+
+
+def run_sync(coro):
+    """동기 코드(main.py, Streamlit 페이지)에서 코루틴을 실행합니다.
+
+    호출마다 새 이벤트 루프(asyncio.run)를 만들면 클라이언트와 커넥션도 매번 새로 생기므로,
+    모든 호출을 하나의 백그라운드 루프에서 실행해 그 루프의 클라이언트를 계속 재사용합니다.
+    """
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync는 공용 이벤트 루프 안에서 호출할 수 없습니다. await를 사용하세요.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _cache_key(prompt: str) -> str:
+    return request_key(deployment_name(), prompt, **COMPLETION_PARAMS)
+
+
+def _cache_enabled(use_cache: bool) -> bool:
+    return use_cache and not LLM_CACHE_BYPASS
+
+
+def _lookup_cache(prompt: str, use_cache: bool, stream: bool = False):
+    if not _cache_enabled(use_cache):
+        return None
+    start = time.perf_counter()
+    cached = llm_cache.get(_cache_key(prompt))
+    if cached is not None:
+        telemetry.record(CallRecord(deployment_name(), stream=stream, cache_hit=True,
+                                    latency_seconds=time.perf_counter() - start))
+    return cached
+
+
+def cached_report(prompt: str):
+    """캐시된 응답이 있으면 반환 (없거나 캐시 우회 설정이면 None)"""
+    return _lookup_cache(prompt, True)
+
+
+def store_report(prompt: str, content: str):
+    if _cache_enabled(True) and content:
+        llm_cache.put(_cache_key(prompt), content)
+
+
+def get_report_from_gpt(prompt: str, use_cache: bool = True) -> str:
+    cached = _lookup_cache(prompt, use_cache)
+    if cached is not None:
+        return cached
+
+    # with_raw_response: 응답 본문과 함께 SDK가 재시도한 횟수(retries_taken)를 받기 위해 사용
+    with telemetry.track(deployment_name(), prompt) as call:
+        raw = get_client().chat.completions.with_raw_response.create(
+            model=deployment_name(),
+            messages=[{"role": "user", "content": prompt}],
+            **COMPLETION_PARAMS,
+        )
+        call.retries += raw.retries_taken
+        response = raw.parse()
+        call.usage = response.usage
+        content = call.content = response.choices[0].message.content
+
+    if _cache_enabled(use_cache) and content:
+        llm_cache.put(_cache_key(prompt), content)
+    return content
+
+
+async def get_report_from_gpt_async(prompt: str, use_cache: bool = True, max_retries: int = None,
+                                    retries: int = 0) -> str:
+    """retries: 호출하는 쪽(스케줄러)이 이미 재시도한 횟수 (호출 기록용)"""
+    cached = _lookup_cache(prompt, use_cache)
+    if cached is not None:
+        return cached
+
+    async_client = get_async_client()
+    if max_retries is not None:
+        # 호출하는 쪽(스케줄러)이 재시도를 직접 관리할 때 SDK 자체 재시도 횟수를 덮어씀
+        async_client = async_client.with_options(max_retries=max_retries)
+    with telemetry.track(deployment_name(), prompt, retries=retries) as call:
+        raw = await async_client.chat.completions.with_raw_response.create(
+            model=deployment_name(),
+            messages=[{"role": "user", "content": prompt}],
+            **COMPLETION_PARAMS,
+        )
+        call.retries += raw.retries_taken
+        response = raw.parse()
+        call.usage = response.usage
+        content = call.content = response.choices[0].message.content
+
+    if _cache_enabled(use_cache) and content:
+        llm_cache.put(_cache_key(prompt), content)
+    return content
+
+
+def _chunk_text(call, chunk):
+    """스트림 청크의 텍스트 조각 (usage만 담긴 마지막 청크는 사용량만 기록하고 None)"""
+    if getattr(chunk, "usage", None) is not None:
+        call.usage = chunk.usage
+    # Azure는 콘텐츠 필터 결과만 담긴(choices가 빈) 청크를 보내기도 함
+    if chunk.choices and chunk.choices[0].delta.content:
+        call.add_token(chunk.choices[0].delta.content)
+        return chunk.choices[0].delta.content
+    return None
+
+
+def stream_report_from_gpt(prompt: str, use_cache: bool = True):
+    """생성되는 토큰(텍스트 조각)을 도착하는 대로 반환하는 제너레이터. 캐시 적중 시 전체 응답을 한 번에 반환"""
+    cached = _lookup_cache(prompt, use_cache, stream=True)
+    if cached is not None:
+        yield cached
+        return
+
+    with telemetry.track(deployment_name(), prompt, stream=True) as call:
+        raw = get_client().chat.completions.with_raw_response.create(
+            model=deployment_name(),
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            stream_options={"include_usage": True},  # 마지막 청크에 토큰 사용량 포함
+            **COMPLETION_PARAMS,
+        )
+        call.retries += raw.retries_taken
+        for chunk in raw.parse():
+            token = _chunk_text(call, chunk)
+            if token is not None:
+                yield token
+    tokens = call.tokens
+
+    # 스트림을 끝까지 받은 경우에만 저장
+    if _cache_enabled(use_cache) and tokens:
+        llm_cache.put(_cache_key(prompt), "".join(tokens))
+
+
+async def stream_report_from_gpt_async(prompt: str, use_cache: bool = True):
+    cached = _lookup_cache(prompt, use_cache, stream=True)
+    if cached is not None:
+        yield cached
+        return
+
+    with telemetry.track(deployment_name(), prompt, stream=True) as call:
+        raw = await get_async_client().chat.completions.with_raw_response.create(
+            model=deployment_name(),
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            stream_options={"include_usage": True},
+            **COMPLETION_PARAMS,
+        )
+        call.retries += raw.retries_taken
+        async for chunk in raw.parse():
+            token = _chunk_text(call, chunk)
+            if token is not None:
+                yield token
+    tokens = call.tokens
+
+    if _cache_enabled(use_cache) and tokens:
+        llm_cache.put(_cache_key(prompt), "".join(tokens))
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis import CUBE_DIMENSIONS, NO_CLUSTER
+from src.tokens import top_k_from_counts
+from src.profiling import timed
+
+
+class KeywordIndex:
+    """(연도, 월, 좌석, 감성, 클러스터) 셀별 단어 빈도표.
+
+    셀 목록(cells)과 셀별 (토큰 id, 빈도, 첫 등장 위치) 항목을 CSR 형태로 보관하므로,
+    "전체 월"/"전체 클러스터" 같은 합산 조회도 행 데이터 없이 항목 배열만으로 계산합니다.
+    첫 등장 위치(entry_first)는 전체 토큰 흐름에서의 위치이며, n_tokens는 전체 토큰 수입니다.
+    """
+
+    def __init__(self, vocab, cells, cell_offsets, entry_tokens, entry_counts, entry_first, n_tokens):
+        self.vocab = vocab
+        self.cells = cells
+        self.cell_offsets = cell_offsets
+        self.entry_tokens = entry_tokens
+        self.entry_counts = entry_counts
+        self.entry_first = entry_first
+        self.n_tokens = n_tokens
+        self._memo = {}
+
+    def _cell_mask(self, filters):
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, value in filters.items():
+            if dim not in CUBE_DIMENSIONS:
+                raise KeyError(f"알 수 없는 차원입니다: {dim}")
+            mask &= (self.cells[dim] == value).to_numpy()
+        return mask
+
+    def _aggregate(self, filters):
+        key = tuple(sorted(filters.items(), key=lambda item: item[0]))
+        if key not in self._memo:
+            entry_mask = np.repeat(self._cell_mask(filters), np.diff(self.cell_offsets))
+            tokens = self.entry_tokens[entry_mask]
+            counts = np.bincount(tokens, weights=self.entry_counts[entry_mask], minlength=len(self.vocab))
+            first_seen = np.full(len(self.vocab), self.n_tokens, dtype=np.int64)
+            np.minimum.at(first_seen, tokens, self.entry_first[entry_mask])
+            self._memo[key] = (counts.astype(np.int64), first_seen)
+        return self._memo[key]
+
+    def counts(self, **filters):
+        """필터에 해당하는 모든 셀의 단어 빈도 합계 (길이 = 어휘 크기)"""
+        return self._aggregate(filters)[0]
+
+    def first_seen(self, **filters):
+        """필터에 해당하는 셀들 안에서 단어별 첫 등장 위치 (나오지 않은 단어는 n_tokens)"""
+        return self._aggregate(filters)[1]
+
+    def top_k(self, k=10, **filters):
+        """빈도 상위 k개 (단어, 빈도). 동률이면 필터에 해당하는 리뷰 안에서 먼저 등장한 단어가 앞에 옵니다."""
+        counts, first_seen = self._aggregate(filters)
+        return top_k_from_counts(self.vocab, counts, k, first_seen)
+
+    def frequencies(self, **filters):
+        counts = self.counts(**filters)
+        nonzero = np.flatnonzero(counts)
+        return dict(zip(self.vocab[nonzero].tolist(), counts[nonzero].tolist()))
+
+    def merge(self, other):
+        """두 인덱스의 셀별 단어 빈도 합 (결합 법칙 성립, 행 데이터 없이 항목 배열만 사용).
+
+        어휘는 self 순서를 유지하고 other에만 있는 단어를 뒤에 붙이며, other의 토큰 위치는 self 뒤에 오도록 밀어서
+        파일 순서대로 합치면 어휘 순서와 셀별 첫 등장 순서가 한 번에 만든 인덱스와 같습니다.
+        """
+        vocab_index = pd.Index(self.vocab)
+        extra = pd.Index(other.vocab).difference(vocab_index, sort=False)
+        vocab = np.concatenate([np.asarray(self.vocab, dtype=object), extra.to_numpy(dtype=object)])
+        remap = pd.Index(vocab).get_indexer(other.vocab).astype(np.int32)
+
+        # 두 셀 목록을 합쳐 새 셀 번호를 매기고, 각 항목을 새 (셀, 토큰) 코드로 옮겨 합산
+        cells = pd.concat([self.cells, other.cells], ignore_index=True)
+        grouped = cells.groupby(CUBE_DIMENSIONS, sort=True, dropna=False, observed=True)
+        cell_ids = grouped.ngroup().to_numpy(dtype=np.int64)
+        merged_cells = grouped.size().index.to_frame(index=False)
+
+        n_self = len(self.cells)
+        entry_cells = np.concatenate([
+            np.repeat(cell_ids[:n_self], np.diff(self.cell_offsets)),
+            np.repeat(cell_ids[n_self:], np.diff(other.cell_offsets)),
+        ])
+        entry_tokens = np.concatenate([self.entry_tokens, remap[other.entry_tokens]])
+        entry_counts = np.concatenate([self.entry_counts, other.entry_counts])
+        entry_first = np.concatenate([self.entry_first, other.entry_first + self.n_tokens])
+
+        n_vocab = max(len(vocab), 1)
+        unique_pairs, inverse = np.unique(entry_cells * n_vocab + entry_tokens, return_inverse=True)
+        inverse = inverse.ravel()
+        pair_counts = np.bincount(inverse, weights=entry_counts, minlength=len(unique_pairs))
+        pair_first = np.full(len(unique_pairs), self.n_tokens + other.n_tokens, dtype=np.int64)
+        np.minimum.at(pair_first, inverse, entry_first)
+
+        cell_offsets = np.zeros(len(merged_cells) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(unique_pairs // n_vocab, minlength=len(merged_cells)), out=cell_offsets[1:])
+        return KeywordIndex(vocab, merged_cells, cell_offsets, (unique_pairs % n_vocab).astype(np.int32),
+                            pair_counts.astype(np.int64), pair_first, self.n_tokens + other.n_tokens)
+
+
+@timed("build_keyword_index")
+def build_keyword_index(df, noun_tokens):
+    keys = pd.DataFrame({dim: df[dim] for dim in CUBE_DIMENSIONS if dim in df.columns}, index=df.index)
+    if 'ClusterID' not in keys.columns:
+        keys['ClusterID'] = NO_CLUSTER
+
+    # 행마다 셀 번호를 붙이고, 토큰 단위로 펼쳐 (셀, 토큰) 쌍의 빈도와 첫 등장 위치를 한 번에 계산
+    grouped = keys.groupby(CUBE_DIMENSIONS, sort=True, dropna=False, observed=True)
+    row_cells = grouped.ngroup().to_numpy(dtype=np.int64)
+    cells = grouped.size().index.to_frame(index=False)
+
+    n_vocab = max(len(noun_tokens.vocab), 1)
+    token_cells = np.repeat(row_cells, noun_tokens.row_lengths)
+    pair_codes = token_cells * n_vocab + noun_tokens.token_ids
+    unique_pairs, pair_first, pair_counts = np.unique(pair_codes, return_index=True, return_counts=True)
+
+    entry_cells = unique_pairs // n_vocab
+    entry_tokens = (unique_pairs % n_vocab).astype(np.int32)
+    cell_offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(entry_cells, minlength=len(cells)), out=cell_offsets[1:])
+
+    return KeywordIndex(noun_tokens.vocab, cells, cell_offsets, entry_tokens, pair_counts.astype(np.int64),
+                        pair_first.astype(np.int64), len(noun_tokens.token_ids))
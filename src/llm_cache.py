@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.cache import CACHE_DIR
+
+LLM_CACHE_PATH = os.getenv("REVIEWDOCTOR_LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("REVIEWDOCTOR_LLM_CACHE_TTL_HOURS", "168")) * 3600
+LLM_CACHE_MAX_BYTES = int(os.getenv("REVIEWDOCTOR_LLM_CACHE_MB", "256")) * 1024 * 1024
+# "1"이면 캐시를 읽지도 쓰지도 않음 (항상 새로 생성)
+LLM_CACHE_BYPASS = os.getenv("REVIEWDOCTOR_LLM_CACHE_BYPASS", "0") == "1"
+
+
+def request_key(deployment: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    payload = json.dumps(
+        {"deployment": deployment, "prompt": prompt, "temperature": temperature, "max_tokens": max_tokens},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """GPT 응답 캐시 (SQLite). 만료(TTL)와 전체 크기 제한을 적용하고 적중/실패 횟수를 집계합니다."""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        # 캐시 디렉터리를 만들 수 없으면(읽기 전용 등) OSError → 호출부에서 캐시 없이 진행
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str):
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    row = None
+                if row is not None:
+                    conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            row = None
+
+        self._count(row is not None)
+        return row[0] if row is not None else None
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, created_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, response, size, now, now),
+                )
+                self._evict(conn, now)
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            # 캐시 저장 실패는 리포트 생성에 영향을 주지 않음
+            pass
+
+    def _evict(self, conn, now: float):
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 가장 오래 사용되지 않은 응답부터 삭제
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self) -> dict:
+        try:
+            conn = self._connect()
+            try:
+                entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            entries, total = 0, 0
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total}
+
+    def clear(self):
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+
+
+llm_cache = LLMCache()
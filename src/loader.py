@@ -0,0 +1,74 @@
+import io
+
+import pandas as pd
+
+from src.analysis import RATING_COLUMNS, build_cube, preprocess_data
+from src.profiling import timed
+
+# 리뷰 CSV 컬럼 스키마 (파일에 없는 컬럼은 무시)
+REVIEW_SCHEMA = {
+    'SeatType': 'category',
+    'Recommended': 'category',
+    'TypeOfTraveller': 'category',
+    'TargetFeature': 'category',
+    'Nouns': 'object',
+    'Adjectives/Adverbs': 'object',
+    **{col: 'float32' for col in RATING_COLUMNS},
+}
+
+# 대시보드 분석에 필요한 컬럼
+ANALYSIS_COLUMNS = ['SeatType', 'Recommended', 'TypeOfTraveller', 'Nouns', 'ClusterID'] + RATING_COLUMNS
+# GPT 리포트 생성에 필요한 컬럼
+REPORT_COLUMNS = ['Recommended', 'Adjectives/Adverbs']
+# 세그먼트(좌석 × 추천여부 × 클러스터)별 리포트 생성에 필요한 컬럼
+SEGMENT_COLUMNS = REPORT_COLUMNS + ['SeatType', 'ClusterID']
+
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def _as_buffer(source):
+    # 경로는 그대로, bytes는 매번 새 버퍼로 감싸서 여러 번 읽을 수 있게 함
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _read_options(source, columns):
+    # 헤더만 먼저 읽어서 (앞뒤 공백이 있는 컬럼명 포함) 실제 컬럼명과 스키마를 맞춤
+    header = pd.read_csv(_as_buffer(source), nrows=0).columns
+    wanted = set(columns) if columns is not None else None
+    usecols = [raw for raw in header if wanted is None or raw.strip() in wanted]
+    dtype = {raw: REVIEW_SCHEMA[raw.strip()] for raw in usecols if raw.strip() in REVIEW_SCHEMA}
+    return {"usecols": usecols, "dtype": dtype}
+
+
+@timed("read_reviews")
+def read_reviews(source, columns=ANALYSIS_COLUMNS):
+    """스키마에 맞춰 필요한 컬럼만 읽습니다. source는 경로, 파일 객체, bytes 모두 가능."""
+    options = _read_options(source, columns)
+    df = pd.read_csv(_as_buffer(source), **options)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def iter_review_chunks(source, columns=ANALYSIS_COLUMNS, chunksize=DEFAULT_CHUNKSIZE):
+    """대용량 파일용 스트리밍 모드: chunksize 행씩 타입이 지정된 DataFrame을 순서대로 반환합니다.
+
+    청크의 인덱스는 파일 전체 기준 행 번호를 유지합니다.
+    """
+    options = _read_options(source, columns)
+    with pd.read_csv(_as_buffer(source), chunksize=chunksize, **options) as reader:
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.strip()
+            yield chunk
+
+
+def build_cube_streaming(source, chunksize=DEFAULT_CHUNKSIZE):
+    """파일을 청크 단위로 읽어 집계 큐브를 누적합니다. 최대 메모리는 청크 크기에만 비례합니다."""
+    cube = None
+    for chunk in iter_review_chunks(source, chunksize=chunksize):
+        chunk_cube = build_cube(preprocess_data(chunk))
+        cube = chunk_cube if cube is None else cube.merge(chunk_cube)
+    return cube
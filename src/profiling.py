@@ -0,0 +1,244 @@
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 스팬을 JSON lines로 계속 남길 파일 (비어 있으면 메모리에만 보관)
+PROFILE_LOG_PATH = os.getenv("REVIEWDOCTOR_PROFILE_LOG", "")
+# "1"이면 tracemalloc으로 파이썬 메모리 할당량도 측정 (실행이 느려지므로 기본은 끔)
+PROFILE_TRACEMALLOC = os.getenv("REVIEWDOCTOR_PROFILE_TRACEMALLOC", "0") == "1"
+MAX_SPANS = 5000
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class Span:
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    # 구간 동안 늘어난 프로세스 최대 RSS (이전 최대치를 넘은 만큼만 잡힘)
+    peak_rss_delta_bytes: int = None
+    # tracemalloc 사용 시 구간 시작 대비 최대 할당량
+    tracemalloc_peak_bytes: int = None
+    started_at: float = 0.0
+    depth: int = 0  # 0이면 최상위 단계, 다른 스팬 안에서 기록되면 1 이상
+    labels: dict = field(default_factory=dict)
+
+
+_current_run = contextvars.ContextVar("profiling_run", default=None)
+_depth = contextvars.ContextVar("profiling_depth", default=0)
+# tracemalloc 최대치를 초기화하기 전까지 현재 스팬에서 관측된 최대치 (중첩 스팬이 초기화해도 잃지 않도록)
+_peak_floor = contextvars.ContextVar("profiling_peak_floor", default=0)
+
+
+class Profiler:
+    """대시보드 단계별 스팬(실행 시간, CPU 시간, 메모리) 기록기.
+
+    최근 스팬은 메모리(deque)에, 설정 시 JSON lines 파일에도 남깁니다.
+    start_run()으로 시작한 실행(Streamlit 스크립트 한 번 실행)의 스팬은 따로 모아 사이드바에 표시합니다.
+    """
+
+    def __init__(self, log_path: str = PROFILE_LOG_PATH, max_spans: int = MAX_SPANS,
+                 trace_memory: bool = PROFILE_TRACEMALLOC):
+        self.log_path = log_path
+        self.spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def start_run(self) -> list:
+        """현재 실행(스레드/컨텍스트)에서 기록되는 스팬을 모을 리스트를 반환합니다."""
+        run = []
+        _current_run.set(run)
+        return run
+
+    @contextmanager
+    def section(self):
+        """구간(예: st.fragment) 단위로 스팬을 따로 모읍니다. 바깥 실행이 있으면 끝날 때 그 실행에도 합칩니다."""
+        parent = _current_run.get()
+        run = []
+        token = _current_run.set(run)
+        try:
+            yield run
+        finally:
+            _current_run.reset(token)
+            if parent is not None:
+                parent.extend(run)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        depth = _depth.get()
+        token = _depth.set(depth + 1)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            # 스팬마다 최대치를 초기화하고, 초기화 전까지의 바깥 스팬 최대치는 따로 보관했다가 끝날 때 합침
+            start_traced, outer_peak = tracemalloc.get_traced_memory()
+            saved_peak = max(_peak_floor.get(), outer_peak)
+            tracemalloc.reset_peak()
+            floor_token = _peak_floor.set(0)
+        start_rss = _peak_rss_bytes()
+        started_at = time.time()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start_wall
+            cpu = time.process_time() - start_cpu
+            end_rss = _peak_rss_bytes()
+            traced = None
+            if tracing:
+                # 안쪽 스팬이 초기화하기 전의 최대치(_peak_floor)까지 포함한 이 스팬의 최대치
+                own_peak = max(tracemalloc.get_traced_memory()[1], _peak_floor.get())
+                traced = own_peak - start_traced
+                _peak_floor.reset(floor_token)
+                _peak_floor.set(max(saved_peak, own_peak))
+            _depth.reset(token)
+            self.record(Span(
+                name=name,
+                wall_seconds=wall,
+                cpu_seconds=cpu,
+                peak_rss_delta_bytes=end_rss - start_rss if start_rss is not None else None,
+                tracemalloc_peak_bytes=max(traced, 0) if traced is not None else None,
+                started_at=started_at,
+                depth=depth,
+                labels={key: str(value) for key, value in labels.items()},
+            ))
+
+    def timed(self, name: str = None):
+        """함수 전체를 스팬으로 감싸는 데코레이터"""
+        def decorator(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+        run = _current_run.get()
+        if run is not None:
+            run.append(span)
+        if self.log_path:
+            try:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                with self._lock, open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(to_jsonl([span]))
+            except OSError:
+                pass  # 기록 실패가 화면 동작에 영향을 주지 않음
+
+    def recent(self) -> list:
+        with self._lock:
+            return list(self.spans)
+
+
+def to_jsonl(spans) -> str:
+    return "".join(json.dumps(asdict(span), ensure_ascii=False) + "\n" for span in spans)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def to_prometheus(spans, prefix: str = "reviewdoctor_stage") -> str:
+    """단계 이름별 합계/횟수/최대 메모리를 Prometheus 텍스트 형식으로 변환합니다."""
+    stats = {}
+    for span in spans:
+        entry = stats.setdefault(span.name, {"count": 0, "wall": 0.0, "cpu": 0.0, "rss": None, "traced": None})
+        entry["count"] += 1
+        entry["wall"] += span.wall_seconds
+        entry["cpu"] += span.cpu_seconds
+        for key, value in (("rss", span.peak_rss_delta_bytes), ("traced", span.tracemalloc_peak_bytes)):
+            if value is not None:
+                entry[key] = max(entry[key] or 0, value)
+
+    metrics = [
+        ("seconds", "summary", "단계 실행 시간(초)", lambda e: [("_sum", e["wall"]), ("_count", e["count"])]),
+        ("cpu_seconds", "summary", "단계 CPU 시간(초)", lambda e: [("_sum", e["cpu"]), ("_count", e["count"])]),
+        ("peak_rss_delta_bytes", "gauge", "단계 중 늘어난 최대 RSS(바이트)",
+         lambda e: [("", e["rss"])] if e["rss"] is not None else []),
+        ("tracemalloc_peak_bytes", "gauge", "단계 중 최대 파이썬 할당량(바이트)",
+         lambda e: [("", e["traced"])] if e["traced"] is not None else []),
+    ]
+    lines = []
+    for metric, kind, help_text, values in metrics:
+        samples = [
+            f'{prefix}_{metric}{suffix}{{stage="{_escape_label(name)}"}} {value:.12g}'
+            for name, entry in stats.items() for suffix, value in values(entry)
+        ]
+        if samples:
+            lines += [f"# HELP {prefix}_{metric} {help_text}", f"# TYPE {prefix}_{metric} {kind}", *samples]
+    return "\n".join(lines) + "\n"
+
+
+def _render_spans(spans, key: str):
+    import streamlit as st
+
+    if not spans:
+        st.caption("기록된 단계가 없습니다.")
+        return
+    rows = [{
+        "단계": "  " * span.depth + span.name,
+        "시간(ms)": round(span.wall_seconds * 1000, 1),
+        "CPU(ms)": round(span.cpu_seconds * 1000, 1),
+        "RSS 증가(MB)": round(span.peak_rss_delta_bytes / 2**20, 1) if span.peak_rss_delta_bytes is not None else None,
+        "할당(MB)": round(span.tracemalloc_peak_bytes / 2**20, 1) if span.tracemalloc_peak_bytes is not None else None,
+    } for span in spans]
+    st.dataframe(rows, hide_index=True, width="stretch")
+    st.caption(f"총 {sum(span.wall_seconds for span in spans if span.depth == 0) * 1000:.0f}ms")
+    st.download_button("JSON lines", to_jsonl(spans), file_name="spans.jsonl", key=f"{key}_jsonl")
+    st.download_button("Prometheus", to_prometheus(spans), file_name="spans.prom", key=f"{key}_prom")
+
+
+def render_sidebar_panel(spans, key: str = "perf"):
+    """사이드바 "성능" 패널: 이번 실행의 단계별 시간/메모리 표와 내보내기 버튼"""
+    import streamlit as st
+
+    if not st.sidebar.checkbox("성능", value=False, key=f"{key}_toggle"):
+        return
+    with st.sidebar:
+        st.markdown("#### 성능")
+        _render_spans(spans, key)
+
+
+def render_section_panel(spans, title: str, key: str, toggle_key: str = "perf_toggle"):
+    """st.fragment 안에서 그리는 섹션 성능 패널 (사이드바 "성능"이 켜져 있을 때만).
+
+    fragment만 다시 실행되면 사이드바 패널은 갱신되지 않으므로 섹션 안에 그 실행의 스팬을 따로 표시합니다.
+    """
+    import streamlit as st
+
+    if not st.session_state.get(toggle_key):
+        return
+    with st.expander(f"성능: {title}"):
+        _render_spans(spans, key)
+
+
+profiler = Profiler()
+span = profiler.span
+timed = profiler.timed
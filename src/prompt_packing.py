@@ -0,0 +1,122 @@
+import os
+import re
+from functools import cache
+
+import pandas as pd
+
+# 프롬프트 입력(리뷰 목록 + 안내문) 토큰 예산
+PROMPT_TOKEN_BUDGET = int(os.getenv("REVIEWDOCTOR_PROMPT_TOKENS", "3000"))
+# 세그먼트별로 빈도 상위 몇 개까지만 후보로 볼지 (대용량 입력에서 탐색 시간 제한)
+MAX_CANDIDATES_PER_SEGMENT = 5000
+
+_ASCII_WORD = re.compile(r"[A-Za-z0-9]+")
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+@cache
+def _get_encoding():
+    # tiktoken은 선택 의존성이며, 처음 토큰 수를 셀 때 불러옴
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")  # gpt-4o 계열 토크나이저
+    except Exception:  # tiktoken 미설치 또는 인코딩 파일을 받을 수 없는 환경
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # 근사치: 영문/숫자 단어는 4자당 1토큰, 그 외(한글, 기호)는 글자당 1토큰
+    ascii_chars = sum(len(word) for word in _ASCII_WORD.findall(text))
+    other_chars = sum(1 for ch in text if not ch.isspace()) - ascii_chars
+    return -(-ascii_chars // 4) + other_chars
+
+
+class PackedPrompt(str):
+    """프롬프트 문자열 + 사용한 토큰 수, 포함한 리뷰 수 정보 (일반 str처럼 그대로 사용 가능)"""
+
+    def __new__(cls, text: str, token_count: int, review_count: int, total_reviews: int):
+        prompt = super().__new__(cls, text)
+        prompt.token_count = token_count
+        prompt.review_count = review_count
+        prompt.total_reviews = total_reviews
+        return prompt
+
+    def __getnewargs__(self):
+        return str(self), self.token_count, self.review_count, self.total_reviews
+
+
+def _normalize(reviews: pd.Series) -> pd.Series:
+    # 대소문자/문장부호/공백/단어 순서/반복 차이만 있는 리뷰는 같은 리뷰(유사 중복)로 취급
+    return (reviews.str.lower()
+            .str.replace(_NON_WORD, " ", regex=True)
+            .str.split()
+            .map(lambda words: " ".join(sorted(set(words)))))
+
+
+def format_review(review: str, count: int) -> str:
+    return f"- {review} (x{count})" if count > 1 else f"- {review}"
+
+
+@cache
+def _min_line_tokens() -> int:
+    # 가장 짧은 리뷰 줄("- x" + 줄바꿈)의 토큰 수: 남은 예산이 이보다 작으면 더 담을 수 있는 리뷰가 없음
+    return count_tokens(format_review("x", 1)) + 1
+
+
+def pack_reviews(reviews, token_budget: int, segments=None):
+    """토큰 예산 안에서 가장 많은 정보를 담도록 리뷰를 고릅니다.
+
+    정확/유사 중복(정규화한 단어 집합이 같은 리뷰)을 합치고(합친 개수는 빈도로 표시),
+    세그먼트를 번갈아 가며 빈도순으로 채웁니다.
+    반환값: ([(리뷰, 빈도)], 사용한 토큰 수)
+    """
+    frame = pd.DataFrame({
+        "review": pd.Series(list(reviews), dtype=object),
+        "segment": pd.Series(list(segments) if segments is not None else [""] * len(reviews), dtype=object),
+    })
+    frame = frame.dropna(subset=["review"])
+    # 같은 문자열은 먼저 합쳐서 정규화 대상을 줄임
+    frame = frame.groupby(["review", "segment"], sort=False, dropna=False).size().rename("count").reset_index()
+    frame["review"] = frame["review"].astype(str).str.strip()
+    frame["key"] = _normalize(frame["review"])
+    frame = frame[frame["key"] != ""]
+    if frame.empty:
+        return [], 0
+
+    # 중복 제거: 정규화 키별 빈도 (대표 문장/세그먼트는 첫 등장 기준)
+    candidates = frame.groupby("key", sort=False).agg(
+        review=("review", "first"), segment=("segment", "first"), count=("count", "sum")
+    )
+    candidates = candidates.sort_values("count", ascending=False, kind="stable")
+    candidates["rank"] = candidates.groupby("segment", sort=False).cumcount()
+    candidates = candidates[candidates["rank"] < MAX_CANDIDATES_PER_SEGMENT]
+    # 세그먼트 커버리지: 각 세그먼트의 1위 → 각 세그먼트의 2위 → ... 순서 (같은 순위는 큰 세그먼트 먼저)
+    candidates["segment_total"] = candidates.groupby("segment", sort=False)["count"].transform("sum")
+    candidates = candidates.sort_values(
+        ["rank", "segment_total", "count"], ascending=[True, False, False], kind="stable"
+    )
+
+    selected, used = [], 0
+    min_cost = _min_line_tokens()
+    for review, count in zip(candidates["review"], candidates["count"]):
+        if token_budget - used < min_cost:
+            break
+        line = format_review(review, count)
+        cost = count_tokens(line) + 1  # 줄바꿈
+        if used + cost > token_budget:
+            continue
+        selected.append((review, count))
+        used += cost
+    return selected, used
+
+
+def pack_prompt(header: str, reviews, token_budget: int = PROMPT_TOKEN_BUDGET, segments=None) -> PackedPrompt:
+    """안내문(header) + 예산에 맞춰 고른 리뷰 목록으로 프롬프트를 만듭니다."""
+    header_tokens = count_tokens(header)
+    selected, _ = pack_reviews(reviews, max(token_budget - header_tokens, 0), segments=segments)
+    sample = "\n".join(format_review(review, count) for review, count in selected)
+    text = f"{header}\n\n{sample}"
+    return PackedPrompt(text, count_tokens(text), len(selected), len(reviews))
@@ -1,25 +1,146 @@
-import pandas as pd
-from src.gpt_client import get_report_from_gpt
+import asyncio
+import queue
+import threading
+from src.gpt_client import get_report_from_gpt_async, stream_report_from_gpt_async, run_sync
+from src.analysis import SEAT_TYPE_MAPPING, SENTIMENT_MAPPING
+from src.dataset import ReviewDataset
+from src.loader import read_reviews, REPORT_COLUMNS, SEGMENT_COLUMNS
+from src.prompt_packing import PROMPT_TOKEN_BUDGET, pack_prompt
+from src.scheduler import ReportScheduler
+from src.summarize import summarize_reviews_async
 
-def load_reviews(file_path: str):
-    df = pd.read_csv(file_path)
+def _load_frame(source, columns):
+    # 이미 파싱된 ReviewDataset이면 그대로 사용하고, 경로면 필요한 컬럼만 읽음
+    if isinstance(source, ReviewDataset):
+        return source.frame
+    return read_reviews(source, columns=columns)
+
+def load_reviews(source):
+    df = _load_frame(source, REPORT_COLUMNS)
     pos_reviews = df[df["Recommended"] == "yes"]["Adjectives/Adverbs"].dropna().tolist()
     neg_reviews = df[df["Recommended"] == "no"]["Adjectives/Adverbs"].dropna().tolist()
     return pos_reviews, neg_reviews
 
-def build_prompt(reviews: list[str], report_type: str):
-    sample = "\n".join(f"- {r}" for r in reviews[:20])  # 상위 20개만 사용
+def build_prompt(reviews: list[str], report_type: str, segment: str = None, segments=None,
+                 token_budget: int = PROMPT_TOKEN_BUDGET):
+    """리뷰를 중복 제거/빈도순으로 토큰 예산만큼 담은 프롬프트. 반환값은 token_count 등을 가진 str(PackedPrompt)"""
+    audience = f"{segment} 고객" if segment else "고객"
     if report_type == "marketing":
-        return f"""다음은 고객의 긍정 리뷰입니다. 아래 내용을 기반으로 마케팅 전략 리포트를 작성해주세요:\n\n{sample}"""
+        header = f"다음은 {audience}의 긍정 리뷰입니다. 아래 내용을 기반으로 마케팅 전략 리포트를 작성해주세요:"
     else:
-        return f"""다음은 고객의 부정 리뷰입니다. 아래 내용을 기반으로 서비스 개선 전략 리포트를 작성해주세요:\n\n{sample}"""
+        header = f"다음은 {audience}의 부정 리뷰입니다. 아래 내용을 기반으로 서비스 개선 전략 리포트를 작성해주세요:"
+    # 괄호 안 숫자는 같은(또는 거의 같은) 리뷰가 몇 번 나왔는지를 의미
+    return pack_prompt(header, reviews, token_budget=token_budget, segments=segments)
+
+def _segment_labels(df):
+    # 여러 좌석/클러스터의 리뷰가 골고루 들어가도록 리뷰마다 세그먼트 라벨을 붙임
+    columns = [col for col in ("SeatType", "ClusterID") if col in df.columns]
+    if not columns:
+        return None
+    labels = df[columns[0]].astype(str)
+    for col in columns[1:]:
+        labels = labels + "_" + df[col].astype(str)
+    return labels.tolist()
+
+def build_report_prompts(source):
+    df = _load_frame(source, SEGMENT_COLUMNS)
+    prompts = {}
+    for report_type, recommended in (("marketing", "yes"), ("service", "no")):
+        subset = df[df["Recommended"] == recommended].dropna(subset=["Adjectives/Adverbs"])
+        prompts[report_type] = build_prompt(
+            subset["Adjectives/Adverbs"].tolist(), report_type, segments=_segment_labels(subset)
+        )
+    return prompts
+
+def build_summary_prompts(source, use_cache: bool = True, scheduler: ReportScheduler = None):
+    """전체 리뷰를 map-reduce로 요약한 뒤 만든 최종 리포트 프롬프트. 대용량 데이터에서 build_report_prompts 대신 사용"""
+    pos_reviews, neg_reviews = load_reviews(source)
+    scheduler = scheduler or ReportScheduler()
+
+    async def summarize_all():
+        # 같은 속도 제한을 나눠 쓰지 않도록 긍정 → 부정 순서로 실행 (각 단계 안에서는 청크를 동시에 요청)
+        return {
+            "marketing": await summarize_reviews_async(pos_reviews, "marketing", use_cache=use_cache, scheduler=scheduler),
+            "service": await summarize_reviews_async(neg_reviews, "service", use_cache=use_cache, scheduler=scheduler),
+        }
+
+    return run_sync(summarize_all())
+
+async def generate_reports_async(source, use_cache: bool = True):
+    prompts = build_report_prompts(source)
+
+    # 두 리포트를 동시에 요청하고 둘 다 끝나면 반환
+    marketing_report, service_report = await asyncio.gather(
+        get_report_from_gpt_async(prompts["marketing"], use_cache=use_cache),
+        get_report_from_gpt_async(prompts["service"], use_cache=use_cache),
+    )
+
+    return marketing_report, service_report
+
+def generate_reports(source, use_cache: bool = True):
+    return run_sync(generate_reports_async(source, use_cache=use_cache))
+
+def stream_reports(source, use_cache: bool = True):
+    """두 리포트를 동시에 스트리밍하면서 (report_type, 토큰)을 도착 순서대로 반환합니다.
+
+    report_type은 "marketing" 또는 "service" 입니다.
+    """
+    return stream_prompts(build_report_prompts(source), use_cache=use_cache)
+
+def stream_prompts(prompts: dict, use_cache: bool = True):
+    """{report_type: prompt} 를 동시에 스트리밍합니다. (프롬프트를 미리 만들어 토큰 수를 보여줄 때 사용)"""
+    events = queue.Queue()
+    done = object()
+
+    async def pump(report_type, prompt):
+        async for token in stream_report_from_gpt_async(prompt, use_cache=use_cache):
+            events.put((report_type, token))
+
+    async def pump_all():
+        await asyncio.gather(*(pump(report_type, prompt) for report_type, prompt in prompts.items()))
+
+    def worker():
+        try:
+            run_sync(pump_all())
+        except Exception as e:
+            events.put(e)
+        finally:
+            events.put(done)
+
+    # 호출한 쪽(Streamlit 스크립트/CLI)은 큐에서 토큰을 꺼내 바로 화면/파일에 반영
+    threading.Thread(target=worker, daemon=True).start()
+    while True:
+        event = events.get()
+        if event is done:
+            return
+        if isinstance(event, Exception):
+            raise event
+        yield event
 
-def generate_reports(file_path: str):
-    pos_reviews, neg_reviews = load_reviews(file_path)
-    pos_prompt = build_prompt(pos_reviews, "marketing")
-    neg_prompt = build_prompt(neg_reviews, "service")
+def build_segment_prompts(source):
+    """좌석 × 추천여부 × 클러스터 세그먼트별 프롬프트. 키는 대시보드 군집 ID와 같은 "좌석_추천여부_클러스터" 형식
 
-    marketing_report = get_report_from_gpt(pos_prompt)
-    service_report = get_report_from_gpt(neg_prompt)
+    ClusterID 컬럼이 없으면(군집화하지 않은 CSV 경로/DataFrame) 좌석 × 추천여부로만 나누고 키는 "좌석_추천여부" 입니다.
+    """
+    df = _load_frame(source, SEGMENT_COLUMNS)
+    keys = [col for col in ('SeatType', 'Recommended', 'ClusterID') if col in df.columns]
+    prompts = {}
+    for values, group in df.groupby(keys, observed=True):
+        seat, recommended, *cluster = values
+        if recommended not in SENTIMENT_MAPPING:
+            continue
+        reviews = group["Adjectives/Adverbs"].dropna().tolist()
+        if not reviews:
+            continue
+        seat_label = SEAT_TYPE_MAPPING.get(seat, seat)
+        segment_id = "_".join(str(part) for part in [seat_label, SENTIMENT_MAPPING[recommended], *cluster])
+        audience = f"{seat_label} 좌석 클러스터 {cluster[0]}" if cluster else f"{seat_label} 좌석"
+        report_type = "marketing" if recommended == "yes" else "service"
+        prompts[segment_id] = build_prompt(reviews, report_type, segment=audience)
+    return prompts
 
-    return marketing_report, service_report
\ No newline at end of file
+def generate_segment_reports(source, use_cache: bool = True, scheduler: ReportScheduler = None):
+    """세그먼트별 리포트를 동시성/속도 제한 아래에서 생성합니다. {segment_id: SegmentResult} 반환"""
+    prompts = build_segment_prompts(source)
+    scheduler = scheduler or ReportScheduler()
+    return run_sync(scheduler.run(prompts, use_cache=use_cache))
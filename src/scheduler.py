@@ -0,0 +1,170 @@
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+
+from src.gpt_client import COMPLETION_PARAMS, cached_report, get_report_from_gpt_async, load_env, store_report
+from src.prompt_packing import count_tokens
+
+MAX_CONCURRENCY = int(os.getenv("REVIEWDOCTOR_MAX_CONCURRENCY", "8"))
+
+
+def azure_limits() -> tuple:
+    """배포(deployment)의 (분당 요청 수, 분당 토큰 수) 한도. .env의 AZURE_OPENAI_RPM/TPM을 처음 사용할 때 읽음"""
+    load_env()
+    return int(os.getenv("AZURE_OPENAI_RPM", "60")), int(os.getenv("AZURE_OPENAI_TPM", "60000"))
+
+
+def retryable_errors() -> tuple:
+    # openai는 실제 요청을 보낼 때만 import (모듈 import 시간을 줄이기 위해)
+    import openai
+
+    return openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError
+
+
+class TokenBucket:
+    """분당 rate만큼 채워지는 토큰 버킷.
+
+    Azure는 분당 한도를 10초 단위로 나눠 검사하므로, 한 번에 몰아 쓸 수 있는 양(capacity)을 한도의 1/6로 둡니다.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.fill_rate = rate_per_minute / 60
+        self.capacity = max(1.0, rate_per_minute / 6)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        # 버킷보다 큰 요청은 버킷이 가득 찰 때까지만 기다리고 보냄
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.fill_rate)
+
+
+class RateLimiter:
+    """RPM/TPM 버킷 + 429 응답의 Retry-After 동안 모든 요청을 멈추는 기능"""
+
+    def __init__(self, rpm: int = None, tpm: int = None):
+        default_rpm, default_tpm = azure_limits()
+        rpm, tpm = rpm or default_rpm, tpm or default_tpm
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.resume_at = 0.0
+
+    def pause(self, seconds: float):
+        self.resume_at = max(self.resume_at, time.monotonic() + seconds)
+
+    async def acquire(self, tokens: int):
+        while (wait := self.resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(wait)
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+
+def retry_after_seconds(error: Exception):
+    """에러 응답 헤더의 retry-after-ms / retry-after 값 (초). 없으면 None"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
+
+@dataclass
+class SegmentResult:
+    segment_id: str
+    report: str = None
+    error: str = None
+    attempts: int = 0
+    cached: bool = False
+
+
+class ReportScheduler:
+    """세그먼트별 프롬프트를 동시성 제한 + 토큰 버킷 + 지수 백오프 재시도로 실행합니다."""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, rpm: int = None,
+                 tpm: int = None, max_retries: int = 6, base_delay: float = 1.0,
+                 max_delay: float = 60.0):
+        default_rpm, default_tpm = azure_limits()
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm or default_rpm
+        self.tpm = tpm or default_tpm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff_delay(self, attempt: int, error: Exception) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            # 서버가 알려준 시간만큼 기다리고, 동시에 재시도가 몰리지 않게 약간의 지터 추가
+            return retry_after + random.uniform(0, self.base_delay)
+        # full jitter 지수 백오프
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def _run_one(self, segment_id: str, prompt: str, limiter: RateLimiter,
+                       semaphore: asyncio.Semaphore, use_cache: bool) -> SegmentResult:
+        import openai
+
+        result = SegmentResult(segment_id)
+        if use_cache:
+            cached = cached_report(prompt)
+            if cached is not None:
+                result.report, result.cached = cached, True
+                return result
+
+        # TPM은 프롬프트 토큰 + 최대 생성 토큰 기준으로 차감됨
+        prompt_tokens = getattr(prompt, "token_count", None) or count_tokens(prompt)
+        request_tokens = prompt_tokens + COMPLETION_PARAMS["max_tokens"]
+        async with semaphore:
+            while True:
+                result.attempts += 1
+                await limiter.acquire(request_tokens)
+                try:
+                    result.report = await get_report_from_gpt_async(prompt, use_cache=False, max_retries=0,
+                                                                   retries=result.attempts - 1)
+                except retryable_errors() as e:
+                    if result.attempts > self.max_retries:
+                        result.error = f"{type(e).__name__}: {e}"
+                        return result
+                    delay = self.backoff_delay(result.attempts - 1, e)
+                    if isinstance(e, openai.RateLimitError):
+                        limiter.pause(delay)
+                    await asyncio.sleep(delay)
+                    continue
+                except openai.OpenAIError as e:
+                    result.error = f"{type(e).__name__}: {e}"
+                    return result
+                break
+
+        if use_cache:
+            store_report(prompt, result.report)
+        return result
+
+    async def run(self, prompts: dict, use_cache: bool = True) -> dict:
+        """{segment_id: prompt} → {segment_id: SegmentResult}. 일부 세그먼트가 실패해도 나머지는 계속 진행합니다."""
+        limiter = RateLimiter(self.rpm, self.tpm)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(
+            self._run_one(segment_id, prompt, limiter, semaphore, use_cache)
+            for segment_id, prompt in prompts.items()
+        ))
+        return {result.segment_id: result for result in results}
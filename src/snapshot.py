@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.aggregate_state import AggregateState
+from src.analysis import (CUBE_DIMENSIONS, AggregateCube, build_cluster_rows, build_cluster_stats, build_cluster_views,
+                          build_cube, build_strengths_weaknesses, preprocess_data)
+from src.cache import PIPELINE_VERSION, content_hash
+from src.clustering import CLUSTER_TEXT_COLUMNS, ReviewClusterer, assign_cluster_ids, can_cluster
+from src.keyword_index import KeywordIndex, build_keyword_index
+from src.loader import ANALYSIS_COLUMNS, read_reviews
+from src.profiling import span
+from src.tokens import tokenize_nouns
+
+# 사전 계산 스냅샷을 저장/검색하는 기본 디렉터리
+SNAPSHOT_DIR = os.getenv("REVIEWDOCTOR_SNAPSHOT_DIR", "snapshots")
+# 스냅샷 파일 구성이 바뀌면 올림 (PIPELINE_VERSION과 별개)
+SNAPSHOT_FORMAT = 4
+MANIFEST_NAME = "manifest.json"
+# ClusterID가 없는 파일을 군집화한 모델 (--append 때 이어서 학습)
+CLUSTER_MODEL_NAME = "cluster_model.npz"
+
+
+def run_analysis(frame) -> dict:
+    """리뷰 DataFrame → 대시보드가 읽는 집계 결과 (frame은 수정하지 않음)"""
+    processed_df = preprocess_data(frame.copy())
+    noun_tokens = tokenize_nouns(processed_df['Nouns'])
+    return {
+        "processed_df": processed_df,
+        "seat_classes": processed_df['SeatType'].unique().tolist(),
+        # 연도/월/좌석/감성/클러스터 집계를 한 번에 계산한 큐브 (화면은 여기서 필요한 조각만 읽음)
+        "cube": build_cube(processed_df),
+        "keyword_index": build_keyword_index(processed_df, noun_tokens),
+        "strengths_weaknesses": build_strengths_weaknesses(processed_df, noun_tokens),
+        # 군집 통계표 + 히트맵 + 서비스별 최고/최저 군집
+        **build_cluster_views(build_cluster_stats(processed_df)),
+        # 군집별 행 위치 (fragment가 다시 실행될 때마다 전체 행을 groupby하지 않도록 한 번만 계산)
+        "cluster_rows": build_cluster_rows(processed_df),
+    }
+
+
+def csv_sources(path: str) -> list:
+    """CSV 파일 하나 또는 디렉터리 안의 CSV 파일 목록 (이름순)"""
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(".csv"))
+    return [path]
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _jsonable(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+class AnalysisSnapshot:
+    """precompute로 저장한 집계 스냅샷. 페이지에서는 ReviewDataset 대신 세션에 넣어 사용합니다.
+
+    리뷰 원문은 들어 있지 않으므로 리포트 생성에는 쓸 수 없습니다.
+    state(AggregateState)는 새 배치를 추가하거나 다른 스냅샷과 합칠 때 사용합니다.
+    """
+
+    def __init__(self, path: str, manifest: dict, state: AggregateState, analysis: dict):
+        self.path = path
+        self.manifest = manifest
+        self.state = state
+        self.analysis = analysis
+
+    @property
+    def name(self):
+        return self.manifest["name"]
+
+    @property
+    def content_hash(self):
+        return self.manifest["source_hash"]
+
+    def __len__(self):
+        return self.manifest["rows"]
+
+    @property
+    def columns(self):
+        return self.manifest["columns"]
+
+    def cluster_model(self):
+        """스냅샷에 저장된 군집화 모델 (없으면 None)"""
+        file_name = self.manifest.get("cluster_model")
+        return ReviewClusterer.load(os.path.join(self.path, file_name)) if file_name else None
+
+    @classmethod
+    def open(cls, path: str):
+        with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != SNAPSHOT_FORMAT or manifest.get("pipeline_version") != PIPELINE_VERSION:
+            raise ValueError(
+                f"스냅샷 버전(format {manifest.get('format')}, pipeline {manifest.get('pipeline_version')})이 "
+                f"현재 버전(format {SNAPSHOT_FORMAT}, pipeline {PIPELINE_VERSION})과 다릅니다. precompute를 다시 실행해주세요."
+            )
+
+        def table(name):
+            return pd.read_parquet(os.path.join(path, manifest["tables"][name]["file"]))
+
+        cube_meta = manifest["cube"]
+        cube = AggregateCube(table("cube").set_index(CUBE_DIMENSIONS), cube_meta["traveller_types"],
+                             cube_meta["missing_ratings"])
+
+        cells = table("keyword_cells")
+        cell_offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum(cells.pop("entries").to_numpy(), out=cell_offsets[1:])
+        entries = table("keyword_entries")
+        keyword_index = KeywordIndex(
+            table("keyword_vocab")["word"].to_numpy(dtype=object), cells, cell_offsets,
+            entries["token"].to_numpy(dtype=np.int32), entries["count"].to_numpy(dtype=np.int64),
+            entries["first"].to_numpy(dtype=np.int64), manifest["keyword_tokens"],
+        )
+
+        state = AggregateState(cube, keyword_index, manifest["seat_classes"], manifest["rows"])
+        analysis = {
+            "seat_classes": state.seat_classes,
+            "cube": cube,
+            "keyword_index": keyword_index,
+            "strengths_weaknesses": (manifest["strengths"], manifest["weaknesses"]),
+            # 히트맵/서비스별 순위는 군집 통계표에서 바로 계산 (군집 수에 비례하는 작은 연산)
+            **build_cluster_views(table("cluster_stats")),
+        }
+        return cls(path, manifest, state, analysis)
+
+
+def write_snapshot(state: AggregateState, out_dir: str, manifest: dict, clusterer: ReviewClusterer = None) -> str:
+    """집계 상태를 parquet 테이블 + manifest.json으로 저장. 임시 디렉터리에 쓴 뒤 교체하므로 중간 상태가 남지 않습니다."""
+    root = os.path.dirname(out_dir) or "."
+    os.makedirs(root, exist_ok=True)
+    # 같은 스냅샷을 동시에 만드는 프로세스끼리 서로의 임시 디렉터리를 지우지 않도록 고유한 이름 사용
+    tmp_dir = tempfile.mkdtemp(prefix=os.path.basename(out_dir) + ".", suffix=".tmp", dir=root)
+    try:
+        _write_snapshot_files(state, tmp_dir, manifest, clusterer)
+        try:
+            os.replace(tmp_dir, out_dir)
+        except OSError:
+            # 디렉터리 이름에 원본 해시 + 파이프라인 버전이 들어 있으므로, 완성된 스냅샷이 이미 있으면 그것을 사용
+            if not os.path.exists(os.path.join(out_dir, MANIFEST_NAME)):
+                shutil.rmtree(out_dir, ignore_errors=True)
+                os.replace(tmp_dir, out_dir)
+            else:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return out_dir
+
+
+def _write_snapshot_files(state: AggregateState, tmp_dir: str, manifest: dict, clusterer: ReviewClusterer = None):
+    if clusterer is not None:
+        clusterer.save(os.path.join(tmp_dir, CLUSTER_MODEL_NAME))
+        manifest = dict(manifest, cluster_model=CLUSTER_MODEL_NAME)
+
+    analysis = state.analysis()
+
+    keyword_index = analysis["keyword_index"]
+    tables = {
+        "cube": analysis["cube"].table.reset_index(),
+        "keyword_vocab": pd.DataFrame({"word": keyword_index.vocab}),
+        # 셀마다 (토큰, 빈도) 항목 수를 함께 저장해 CSR 오프셋을 복원
+        "keyword_cells": keyword_index.cells.assign(entries=np.diff(keyword_index.cell_offsets)),
+        "keyword_entries": pd.DataFrame({"token": keyword_index.entry_tokens, "count": keyword_index.entry_counts,
+                                         "first": keyword_index.entry_first}),
+        "cluster_stats": analysis["cluster_stats"],
+    }
+    manifest = dict(manifest, rows=state.rows, tables={})
+    for name, frame in tables.items():
+        file_name = f"{name}.parquet"
+        frame.to_parquet(os.path.join(tmp_dir, file_name), index=False)
+        manifest["tables"][name] = {"file": file_name, "rows": len(frame)}
+
+    strengths, weaknesses = analysis["strengths_weaknesses"]
+    cube = analysis["cube"]
+    manifest.update(
+        seat_classes=[_jsonable(s) for s in analysis["seat_classes"]],
+        strengths=strengths,
+        weaknesses=weaknesses,
+        cube={"traveller_types": cube.traveller_types, "missing_ratings": cube.missing_ratings},
+        keyword_tokens=int(keyword_index.n_tokens),
+    )
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def _snapshot_manifest(name: str, sources: list, columns: list) -> dict:
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "pipeline_version": PIPELINE_VERSION,
+        "name": name,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        # 원본 파일 해시를 추가된 순서대로 이어 붙인 해시 (같은 파일을 같은 순서로 넣으면 같은 값)
+        "source_hash": content_hash("".join(f["sha256"] for f in sources).encode()),
+        "sources": sources,
+        "columns": columns,
+    }
+
+
+def _snapshot_dir(out_root: str, manifest: dict) -> str:
+    return os.path.join(out_root or SNAPSHOT_DIR,
+                        f"{manifest['name']}-{manifest['source_hash'][:12]}-v{PIPELINE_VERSION}")
+
+
+def _read_batch(path: str, clusterer: ReviewClusterer = None):
+    """파일 하나를 읽고, ClusterID 컬럼이 없으면 clusterer를 이어서 학습해 군집 번호를 채움. (frame, clusterer) 반환"""
+    frame = read_reviews(path, columns=ANALYSIS_COLUMNS + CLUSTER_TEXT_COLUMNS)
+    if 'ClusterID' not in frame.columns and can_cluster(frame.columns):
+        frame['ClusterID'], clusterer = assign_cluster_ids(frame, clusterer)
+    return frame.drop(columns=[col for col in CLUSTER_TEXT_COLUMNS if col not in ANALYSIS_COLUMNS],
+                      errors='ignore'), clusterer
+
+
+def precompute(source: str, out_root: str = None, name: str = None, base: str = None) -> str:
+    """CSV 파일/디렉터리를 분석해 <out_root>/<이름>-<내용 해시>-v<파이프라인 버전>/ 스냅샷으로 저장하고 경로를 반환합니다.
+
+    파일마다 집계 상태를 만들어 합치므로 전체 행을 한 번에 메모리에 올리지 않습니다.
+    base(기존 스냅샷 경로)를 주면 그 상태에 새 파일만 더한 새 스냅샷을 만듭니다. (이미 들어 있는 파일은 건너뜀)
+    ClusterID가 없는 파일은 내장 군집화로 채우고, 모델을 스냅샷에 저장해 다음 추가 때 이어서 학습합니다.
+    """
+    paths = csv_sources(source)
+    if not paths:
+        raise FileNotFoundError(f"CSV 파일이 없습니다: {source}")
+
+    snapshot = AnalysisSnapshot.open(base) if base else None
+    state = snapshot.state if snapshot else None
+    clusterer = snapshot.cluster_model() if snapshot else None
+    sources = list(snapshot.manifest["sources"]) if snapshot else []
+    columns = list(snapshot.columns) if snapshot else []
+    known = {f["sha256"] for f in sources}
+    for path in paths:
+        sha256 = _file_hash(path)
+        if sha256 in known:
+            continue
+        with span("precompute.batch", file=os.path.basename(path)):
+            frame, clusterer = _read_batch(path, clusterer)
+            batch = AggregateState.from_frame(frame)
+        state = batch if state is None else state.merge(batch)
+        sources.append({"path": path, "sha256": sha256, "rows": batch.rows})
+        known.add(sha256)
+        columns += [col for col in frame.columns if col not in columns]
+    if snapshot and len(sources) == len(snapshot.manifest["sources"]):
+        return snapshot.path  # 새로 추가된 파일 없음
+
+    name = name or (snapshot.name if snapshot else os.path.splitext(os.path.basename(os.path.normpath(source)))[0])
+    manifest = _snapshot_manifest(name, sources, columns)
+    with span("precompute.write"):
+        return write_snapshot(state, _snapshot_dir(out_root, manifest), manifest, clusterer)
+
+
+def merge_snapshots(paths: list, name: str, out_root: str = None) -> str:
+    """여러 스냅샷(예: 일별)의 집계 상태를 원본 행 없이 합쳐 새 스냅샷(예: 월별)으로 저장합니다.
+
+    군집화 모델은 스냅샷마다 따로 학습된 것이라 합치지 않습니다. (합친 스냅샷에는 모델이 없음)
+    """
+    snapshots = [AnalysisSnapshot.open(path) for path in paths]
+    state = snapshots[0].state
+    sources = list(snapshots[0].manifest["sources"])
+    columns = list(snapshots[0].columns)
+    for snapshot in snapshots[1:]:
+        known = {f["sha256"] for f in sources}
+        overlap = [f["path"] for f in snapshot.manifest["sources"] if f["sha256"] in known]
+        if overlap:
+            # 같은 파일이 두 번 합산되는 것을 막음
+            raise ValueError(f"{snapshot.path}에 이미 포함된 파일이 있습니다: {', '.join(overlap)}")
+        state = state.merge(snapshot.state)
+        sources += snapshot.manifest["sources"]
+        columns += [col for col in snapshot.columns if col not in columns]
+    manifest = _snapshot_manifest(name, sources, columns)
+    return write_snapshot(state, _snapshot_dir(out_root, manifest), manifest)
+
+
+def list_snapshots(root: str = SNAPSHOT_DIR) -> list:
+    """root 아래 스냅샷 (경로, manifest) 목록, 최근 생성 순"""
+    snapshots = []
+    if not os.path.isdir(root):
+        return snapshots
+    for name in os.listdir(root):
+        manifest_path = os.path.join(root, name, MANIFEST_NAME)
+        if name.endswith(".tmp") or not os.path.exists(manifest_path):
+            continue
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                snapshots.append((os.path.join(root, name), json.load(f)))
+        except (OSError, json.JSONDecodeError):
+            continue
+    return sorted(snapshots, key=lambda item: item[1].get("created_at", ""), reverse=True)
@@ -0,0 +1,115 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from src.prompt_packing import PROMPT_TOKEN_BUDGET, PackedPrompt, count_tokens, format_review
+from src.scheduler import ReportScheduler
+
+# map 단계에서 한 번에 요약할 리뷰 묶음(청크)의 토큰 수
+CHUNK_TOKEN_BUDGET = int(os.getenv("REVIEWDOCTOR_CHUNK_TOKENS", "2000"))
+# reduce 단계에서 한 번에 합칠 최대 요약 수
+REDUCE_FAN_IN = 8
+
+SENTIMENT_LABELS = {"marketing": "긍정", "service": "부정"}
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_reviews(reviews, chunk_tokens: int = CHUNK_TOKEN_BUDGET) -> list:
+    """리뷰를 원래 순서대로 토큰 수 제한에 맞춰 청크(텍스트)로 나눕니다.
+
+    순서를 유지하므로 리뷰가 뒤에 추가되어도 앞쪽 청크는 내용(해시)이 그대로여서 요약 캐시를 재사용합니다.
+    청크 안의 같은 리뷰는 하나로 합치고 빈도를 표시합니다.
+    """
+    reviews = pd.Series(list(reviews), dtype=object).dropna().astype(str).str.strip()
+    reviews = reviews[reviews != ""]
+    # 토큰 수는 고유 리뷰마다 한 번만 계산
+    unique_costs = {review: count_tokens(review) + 3 for review in reviews.unique()}  # "- " + 줄바꿈
+
+    chunks, current, used = [], {}, 0
+    for review in reviews:
+        cost = unique_costs[review]
+        if review not in current and current and used + cost > chunk_tokens:
+            chunks.append(current)
+            current, used = {}, 0
+        if review not in current:
+            used += cost
+        current[review] = current.get(review, 0) + 1
+    if current:
+        chunks.append(current)
+    return ["\n".join(format_review(review, count) for review, count in chunk.items()) for chunk in chunks]
+
+
+def map_prompt(chunk: str, report_type: str) -> str:
+    return (f"다음은 고객의 {SENTIMENT_LABELS[report_type]} 리뷰 일부입니다. "
+            f"자주 언급되는 주제와 구체적인 표현을 빈도와 함께 핵심만 요약해주세요:\n\n{chunk}")
+
+
+def reduce_prompt(summaries: list, report_type: str) -> str:
+    joined = "\n\n".join(f"[요약 {i + 1}]\n{summary}" for i, summary in enumerate(summaries))
+    return (f"다음은 고객의 {SENTIMENT_LABELS[report_type]} 리뷰를 나눠서 요약한 내용입니다. "
+            f"중복되는 내용은 합치고 빈도가 높은 주제를 우선하여 하나의 요약으로 정리해주세요:\n\n{joined}")
+
+
+def final_prompt(summaries: list, report_type: str, total_reviews: int) -> PackedPrompt:
+    joined = "\n\n".join(summaries)
+    if report_type == "marketing":
+        header = f"다음은 고객의 긍정 리뷰 {total_reviews}건을 요약한 내용입니다. 아래 내용을 기반으로 마케팅 전략 리포트를 작성해주세요:"
+    else:
+        header = f"다음은 고객의 부정 리뷰 {total_reviews}건을 요약한 내용입니다. 아래 내용을 기반으로 서비스 개선 전략 리포트를 작성해주세요:"
+    text = f"{header}\n\n{joined}"
+    return PackedPrompt(text, count_tokens(text), total_reviews, total_reviews)
+
+
+def group_summaries(summaries: list, token_budget: int = PROMPT_TOKEN_BUDGET, fan_in: int = REDUCE_FAN_IN) -> list:
+    """요약 목록을 순서대로 토큰 예산/개수 제한에 맞는 그룹으로 나눕니다."""
+    groups, current, used = [], [], 0
+    for summary in summaries:
+        cost = count_tokens(summary) + 8  # "[요약 n]" 표시
+        if current and (used + cost > token_budget or len(current) >= fan_in):
+            groups.append(current)
+            current, used = [], 0
+        current.append(summary)
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def _run_stage(prompts: list, scheduler: ReportScheduler, use_cache: bool) -> list:
+    # 같은 내용의 프롬프트는 한 번만 요청 (키가 프롬프트 해시이므로 캐시 키와도 일치)
+    keyed = {chunk_hash(prompt): prompt for prompt in prompts}
+    results = await scheduler.run(keyed, use_cache=use_cache)
+    failed = [result for result in results.values() if result.error]
+    if failed:
+        raise RuntimeError(f"{len(failed)}개 요약 요청 실패: {failed[0].error}")
+    return [results[chunk_hash(prompt)].report for prompt in prompts]
+
+
+async def summarize_reviews_async(reviews, report_type: str, use_cache: bool = True,
+                                  scheduler: ReportScheduler = None,
+                                  chunk_tokens: int = CHUNK_TOKEN_BUDGET,
+                                  token_budget: int = PROMPT_TOKEN_BUDGET) -> PackedPrompt:
+    """전체 리뷰를 청크별로 요약(map)하고 트리 형태로 합쳐(reduce) 최종 리포트 프롬프트를 만듭니다.
+
+    청크/중간 요약은 프롬프트 내용 해시로 GPT 응답 캐시에 저장되므로, 리뷰를 추가한 뒤 다시 실행하면
+    새로 생긴 청크와 그 위쪽 요약만 요청합니다.
+    """
+    reviews = list(reviews)
+    scheduler = scheduler or ReportScheduler()
+    chunks = chunk_reviews(reviews, chunk_tokens)
+    if not chunks:
+        return final_prompt([], report_type, 0)
+
+    summaries = await _run_stage([map_prompt(chunk, report_type) for chunk in chunks], scheduler, use_cache)
+    groups = group_summaries(summaries, token_budget)
+    while len(groups) > 1:
+        if len(groups) == len(summaries):
+            # 요약 하나하나가 예산보다 커서 묶이지 않으면 두 개씩이라도 합쳐서 단계가 줄어들게 함
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        summaries = await _run_stage([reduce_prompt(group, report_type) for group in groups], scheduler, use_cache)
+        groups = group_summaries(summaries, token_budget)
+    return final_prompt(groups[0], report_type, len(reviews))
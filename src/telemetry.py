@@ -0,0 +1,200 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+from src.cache import CACHE_DIR
+
+# GPT 호출 기록 파일 (JSON lines). 크기 제한을 넘으면 .1, .2 ... 로 밀어내고 새 파일에 기록
+TELEMETRY_PATH = os.getenv("REVIEWDOCTOR_TELEMETRY_PATH", os.path.join(CACHE_DIR, "llm_calls.jsonl"))
+TELEMETRY_MAX_BYTES = int(os.getenv("REVIEWDOCTOR_TELEMETRY_MB", "10")) * 1024 * 1024
+TELEMETRY_BACKUPS = int(os.getenv("REVIEWDOCTOR_TELEMETRY_BACKUPS", "5"))
+# "0"이면 기록하지 않음
+TELEMETRY_ENABLED = os.getenv("REVIEWDOCTOR_TELEMETRY", "1") != "0"
+
+
+@dataclass
+class CallRecord:
+    deployment: str
+    stream: bool = False
+    cache_hit: bool = False
+    prompt_tokens: int = None
+    completion_tokens: int = None
+    # 응답에 usage가 없어(스트리밍 등) 토큰 수를 근사치로 계산했는지 여부
+    usage_estimated: bool = False
+    latency_seconds: float = None
+    ttft_seconds: float = None  # 스트리밍일 때 첫 토큰까지 걸린 시간
+    retries: int = 0
+    error: str = None
+    timestamp: float = field(default_factory=time.time)
+
+
+class CallTracker:
+    """GPT 호출 하나의 시간/토큰/재시도를 모아 with 블록이 끝날 때 기록합니다.
+
+    블록 안에서 content, usage를 채우고, 스트리밍이면 받은 텍스트 조각마다 add_token()을 호출합니다.
+    """
+
+    def __init__(self, log, deployment: str, prompt: str, stream: bool = False, retries: int = 0):
+        self.log = log
+        self.deployment = deployment
+        self.prompt = prompt
+        self.stream = stream
+        self.retries = retries
+        self.content = None
+        self.tokens = []
+        self.usage = None
+        self.ttft = None
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def add_token(self, token: str):
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self._start
+        self.tokens.append(token)
+
+    def __exit__(self, exc_type, exc, tb):
+        latency = time.perf_counter() - self._start
+        if exc_type is GeneratorExit:
+            error = "cancelled"  # 스트림을 끝까지 읽기 전에 호출한 쪽이 중단
+        else:
+            error = exc_type.__name__ if exc_type is not None else None
+
+        prompt_tokens = getattr(self.usage, "prompt_tokens", None)
+        completion_tokens = getattr(self.usage, "completion_tokens", None)
+        estimated = self.usage is None
+        if estimated:
+            from src.prompt_packing import count_tokens
+
+            # 스트림이 중간에 끊겨도 받은 만큼은 셈
+            content = self.content if self.content is not None else "".join(self.tokens)
+            prompt_tokens = getattr(self.prompt, "token_count", None) or count_tokens(self.prompt)
+            completion_tokens = count_tokens(content) if content else 0
+        self.log.record(CallRecord(
+            deployment=self.deployment,
+            stream=self.stream,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            usage_estimated=estimated,
+            latency_seconds=latency,
+            ttft_seconds=self.ttft,
+            retries=self.retries,
+            error=error,
+        ))
+        return False
+
+
+class TelemetryLog:
+    """GPT 호출 기록을 크기 기준으로 순환하는 JSON lines 파일에 남깁니다."""
+
+    def __init__(self, path: str = TELEMETRY_PATH, max_bytes: int = TELEMETRY_MAX_BYTES,
+                 backups: int = TELEMETRY_BACKUPS, enabled: bool = TELEMETRY_ENABLED):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def track(self, deployment: str, prompt: str, stream: bool = False, retries: int = 0) -> CallTracker:
+        return CallTracker(self, deployment, prompt, stream=stream, retries=retries)
+
+    def record(self, record: CallRecord):
+        if not self.enabled:
+            return
+        line = json.dumps(asdict(record), ensure_ascii=False) + "\n"
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    size = f.tell()
+                if size > self.max_bytes:
+                    self._rotate()
+        except OSError:
+            # 기록 실패가 리포트 생성에 영향을 주지 않음
+            pass
+
+    def _rotate(self):
+        for i in range(self.backups, 0, -1):
+            source = self.path if i == 1 else f"{self.path}.{i - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i}")
+        if self.backups == 0:
+            os.remove(self.path)
+
+    def files(self) -> list:
+        """오래된 파일부터 순서대로"""
+        paths = [f"{self.path}.{i}" for i in range(self.backups, 0, -1)] + [self.path]
+        return [path for path in paths if os.path.exists(path)]
+
+    def read(self, since: float = None) -> list:
+        records = []
+        for path in self.files():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 동시에 쓰다 잘린 줄
+                    if since is None or record.get("timestamp", 0) >= since:
+                        records.append(record)
+        return records
+
+
+def percentile(values: list, q: float):
+    """선형 보간 백분위수 (numpy.percentile 기본값과 같음). 값이 없으면 None"""
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(records: list) -> dict:
+    """배포별 호출 수, 캐시 적중, 에러, 재시도, 토큰 합계, 지연 시간/TTFT 백분위수"""
+    groups = {}
+    for record in records:
+        groups.setdefault(record.get("deployment") or "-", []).append(record)
+
+    summary = {}
+    for deployment, items in sorted(groups.items()):
+        # 지연 시간은 실제 API 호출(캐시 미적중, 성공)만으로 계산
+        calls = [r for r in items if not r.get("cache_hit")]
+        ok = [r for r in calls if not r.get("error")]
+        latencies = [r["latency_seconds"] for r in ok if r.get("latency_seconds") is not None]
+        ttfts = [r["ttft_seconds"] for r in ok if r.get("ttft_seconds") is not None]
+        summary[deployment] = {
+            "calls": len(items),
+            "cache_hits": len(items) - len(calls),
+            "errors": len(calls) - len(ok),
+            "retries": sum(r.get("retries") or 0 for r in calls),
+            "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in calls),
+            "completion_tokens": sum(r.get("completion_tokens") or 0 for r in calls),
+            **{f"latency_p{q}_s": percentile(latencies, q) for q in (50, 95, 99)},
+            **{f"ttft_p{q}_s": percentile(ttfts, q) for q in (50, 95)},
+        }
+    return summary
+
+
+def format_summary(summary: dict) -> str:
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.0f}ms"
+
+    lines = [f"{'deployment':<24} {'calls':>6} {'cache':>6} {'err':>4} {'retry':>5} {'prompt':>9} {'compl':>8} "
+             f"{'p50':>8} {'p95':>8} {'p99':>8} {'ttft50':>8} {'ttft95':>8}"]
+    for deployment, s in summary.items():
+        lines.append(
+            f"{deployment:<24} {s['calls']:>6} {s['cache_hits']:>6} {s['errors']:>4} {s['retries']:>5} "
+            f"{s['prompt_tokens']:>9} {s['completion_tokens']:>8} {ms(s['latency_p50_s']):>8} "
+            f"{ms(s['latency_p95_s']):>8} {ms(s['latency_p99_s']):>8} {ms(s['ttft_p50_s']):>8} {ms(s['ttft_p95_s']):>8}"
+        )
+    return "\n".join(lines)
+
+
+telemetry = TelemetryLog()
@@ -0,0 +1,106 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.profiling import timed
+
+
+class NounTokens:
+    """리뷰별 명사 목록을 CSR 형태(어휘 + int32 토큰 id + 행 오프셋)로 보관합니다.
+
+    i번째 리뷰의 명사는 token_ids[offsets[i]:offsets[i + 1]] 이며, vocab[id]가 실제 단어입니다.
+    """
+
+    def __init__(self, vocab, token_ids, offsets):
+        self.vocab = vocab
+        self.token_ids = token_ids
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def row_lengths(self):
+        return np.diff(self.offsets)
+
+    def row_tokens(self, i):
+        return [self.vocab[t] for t in self.token_ids[self.offsets[i]:self.offsets[i + 1]]]
+
+    def _token_mask(self, mask):
+        return np.repeat(np.asarray(mask, dtype=bool), self.row_lengths)
+
+    def counts(self, mask=None):
+        """행 마스크(불리언 배열)에 해당하는 리뷰들의 단어별 빈도 (길이 = 어휘 크기)"""
+        ids = self.token_ids if mask is None else self.token_ids[self._token_mask(mask)]
+        return np.bincount(ids, minlength=len(self.vocab))
+
+    def grouped_counts(self, group_codes, n_groups):
+        """행별 그룹 코드(0..n_groups-1, 음수는 제외)마다 단어 빈도를 한 번에 계산 → (n_groups, 어휘 크기) 행렬"""
+        token_groups = np.repeat(np.asarray(group_codes, dtype=np.int64), self.row_lengths)
+        valid = token_groups >= 0
+        flat = token_groups[valid] * len(self.vocab) + self.token_ids[valid]
+        counts = np.bincount(flat, minlength=n_groups * len(self.vocab))
+        return counts.reshape(n_groups, len(self.vocab))
+
+    def grouped_first_seen(self, group_codes, n_groups):
+        """그룹마다 각 단어가 그룹 안에서 처음 나온 토큰 위치 → (n_groups, 어휘 크기) 행렬 (나오지 않은 단어는 전체 토큰 수)"""
+        token_groups = np.repeat(np.asarray(group_codes, dtype=np.int64), self.row_lengths)
+        positions = np.flatnonzero(token_groups >= 0)
+        flat = token_groups[positions] * len(self.vocab) + self.token_ids[positions]
+        # np.unique의 return_index는 각 (그룹, 단어) 쌍이 처음 나온 위치
+        pairs, first = np.unique(flat, return_index=True)
+        first_seen = np.full(n_groups * len(self.vocab), len(self.token_ids), dtype=np.int64)
+        first_seen[pairs] = positions[first]
+        return first_seen.reshape(n_groups, len(self.vocab))
+
+    def top_k(self, mask=None, k=10, counts=None):
+        """빈도 상위 k개 (단어, 빈도) 목록. 동률이면 마스크 안에서 먼저 등장한 단어가 앞에 옵니다."""
+        if counts is None:
+            counts = self.counts(mask)
+        group_codes = np.zeros(len(self), dtype=np.int64) if mask is None else np.where(mask, 0, -1)
+        return top_k_from_counts(self.vocab, counts, k, self.grouped_first_seen(group_codes, 1)[0])
+
+    def frequencies(self, mask=None):
+        counts = self.counts(mask)
+        nonzero = np.flatnonzero(counts)
+        return dict(zip(self.vocab[nonzero].tolist(), counts[nonzero].tolist()))
+
+
+def top_k_from_counts(vocab, counts, k, first_seen):
+    """빈도 상위 k개 (단어, 빈도) 목록. 동률이면 first_seen(단어별 첫 등장 위치)이 작은 단어가 앞에 옵니다."""
+    nonzero = np.flatnonzero(counts)
+    # 빈도 내림차순, 같은 빈도면 그룹 안 첫 등장 순서 (Counter.most_common과 같은 순서)
+    order = nonzero[np.lexsort((first_seen[nonzero], -counts[nonzero]))][:k]
+    return list(zip(vocab[order].tolist(), counts[order].tolist()))
+
+
+@timed("tokenize_nouns")
+def tokenize_nouns(series):
+    """쉼표로 구분된 명사 컬럼을 Arrow 문자열 연산으로 한 번에 파싱합니다. (빈 토큰은 제외)
+
+    분리/공백 제거/어휘 부여를 모두 Arrow 배열 위에서 하므로 파이썬 문자열은 어휘 단어마다 하나만 만들어집니다.
+    """
+    text = series.fillna('').astype(str)
+    n_rows = len(text)
+    if n_rows == 0:
+        return NounTokens(np.array([], dtype=object), np.array([], dtype=np.int32), np.zeros(1, dtype=np.int64))
+
+    arrow_text = pa.array(text, from_pandas=True)
+    if isinstance(arrow_text, pa.ChunkedArray):
+        arrow_text = arrow_text.combine_chunks()
+    lists = pc.split_pattern(arrow_text, ',')
+    pieces = pc.utf8_trim_whitespace(pc.list_flatten(lists))
+    keep = pc.not_equal(pieces, '')
+    # dictionary_encode는 첫 등장 순서대로 어휘 번호를 매김
+    encoded = pc.filter(pieces, keep).dictionary_encode()
+    codes = encoded.indices.to_numpy(zero_copy_only=False)
+    vocab = encoded.dictionary.to_numpy(zero_copy_only=False)
+    keep = keep.to_numpy(zero_copy_only=False)
+
+    pieces_per_row = pc.list_value_length(lists).to_numpy(zero_copy_only=False).astype(np.int64)
+    row_of_piece = np.repeat(np.arange(n_rows), pieces_per_row)
+    row_lengths = np.bincount(row_of_piece[keep], minlength=n_rows)
+    offsets = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(row_lengths, out=offsets[1:])
+
+    return NounTokens(np.asarray(vocab, dtype=object), codes.astype(np.int32), offsets)
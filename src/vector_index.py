@@ -0,0 +1,216 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.cache import CACHE_DIR
+from src.clustering import BATCH_SIZE, HashedTfidfVectorizer
+from src.profiling import timed
+
+# 유사 리뷰 검색용 벡터 차원 (군집화와 같은 해시 TF-IDF, 인덱스 크기를 줄이려고 차원을 낮춤)
+INDEX_FEATURES = 256
+# 이 행 수 이상이면 전체 탐색(flat) 대신 역리스트(IVF) 인덱스를 만듦
+IVF_MIN_ROWS = int(os.getenv("REVIEWDOCTOR_IVF_MIN_ROWS", "100000"))
+# IVF 검색 시 살펴볼 리스트 수
+IVF_PROBES = int(os.getenv("REVIEWDOCTOR_IVF_PROBES", "8"))
+# 데이터셋별 인덱스를 저장하는 디렉터리 (<INDEX_DIR>/<캐시 키>/)
+INDEX_DIR = os.path.join(CACHE_DIR, "review_index")
+
+# 검색/재배열 시 한 번에 float32로 바꾸는 벡터 행 수
+_BLOCK = 65536
+
+_ARRAYS = ("vectors", "order", "positions", "centroids", "list_offsets", "doc_freq")
+
+
+def _top_k(scores, k):
+    # 점수 내림차순 상위 k개 위치 (argpartition 후 k개만 정렬)
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def _train_lists(vectors, n_lists, seed=0, iterations=10):
+    """표본에서 구면 k-means(코사인)로 IVF 리스트 중심 학습"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_lists * 40)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        labels = (sample @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        filled = norms[:, 0] > 0
+        centroids[filled] = sums[filled] / norms[filled]
+    return centroids
+
+
+class ReviewIndex:
+    """리뷰별 특징 벡터(해시 TF-IDF, float16) 근접 이웃 인덱스.
+
+    행 수가 IVF_MIN_ROWS 미만이면 전체 탐색(flat), 이상이면 벡터를 리스트(IVF)별로 정렬해 두고
+    질의와 가까운 리스트 IVF_PROBES개만 탐색합니다. build/load는 디렉터리의 .npy 파일을
+    memory-map으로 쓰고 열기 때문에 큰 인덱스도 메모리에 전부 올리지 않습니다.
+    결과는 원본 DataFrame의 행 위치(0부터)입니다.
+    """
+
+    def __init__(self, vectorizer, vectors, order=None, positions=None, centroids=None, list_offsets=None):
+        self.vectorizer = vectorizer
+        self.vectors = vectors  # IVF면 리스트 순서로 정렬된 벡터
+        self.order = order  # 저장 위치 → 원본 행 위치
+        self.positions = positions  # 원본 행 위치 → 저장 위치
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def is_ivf(self):
+        return self.centroids is not None
+
+    @classmethod
+    @timed("build_review_index")
+    def build(cls, frame, path: str, n_lists: int = None):
+        """frame의 명사/형용사 컬럼으로 인덱스를 만들어 path 디렉터리에 저장하고 memory-map으로 엽니다.
+
+        n_lists를 생략하면 행 수에 따라 flat/IVF(√N개 리스트)를 고릅니다.
+        벡터는 처음부터 디스크의 .npy(memory-map)에 블록 단위로 쓰므로 메모리는 IVF 정렬 순서 배열(행당 24바이트) 정도만 사용합니다.
+        """
+        root = os.path.dirname(path) or "."
+        os.makedirs(root, exist_ok=True)
+        # 같은 키를 동시에 만드는 세션끼리 서로의 임시 디렉터리를 지우지 않도록 고유한 이름 사용
+        tmp_dir = tempfile.mkdtemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=root)
+        try:
+            cls._write(frame, tmp_dir, n_lists)
+            try:
+                os.replace(tmp_dir, path)
+            except OSError:
+                # 다른 세션이 먼저 완성한 인덱스가 있으면 그것을 사용
+                if not os.path.exists(os.path.join(path, "meta.json")):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return cls.load(path)
+
+    @staticmethod
+    def _write(frame, out_dir: str, n_lists: int = None):
+        vectorizer = HashedTfidfVectorizer(INDEX_FEATURES)
+        for start in range(0, len(frame), BATCH_SIZE):
+            vectorizer.partial_fit(frame.iloc[start:start + BATCH_SIZE])
+
+        if n_lists is None:
+            n_lists = int(np.sqrt(len(frame))) if len(frame) >= IVF_MIN_ROWS else 0
+        # IVF면 원래 순서 벡터는 임시 파일에 쓰고, 리스트 순서로 옮긴 vectors.npy를 따로 만듦
+        raw_path = os.path.join(out_dir, "vectors.raw.npy" if n_lists else "vectors.npy")
+        vectors = np.lib.format.open_memmap(raw_path, mode="w+", dtype=np.float16, shape=(len(frame), INDEX_FEATURES))
+        for start in range(0, len(frame), BATCH_SIZE):
+            vectors[start:start + BATCH_SIZE] = vectorizer.transform(frame.iloc[start:start + BATCH_SIZE])
+        vectors.flush()
+
+        arrays = {"doc_freq": vectorizer.doc_freq}
+        if n_lists:
+            centroids = _train_lists(vectors, n_lists)
+            labels = np.empty(len(frame), dtype=np.int64)
+            for start in range(0, len(frame), BATCH_SIZE):
+                block = vectors[start:start + BATCH_SIZE].astype(np.float32)
+                labels[start:start + BATCH_SIZE] = (block @ centroids.T).argmax(axis=1)
+            order = np.argsort(labels, kind='stable')
+            positions = np.empty_like(order)
+            positions[order] = np.arange(len(order))
+            list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+            np.cumsum(np.bincount(labels, minlength=n_lists), out=list_offsets[1:])
+
+            # 전체를 한 번에 fancy-index로 복사하지 않고 블록 단위로 재배열
+            ordered = np.lib.format.open_memmap(os.path.join(out_dir, "vectors.npy"), mode="w+",
+                                                dtype=np.float16, shape=vectors.shape)
+            for start in range(0, len(order), _BLOCK):
+                ordered[start:start + _BLOCK] = vectors[order[start:start + _BLOCK]]
+            ordered.flush()
+            del ordered, vectors
+            os.remove(raw_path)
+            arrays.update(order=order, positions=positions, centroids=centroids, list_offsets=list_offsets)
+        else:
+            del vectors
+
+        for name, array in arrays.items():
+            np.save(os.path.join(out_dir, f"{name}.npy"), array)
+        meta = {"rows": len(frame), "n_features": vectorizer.n_features, "n_docs": vectorizer.n_docs,
+                "lists": n_lists}
+        with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def _scores(self, stored, query):
+        # float16 벡터는 블록 단위로만 float32로 바꿔서 내적
+        scores = np.empty(len(stored), dtype=np.float32)
+        for start in range(0, len(stored), _BLOCK):
+            block = self.vectors[stored[start:start + _BLOCK]].astype(np.float32)
+            scores[start:start + _BLOCK] = block @ query
+        return scores
+
+    def _stored(self, rows):
+        return rows if self.positions is None else np.asarray(self.positions[rows])
+
+    def _original(self, stored):
+        return stored if self.order is None else np.asarray(self.order[stored])
+
+    def search(self, query, k: int = 5, rows=None, n_probe: int = IVF_PROBES):
+        """query(벡터)와 코사인 유사도가 높은 리뷰 상위 k개의 (행 위치, 점수).
+
+        rows(원본 행 위치 배열)를 주면 그 안에서만 전체 탐색합니다. (예: 한 군집의 리뷰)
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if rows is not None:
+            stored = self._stored(np.asarray(rows, dtype=np.int64))
+        elif self.is_ivf:
+            lists = _top_k(self.centroids @ query, n_probe)
+            stored = np.concatenate([np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in lists])
+        else:
+            stored = np.arange(len(self.vectors))
+        scores = self._scores(stored, query)
+        top = _top_k(scores, k)
+        return self._original(stored[top]), scores[top]
+
+    def nearest_to_centroid(self, rows, k: int = 3):
+        """rows 리뷰 벡터의 평균 방향(군집 중심)에 가장 가까운, 즉 가장 대표적인 리뷰 k개의 (행 위치, 점수)"""
+        # 군집 리뷰 벡터를 저장 순서대로 한 번만 읽어 중심 계산과 점수 계산에 같이 사용
+        stored = np.sort(self._stored(np.asarray(rows, dtype=np.int64)))
+        block = self.vectors[stored].astype(np.float32)
+        center = block.sum(axis=0)
+        norm = np.linalg.norm(center)
+        scores = block @ (center / norm if norm > 0 else center)
+        top = _top_k(scores, k)
+        return self._original(stored[top]), scores[top]
+
+    def nearest_to_keywords(self, keywords, k: int = 5, rows=None):
+        """키워드 묶음과 가장 비슷한 리뷰 k개의 (행 위치, 점수)"""
+        query = self.vectorizer.transform(pd.DataFrame({'Nouns': [" ".join(keywords)]}))[0]
+        return self.search(query, k, rows=rows)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {}
+        for name in _ARRAYS:
+            file_path = os.path.join(path, f"{name}.npy")
+            arrays[name] = np.load(file_path, mmap_mode="r" if mmap else None) if os.path.exists(file_path) else None
+        vectorizer = HashedTfidfVectorizer(meta["n_features"])
+        vectorizer.n_docs = meta["n_docs"]
+        vectorizer.doc_freq = np.array(arrays.pop("doc_freq"))
+        return cls(vectorizer, **arrays)
+
+
+def load_or_build_index(dataset, key: str, root: str = INDEX_DIR) -> ReviewIndex:
+    """<root>/<key>/에 저장된 인덱스를 memory-map으로 열고, 없으면 dataset.frame으로 만들어 저장"""
+    path = os.path.join(root, key)
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        return ReviewIndex.build(dataset.frame, path)
+    return ReviewIndex.load(path)
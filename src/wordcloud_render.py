@@ -0,0 +1,66 @@
+import hashlib
+import io
+import os
+
+from src.cache import CACHE_DIR, PipelineCache
+from src.profiling import timed
+
+# 팔레트별 HSL 범위: (색상, 채도, 명도)
+PALETTES = {
+    'green': ((90, 149), (70, 99), (30, 69)),  # 긍정 리뷰용
+    'red': ((0, 29), (70, 99), (30, 69)),      # 부정 리뷰용
+}
+DEFAULT_SEED = 42
+
+# PNG 바이트만 저장하므로 작은 크기로 제한
+wordcloud_cache = PipelineCache(
+    cache_dir=os.path.join(CACHE_DIR, "wordcloud"),
+    max_memory_bytes=64 * 1024 * 1024,
+    max_disk_bytes=256 * 1024 * 1024,
+)
+
+
+def frequency_hash(frequencies: dict) -> str:
+    h = hashlib.sha256()
+    for word, count in sorted(frequencies.items()):
+        h.update(f"{word}\t{count}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _palette_color_func(palette: str):
+    hue, saturation, lightness = PALETTES[palette]
+
+    # WordCloud가 넘겨주는 random_state(시드 고정)를 사용하므로 같은 입력이면 같은 색이 나옴
+    def color_func(word, font_size, position, orientation, random_state=None, **kwargs):
+        return (f"hsl({random_state.randint(*hue)}, "
+                f"{random_state.randint(*saturation)}%, {random_state.randint(*lightness)}%)")
+
+    return color_func
+
+
+def _render_png(frequencies: dict, palette: str, width: int, height: int, seed: int) -> bytes:
+    # wordcloud(+ matplotlib)는 캐시에 없는 이미지를 처음 그릴 때만 import
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(
+        width=width,
+        height=height,
+        background_color='white',
+        color_func=_palette_color_func(palette),
+        random_state=seed,
+    ).generate_from_frequencies(frequencies)
+
+    # matplotlib figure를 거치지 않고 PIL 이미지로 바로 PNG 인코딩
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@timed("render_wordcloud")
+def render_wordcloud(frequencies: dict, palette: str, width: int = 400, height: int = 300,
+                     seed: int = DEFAULT_SEED) -> bytes:
+    """빈도표로 워드클라우드 PNG를 만들고 (빈도표 해시, 팔레트, 크기, 시드) 기준으로 캐시합니다."""
+    key = f"{frequency_hash(frequencies)}-{palette}-{width}x{height}-{seed}"
+    return wordcloud_cache.get_or_compute(
+        key, lambda: _render_png(frequencies, palette, width, height, seed)
+    )
@@ -1,18 +1,50 @@
 import streamlit as st
+from src.cache import content_hash
+from src.dataset import ReviewDataset
+from src.profiling import profiler, render_sidebar_panel, span
+from src.snapshot import AnalysisSnapshot, list_snapshots
 
 st.set_page_config(page_title="Review Report Generator", page_icon="🛫")
 
 st.title("리뷰 기반 리포트 생성기")
+perf_run = profiler.start_run()
 
 # CSV 파일 업로드
 uploaded_file = st.file_uploader("CSV 리뷰 파일 업로드", type=["csv"])
 
 if uploaded_file:
-    st.session_state["uploaded_file"] = uploaded_file
+    # 업로드 파일은 여기서 한 번만 파싱하고, 모든 페이지는 세션의 dataset을 공유
+    file_bytes = uploaded_file.getvalue()
+    dataset = st.session_state.get("dataset")
+    if dataset is None or dataset.content_hash != content_hash(file_bytes):
+        try:
+            with span("upload.parse"), st.spinner("리뷰 파일을 읽는 중... (군집 번호가 없으면 군집화까지 수행)"):
+                st.session_state["dataset"] = ReviewDataset.from_bytes(file_bytes, name=uploaded_file.name)
+        except Exception as e:
+            st.error(f"CSV 파일을 읽는 중 오류 발생: {e}")
+            st.stop()
     st.success("파일 업로드 완료! 왼쪽 메뉴로 이동하세요.")
 else:
     st.info("먼저 리뷰 CSV 파일을 업로드해주세요.")
 
+# main.py precompute로 미리 집계해 둔 스냅샷 열기 (대용량 데이터용, 리뷰 분석 페이지만 사용 가능)
+snapshots = list_snapshots()
+if snapshots:
+    with st.expander("사전 계산된 스냅샷 열기"):
+        labels = {path: f"{manifest['name']} · 리뷰 {manifest['rows']:,}개 · {manifest['created_at']}"
+                  for path, manifest in snapshots}
+        snapshot_path = st.selectbox("스냅샷", list(labels), format_func=labels.get)
+        if st.button("스냅샷 열기"):
+            try:
+                with span("snapshot.open"):
+                    st.session_state["dataset"] = AnalysisSnapshot.open(snapshot_path)
+            except (OSError, ValueError, KeyError) as e:
+                st.error(f"스냅샷을 여는 중 오류 발생: {e}")
+                st.stop()
+            st.success("스냅샷을 열었습니다! 왼쪽 메뉴에서 리뷰 분석으로 이동하세요.")
+
+render_sidebar_panel(perf_run)
+
 # st.markdown("""
 # ---  
 # 왼쪽 사이드바에서 기능을 선택하세요:
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_data import generate_reviews  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def reviews():
+    """분석 테스트용 합성 리뷰 (평점 결측, 여러 좌석/감성/클러스터 포함)"""
+    return generate_reviews(3000, seed=7, vocab_size=300)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.aggregate_state import AggregateState
+from src.analysis import CUBE_DIMENSIONS, SERVICE_COLUMNS, preprocess_data
+from src.keyword_index import build_keyword_index
+from src.tokens import tokenize_nouns
+
+
+def _split(frame, parts):
+    # 원래 인덱스를 유지해서 나눔 (preprocess_data가 인덱스로 월을 정함)
+    bounds = np.linspace(0, len(frame), parts + 1).astype(int)
+    return [frame.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _keyword_index(frame):
+    processed = preprocess_data(frame.copy())
+    return build_keyword_index(processed, tokenize_nouns(processed['Nouns']))
+
+
+def _sorted_table(cube):
+    return cube.table.sort_index(axis=1).astype(np.float64)
+
+
+@pytest.fixture(scope="module")
+def full(reviews):
+    return AggregateState.from_frame(reviews)
+
+
+@pytest.fixture(scope="module")
+def merged(reviews):
+    states = [AggregateState.from_frame(part) for part in _split(reviews, 3)]
+    return states[0].merge(states[1]).merge(states[2])
+
+
+def test_merge_equals_full_build(full, merged):
+    assert merged.rows == full.rows
+    assert sorted(merged.seat_classes) == sorted(full.seat_classes)
+    pd.testing.assert_frame_equal(_sorted_table(merged.cube), _sorted_table(full.cube))
+
+    merged_analysis, full_analysis = merged.analysis(), full.analysis()
+    assert merged_analysis["strengths_weaknesses"] == full_analysis["strengths_weaknesses"]
+    pd.testing.assert_frame_equal(merged_analysis["cluster_stats"], full_analysis["cluster_stats"])
+    pd.testing.assert_frame_equal(merged_analysis["heatmap"], full_analysis["heatmap"])
+    assert merged_analysis["service_rankings"] == full_analysis["service_rankings"]
+
+
+def test_merge_is_associative(reviews):
+    a, b, c = (AggregateState.from_frame(part) for part in _split(reviews, 3))
+    left = a.merge(b).merge(c)
+    right = a.merge(b.merge(c))
+    pd.testing.assert_frame_equal(_sorted_table(left.cube), _sorted_table(right.cube))
+    assert left.keyword_index.frequencies() == right.keyword_index.frequencies()
+
+
+def test_merge_with_disjoint_traveller_types(reviews):
+    business = reviews[reviews['TypeOfTraveller'] == 'Business']
+    leisure = reviews[reviews['TypeOfTraveller'] != 'Business']
+    merged = AggregateState.from_frame(business).merge(AggregateState.from_frame(leisure))
+    full = AggregateState.from_frame(pd.concat([business, leisure]))
+    assert merged.cube.traveller_dist() == pytest.approx(full.cube.traveller_dist())
+    for col in SERVICE_COLUMNS:
+        assert merged.cube.rating_means()[col] == pytest.approx(full.cube.rating_means()[col])
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"SeatType": "비즈니스"},
+    {"SeatType": "이코노미", "sentiment": "비추천"},
+    {"year": 2025, "month": 6, "ClusterID": 1},
+])
+def test_keyword_index_merge_matches_full_index(reviews, filters):
+    first, second = _split(reviews, 2)
+    merged = _keyword_index(first).merge(_keyword_index(second))
+    full = _keyword_index(reviews)
+
+    assert merged.frequencies(**filters) == full.frequencies(**filters)
+    assert merged.top_k(10, **filters) == full.top_k(10, **filters)
+
+
+def test_keyword_index_merge_keeps_first_seen_vocab_order(reviews):
+    first, second = _split(reviews, 2)
+    left = _keyword_index(first)
+    merged = left.merge(_keyword_index(second))
+    # self의 어휘가 앞에 그대로 오고, 전체 어휘는 한 번에 만든 인덱스와 같은 순서
+    assert list(merged.vocab[:len(left.vocab)]) == list(left.vocab)
+    assert list(merged.vocab) == list(_keyword_index(reviews).vocab)
+    pd.testing.assert_frame_equal(merged.cells, _keyword_index(reviews).cells[CUBE_DIMENSIONS])
+
+
+def test_keyword_index_rejects_unknown_dimension(reviews):
+    with pytest.raises(KeyError):
+        _keyword_index(reviews).counts(Airline="x")
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from src.analysis import SERVICE_COLUMNS, build_cluster_stats, build_cube, preprocess_data
+
+
+# 집계 큐브 도입 전 분석 페이지의 그룹별 build_* 함수 (기준 결과)
+def old_build_review_data(df):
+    review_data = {}
+    for (year, month, seat_class), group in df.groupby(['year', 'month', 'SeatType']):
+        review_data.setdefault(year, {}).setdefault(month, {})[seat_class] = {
+            "traveller_dist": group['TypeOfTraveller'].value_counts(normalize=True).to_dict(),
+            "sentiment_dist": group['sentiment'].value_counts(normalize=True).to_dict(),
+        }
+    return review_data
+
+
+def old_build_rating_data(df):
+    rating_data = {}
+    for (year, month, seat_class), group in df.groupby(['year', 'month', 'SeatType']):
+        avg_ratings = {col: group[col].mean() for col in SERVICE_COLUMNS}
+        avg_ratings['OverallRating'] = group['OverallRating'].mean()
+        rating_data.setdefault(year, {}).setdefault(month, {})[seat_class] = avg_ratings
+    return rating_data
+
+
+def old_build_cluster_stats(df):
+    cluster_stats = []
+    for (seat_type, recommended, cluster_id), group in df.groupby(['SeatType', 'sentiment', 'ClusterID']):
+        stats = {
+            'SeatType': seat_type,
+            'Sentiment': recommended,
+            'ClusterID': cluster_id,
+            'UniqueID': f"{seat_type}_{recommended}_{cluster_id}",
+            'Count': len(group),
+            'AvgOverallRating': group['OverallRating'].mean(),
+            'RecommendationRate': (group['sentiment'] == '추천').mean() * 100,
+            'DominantTraveller': group['TypeOfTraveller'].mode().iloc[0] if len(group) > 0 else 'N/A'
+        }
+        for col in SERVICE_COLUMNS:
+            stats[col] = group[col].mean()
+        cluster_stats.append(stats)
+    return pd.DataFrame(cluster_stats)
+
+
+@pytest.fixture(scope="module")
+def processed(reviews):
+    return preprocess_data(reviews.copy())
+
+
+@pytest.fixture(scope="module")
+def cube(processed):
+    return build_cube(processed)
+
+
+def test_cube_matches_per_group_ratings_and_distributions(processed, cube):
+    rating_data = old_build_rating_data(processed)
+    review_data = old_build_review_data(processed)
+
+    assert cube.years() == list(rating_data)
+    for year, months in rating_data.items():
+        assert cube.months(year) == list(months)
+        for month, seats in months.items():
+            assert sorted(cube.values('SeatType', year=year, month=month)) == sorted(seats)
+            for seat_class, ratings in seats.items():
+                filters = dict(year=year, month=month, SeatType=seat_class)
+                assert cube.rating_means(**filters) == pytest.approx(ratings, rel=1e-6)
+                expected = review_data[year][month][seat_class]
+                assert cube.traveller_dist(**filters) == pytest.approx(expected["traveller_dist"])
+                assert cube.sentiment_dist(**filters) == pytest.approx(expected["sentiment_dist"])
+
+    overall = processed['TypeOfTraveller'].value_counts(normalize=True).to_dict()
+    assert cube.traveller_dist() == pytest.approx(overall)
+
+
+def test_cube_missing_rating_column_defaults_to_zero(reviews):
+    cube = build_cube(preprocess_data(reviews.drop(columns=['GroundService'])))
+    assert cube.rating_means(year=2025, month=5)['GroundService'] == 0.0
+
+
+@pytest.mark.parametrize("source", ["rows", "cube"])
+def test_cluster_stats_match_per_group_loop(processed, cube, source):
+    stats = build_cluster_stats(processed) if source == "rows" else cube.cluster_stats()
+    expected = old_build_cluster_stats(processed)
+    pd.testing.assert_frame_equal(stats, expected, check_dtype=False, rtol=1e-6)
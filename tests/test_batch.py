@@ -0,0 +1,49 @@
+import json
+
+from src.batch import ingest_results, write_reports
+
+
+def _line(custom_id, content=None, status_code=200, error=None, body=None):
+    response = None
+    if content is not None or body is not None or status_code != 200:
+        response = {
+            "status_code": status_code,
+            "body": body if body is not None else {"choices": [{"message": {"content": content}}]},
+        }
+    return {"custom_id": custom_id, "response": response, "error": error}
+
+
+def _write(path, lines):
+    path.write_text("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_ingest_groups_reports_by_dataset_and_segment(tmp_path):
+    output = _write(tmp_path / "output.jsonl", [
+        _line("reviews-abc/marketing", "마케팅 리포트"),
+        _line("reviews-abc/비즈니스_추천_0", "군집 리포트"),
+        _line("other-def/service", "서비스 리포트"),
+    ])
+    assert ingest_results(output) == {
+        "reviews-abc": {"marketing": "마케팅 리포트", "비즈니스_추천_0": "군집 리포트"},
+        "other-def": {"service": "서비스 리포트"},
+    }
+
+
+def test_ingest_records_failed_requests(tmp_path):
+    output = _write(tmp_path / "output.jsonl", [
+        _line("reviews-abc/marketing", error={"code": "timeout", "message": "요청 시간 초과"}),
+        _line("reviews-abc/service", status_code=429, body={"error": {"message": "rate limited"}}),
+        _line("reviews-abc/이코노미_비추천_2", "정상 리포트"),
+    ])
+    reports = ingest_results(output)["reviews-abc"]
+    assert reports["marketing"].startswith("오류: ") and "timeout" in reports["marketing"]
+    assert reports["service"] == "오류: {'message': 'rate limited'}"
+    assert reports["이코노미_비추천_2"] == "정상 리포트"
+
+
+def test_ingested_reports_are_written_per_segment(tmp_path):
+    output = _write(tmp_path / "output.jsonl", [_line("reviews-abc/marketing", "마케팅 리포트")])
+    paths = write_reports(ingest_results(output), str(tmp_path / "reports"))
+    assert paths == [str(tmp_path / "reports" / "reviews-abc" / "marketing.txt")]
+    assert (tmp_path / "reports" / "reviews-abc" / "marketing.txt").read_text(encoding="utf-8") == "마케팅 리포트"
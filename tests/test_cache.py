@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from src.cache import PipelineCache, cache_key, content_hash
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PipelineCache(cache_dir=str(tmp_path), max_memory_bytes=1 << 20, max_disk_bytes=1 << 20)
+
+
+def test_get_or_compute_computes_once_then_hits_memory(cache):
+    calls = []
+    compute = lambda: calls.append(1) or {"rows": [1, 2, 3]}  # noqa: E731
+    first = cache.get_or_compute("k", compute)
+    second = cache.get_or_compute("k", compute)
+    assert calls == [1]
+    assert second is first  # 메모리 캐시는 같은 객체를 그대로 돌려줌
+
+
+def test_disk_tier_survives_a_new_process(cache, tmp_path):
+    cache.put("k", {"rows": [1, 2, 3]})
+    fresh = PipelineCache(cache_dir=str(tmp_path))
+    assert fresh.get("k") == {"rows": [1, 2, 3]}
+    assert fresh.get("missing", "default") == "default"
+
+
+def test_pipeline_version_is_part_of_the_key(cache):
+    data_hash = content_hash(b"SeatType,Recommended\n")
+    cache.put(cache_key(data_hash, version="1"), "old")
+    assert cache.get(cache_key(data_hash, version="2")) is None
+    assert cache.get(cache_key(data_hash, version="1")) == "old"
+
+
+def test_invalidate_removes_memory_and_disk_entries(cache, tmp_path):
+    cache.put("k", "value")
+    cache.invalidate("k")
+    assert cache.get("k") is None
+    assert not os.path.exists(tmp_path / "k.pkl")
+
+
+@pytest.mark.parametrize("payload", [
+    b"garbage",
+    b"cbuiltins\nNoSuchThing\n.",              # AttributeError: 이름이 바뀐 클래스
+    b"cno_such_module_v1\nAnalysis\n.",        # ModuleNotFoundError: 옮겨진 모듈
+])
+def test_unloadable_entries_are_misses_and_get_deleted(cache, tmp_path, payload):
+    (tmp_path / "k.pkl").write_bytes(payload)
+    assert cache.get_or_compute("k", lambda: "recomputed") == "recomputed"
+    assert PipelineCache(cache_dir=str(tmp_path)).get("k") == "recomputed"
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = PipelineCache(cache_dir=str(tmp_path), max_memory_bytes=2500, max_disk_bytes=0)
+    cache.put("a", b"x" * 1000)
+    cache.put("b", b"x" * 1000)
+    cache.get("a")
+    cache.put("c", b"x" * 1000)
+    # 디스크에는 저장하지 않으므로(max_disk_bytes=0) 메모리에서 밀려난 항목은 사라짐
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
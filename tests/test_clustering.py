@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import src.dataset as dataset_module
+from src.cache import PipelineCache
+from src.clustering import ReviewClusterer, assign_cluster_ids
+from src.dataset import ReviewDataset
+
+
+@pytest.fixture(scope="module")
+def unclustered(reviews):
+    return reviews.drop(columns=['ClusterID'])
+
+
+def test_clustering_is_deterministic(unclustered):
+    first, _ = assign_cluster_ids(unclustered)
+    second, _ = assign_cluster_ids(unclustered)
+    np.testing.assert_array_equal(first, second)
+    assert first.min() >= 0 and first.max() < ReviewClusterer().n_clusters
+
+
+def test_saved_model_predicts_and_continues_like_the_original(unclustered, tmp_path):
+    first, second = unclustered.iloc[:2000], unclustered.iloc[2000:]
+    original = ReviewClusterer().partial_fit(first)
+    loaded = ReviewClusterer.load(original.save(str(tmp_path / "model.npz")))
+    np.testing.assert_array_equal(loaded.predict(unclustered), original.predict(unclustered))
+
+    # 불러온 모델에 이어서 학습해도 원래 모델을 이어서 학습한 것과 같음
+    original.partial_fit(second)
+    loaded.partial_fit(second)
+    np.testing.assert_array_equal(loaded.vectorizer.doc_freq, original.vectorizer.doc_freq)
+    for key, model in original.models.items():
+        np.testing.assert_allclose(loaded.models[key].centers, model.centers, rtol=1e-6)
+    np.testing.assert_array_equal(loaded.predict(unclustered), original.predict(unclustered))
+
+
+def test_upload_clustering_is_cached_by_content_hash(unclustered, tmp_path, monkeypatch):
+    calls = []
+
+    def counting_assign(frame, clusterer=None):
+        calls.append(len(frame))
+        return assign_cluster_ids(frame, clusterer)
+
+    monkeypatch.setattr(dataset_module, "pipeline_cache", PipelineCache(cache_dir=str(tmp_path)))
+    monkeypatch.setattr(dataset_module, "assign_cluster_ids", counting_assign)
+    data = unclustered.to_csv(index=False).encode("utf-8")
+
+    first = ReviewDataset.from_bytes(data)
+    second = ReviewDataset.from_bytes(data)
+    assert calls == [len(unclustered)]
+    np.testing.assert_array_equal(first.frame['ClusterID'], second.frame['ClusterID'])
+    np.testing.assert_array_equal(first.frame['ClusterID'], assign_cluster_ids(unclustered)[0])
@@ -0,0 +1,73 @@
+import pytest
+
+import src.llm_cache as llm_cache_module
+from src.llm_cache import LLMCache, request_key
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(llm_cache_module.time, "time", clock.time)
+    return clock
+
+
+def test_request_key_depends_on_every_parameter():
+    base = request_key("gpt", "prompt", 0.7, 100)
+    assert base == request_key("gpt", "prompt", 0.7, 100)
+    assert len({base, request_key("gpt-2", "prompt", 0.7, 100), request_key("gpt", "prompt!", 0.7, 100),
+                request_key("gpt", "prompt", 0.2, 100), request_key("gpt", "prompt", 0.7, 200)}) == 5
+
+
+def test_hit_and_miss_are_counted(tmp_path, clock):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"))
+    assert cache.get("k") is None
+    cache.put("k", "리포트")
+    assert cache.get("k") == "리포트"
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": len("리포트".encode("utf-8"))}
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl_seconds=60)
+    cache.put("k", "report")
+    clock.now += 60
+    assert cache.get("k") == "report"
+    clock.now += 1
+    assert cache.get("k") is None
+    # 만료된 항목은 조회할 때 삭제됨
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_over_max_bytes(tmp_path, clock):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), max_bytes=250)
+    for key in ("a", "b"):
+        cache.put(key, "x" * 100)
+        clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("c", "x" * 100)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] == 200
+
+
+def test_oversized_responses_are_not_stored(tmp_path, clock):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), max_bytes=10)
+    cache.put("k", "x" * 11)
+    assert cache.get("k") is None
+
+
+def test_unusable_cache_path_degrades_to_misses(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = LLMCache(path=str(blocker / "llm.sqlite3"))
+    cache.put("k", "report")
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
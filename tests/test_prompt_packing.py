@@ -0,0 +1,78 @@
+import pytest
+
+import src.prompt_packing as prompt_packing
+from src.prompt_packing import count_tokens, format_review, pack_prompt, pack_reviews
+
+REVIEWS = [
+    "The seat was very comfortable and the crew was friendly",
+    "the seat was very comfortable, and the crew was friendly!",
+    "THE SEAT WAS VERY COMFORTABLE AND THE CREW WAS FRIENDLY",
+    "The crew was friendly and the seat was very comfortable",
+    "Food was cold and the flight was delayed by three hours",
+    "Food was cold and the flight was delayed by three hours",
+    "Lounge access was excellent",
+    None,
+    "   ",
+]
+
+
+def _cost(selected):
+    return sum(count_tokens(format_review(review, count)) + 1 for review, count in selected)
+
+
+def test_duplicates_are_merged_with_counts():
+    selected, _ = pack_reviews(REVIEWS, token_budget=1000)
+    counts = dict(selected)
+    # 대소문자/문장부호/단어 순서만 다른 리뷰는 첫 문장으로 합쳐짐
+    assert counts["The seat was very comfortable and the crew was friendly"] == 4
+    assert counts["Food was cold and the flight was delayed by three hours"] == 2
+    assert counts["Lounge access was excellent"] == 1
+
+
+def test_near_duplicates_and_blank_reviews_are_dropped():
+    selected, _ = pack_reviews(REVIEWS, token_budget=1000)
+    reviews = [review for review, _ in selected]
+    assert "The crew was friendly and the seat was very comfortable" not in reviews
+    assert all(review.strip() for review in reviews)
+    assert len(reviews) == 3
+
+
+def test_packing_stops_when_no_line_can_fit(monkeypatch):
+    calls = []
+    monkeypatch.setattr(prompt_packing, "count_tokens", lambda text: calls.append(text) or 10)
+    prompt_packing._min_line_tokens.cache_clear()
+    reviews = [f"review number {i}" for i in range(100)]
+    selected, used = pack_reviews(reviews, token_budget=35)
+    prompt_packing._min_line_tokens.cache_clear()
+    assert (len(selected), used) == (3, 33)
+    # 남은 예산(2)이 가장 짧은 줄보다 작아지면 나머지 후보의 토큰 수는 세지 않음
+    assert len(calls) == 1 + 3
+
+
+@pytest.mark.parametrize("budget", [0, 5, 20, 40, 1000])
+def test_selection_stays_within_budget(budget):
+    selected, used = pack_reviews(REVIEWS * 5, token_budget=budget)
+    assert used == _cost(selected)
+    assert used <= budget
+
+
+def test_most_frequent_reviews_are_kept_first():
+    budget = count_tokens(format_review(REVIEWS[0], 4)) + 1
+    selected, used = pack_reviews(REVIEWS, token_budget=budget)
+    assert selected == [(REVIEWS[0], 4)]
+    assert used == budget
+
+
+def test_segments_are_covered_before_second_picks():
+    reviews = ["Seat was great"] * 5 + ["Seats were fine overall"] * 4 + ["Staff were rude"]
+    segments = ["비즈니스"] * 9 + ["이코노미"]
+    selected, _ = pack_reviews(reviews, token_budget=1000, segments=segments)
+    assert [review for review, _ in selected] == ["Seat was great", "Staff were rude", "Seats were fine overall"]
+
+
+def test_pack_prompt_reports_counts():
+    prompt = pack_prompt("다음 리뷰를 요약해 주세요.", REVIEWS, token_budget=1000)
+    assert prompt.startswith("다음 리뷰를 요약해 주세요.\n\n- ")
+    assert prompt.review_count == 3
+    assert prompt.total_reviews == len(REVIEWS)
+    assert prompt.token_count == count_tokens(str(prompt))
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from src.report_generator import build_segment_prompts
+
+
+def _frame(with_clusters):
+    frame = pd.DataFrame({
+        'SeatType': ['Business Class', 'Business Class', 'Economy Class', 'Economy Class'],
+        'Recommended': ['yes', 'no', 'yes', 'yes'],
+        'Adjectives/Adverbs': ['great comfortable', 'slow', 'good', 'friendly'],
+    })
+    if with_clusters:
+        frame['ClusterID'] = [0, 1, 2, 2]
+    return frame
+
+
+def test_segment_prompts_are_keyed_like_dashboard_clusters(tmp_path):
+    path = tmp_path / "reviews.csv"
+    _frame(with_clusters=True).to_csv(path, index=False)
+    prompts = build_segment_prompts(str(path))
+    assert sorted(prompts) == ['비즈니스_비추천_1', '비즈니스_추천_0', '이코노미_추천_2']
+    assert prompts['이코노미_추천_2'].review_count == 2
+
+
+def test_segment_prompts_without_cluster_ids_fall_back_to_seat_and_sentiment(tmp_path):
+    path = tmp_path / "reviews.csv"
+    _frame(with_clusters=False).to_csv(path, index=False)
+    prompts = build_segment_prompts(str(path))
+    assert sorted(prompts) == ['비즈니스_비추천', '비즈니스_추천', '이코노미_추천']
+    assert "이코노미 좌석 고객" in prompts['이코노미_추천']
@@ -0,0 +1,117 @@
+import asyncio
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+import src.scheduler as scheduler
+from src.scheduler import RateLimiter, ReportScheduler, TokenBucket, retry_after_seconds
+
+
+class FakeClock:
+    """time.monotonic / asyncio.sleep 대용: sleep하면 실제로 기다리지 않고 시계만 앞으로 감"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+        self._sleep = asyncio.sleep
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += max(seconds, 0)
+        await self._sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(scheduler.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def _rate_limit_error(headers):
+    # SDK의 HTTP 응답 객체 대신 헤더/상태 코드만 가진 객체 사용
+    response = SimpleNamespace(status_code=429, headers=headers, request=None)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def test_token_bucket_allows_a_burst_then_waits_for_refill(clock):
+    async def run():
+        bucket = TokenBucket(60)  # 초당 1개, 한 번에 10개까지
+        for _ in range(10):
+            await bucket.acquire(1)
+        burst_sleeps = list(clock.sleeps)
+        await bucket.acquire(1)
+        return burst_sleeps
+
+    assert asyncio.run(run()) == []
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_token_bucket_caps_oversized_requests_at_capacity(clock):
+    async def run():
+        bucket = TokenBucket(600)  # 초당 10개, 한 번에 100개까지
+        await bucket.acquire(100)
+        await bucket.acquire(10_000)
+
+    asyncio.run(run())
+    # 버킷보다 큰 요청은 가득 찰 때(10초)까지만 기다림
+    assert sum(clock.sleeps) == pytest.approx(10.0)
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after-ms": "1500"}, 1.5),
+    ({"retry-after": "3"}, 3.0),
+    ({"retry-after": "soon"}, None),
+    ({}, None),
+])
+def test_retry_after_seconds(headers, expected):
+    assert retry_after_seconds(_rate_limit_error(headers)) == expected
+
+
+def test_backoff_uses_retry_after_with_jitter():
+    schedule = ReportScheduler(base_delay=0.5, max_delay=8)
+    for attempt in range(5):
+        assert 2.0 <= schedule.backoff_delay(attempt, _rate_limit_error({"retry-after": "2"})) <= 2.5
+        assert 0 <= schedule.backoff_delay(attempt, _rate_limit_error({})) <= min(8, 0.5 * 2 ** attempt)
+
+
+def test_rate_limiter_pause_blocks_until_resume(clock):
+    limiter = RateLimiter(rpm=600, tpm=600_000)
+    limiter.pause(4)
+    asyncio.run(limiter.acquire(10))
+    assert clock.sleeps == [pytest.approx(4.0)]
+
+
+def test_scheduler_retries_after_429_and_pauses_other_requests(clock, monkeypatch):
+    calls = []
+
+    async def fake_report(prompt, use_cache=True, max_retries=None, retries=0):
+        calls.append((prompt, retries))
+        if prompt == "a" and retries == 0:
+            raise _rate_limit_error({"retry-after": "5"})
+        return f"report {prompt}"
+
+    monkeypatch.setattr(scheduler, "get_report_from_gpt_async", fake_report)
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: low)
+    results = asyncio.run(ReportScheduler(max_concurrency=1).run({"a": "a", "b": "b"}, use_cache=False))
+
+    assert results["a"].report == "report a" and results["a"].attempts == 2
+    assert results["b"].report == "report b" and results["b"].attempts == 1
+    assert calls == [("a", 0), ("a", 1), ("b", 0)]
+    assert 5.0 in clock.sleeps
+
+
+def test_scheduler_gives_up_after_max_retries(clock, monkeypatch):
+    async def always_limited(prompt, **kwargs):
+        raise _rate_limit_error({"retry-after-ms": "10"})
+
+    monkeypatch.setattr(scheduler, "get_report_from_gpt_async", always_limited)
+    results = asyncio.run(ReportScheduler(max_retries=2).run({"a": "a"}, use_cache=False))
+    assert results["a"].attempts == 3
+    assert results["a"].error.startswith("RateLimitError")
+    assert results["a"].report is None
@@ -0,0 +1,88 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import src.snapshot as snapshot_module
+from src.aggregate_state import AggregateState
+from src.snapshot import MANIFEST_NAME, AnalysisSnapshot, list_snapshots, precompute, write_snapshot
+
+
+def _sorted_table(cube):
+    # parquet에서 읽은 큐브는 차원이 범주형이 아닌 문자열이므로 인덱스를 값 튜플로 다시 만들어 비교
+    table = cube.table.sort_index(axis=1).astype(float)
+    table.index = pd.MultiIndex.from_tuples(table.index.tolist(), names=table.index.names)
+    return table
+
+
+@pytest.fixture
+def csv_dir(reviews, tmp_path):
+    source = tmp_path / "data"
+    source.mkdir()
+    half = len(reviews) // 2
+    reviews.iloc[:half].to_csv(source / "day1.csv", index=False)
+    reviews.iloc[half:].reset_index(drop=True).to_csv(source / "day2.csv", index=False)
+    return source
+
+
+def test_precompute_round_trip(csv_dir, tmp_path):
+    path = precompute(str(csv_dir), out_root=str(tmp_path / "snapshots"))
+    snapshot = AnalysisSnapshot.open(path)
+
+    frames = [pd.read_csv(csv_dir / name) for name in ("day1.csv", "day2.csv")]
+    expected = AggregateState.from_frame(frames[0]).merge(AggregateState.from_frame(frames[1]))
+    assert len(snapshot) == expected.rows
+    pd.testing.assert_frame_equal(_sorted_table(snapshot.state.cube), _sorted_table(expected.cube))
+    assert snapshot.analysis["strengths_weaknesses"] == expected.strengths_weaknesses()
+    assert snapshot.state.keyword_index.top_k(10, sentiment='추천') == expected.keyword_index.top_k(10, sentiment='추천')
+    pd.testing.assert_frame_equal(snapshot.analysis["cluster_stats"], expected.analysis()["cluster_stats"],
+                                  check_dtype=False)
+    assert [(p, m["name"]) for p, m in list_snapshots(str(tmp_path / "snapshots"))] == [(path, "data")]
+
+
+def test_append_equals_precomputing_all_files(csv_dir, tmp_path):
+    first = precompute(str(csv_dir / "day1.csv"), out_root=str(tmp_path / "a"), name="reviews")
+    appended = AnalysisSnapshot.open(precompute(str(csv_dir), out_root=str(tmp_path / "a"), base=first))
+    full = AnalysisSnapshot.open(precompute(str(csv_dir), out_root=str(tmp_path / "b"), name="reviews"))
+
+    assert [f["sha256"] for f in appended.manifest["sources"]] == [f["sha256"] for f in full.manifest["sources"]]
+    assert appended.content_hash == full.content_hash
+    pd.testing.assert_frame_equal(_sorted_table(appended.state.cube), _sorted_table(full.state.cube))
+    assert appended.analysis["strengths_weaknesses"] == full.analysis["strengths_weaknesses"]
+    assert appended.state.keyword_index.frequencies() == full.state.keyword_index.frequencies()
+    # 이미 들어 있는 파일만 다시 추가하면 새 스냅샷을 만들지 않음
+    assert precompute(str(csv_dir / "day2.csv"), base=appended.path) == appended.path
+
+
+def test_rewriting_a_snapshot_leaves_no_temporary_directories(reviews, tmp_path):
+    state = AggregateState.from_frame(reviews)
+    out_dir = str(tmp_path / "reviews-v1")
+    write_snapshot(state, out_dir, {"name": "first"})
+    write_snapshot(state, out_dir, {"name": "second"})
+    assert os.listdir(tmp_path) == ["reviews-v1"]
+    # 완성된 스냅샷이 이미 있으면 그대로 둠 (디렉터리 이름에 원본 해시 + 버전이 들어 있음)
+    with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+        assert json.load(f)["name"] == "first"
+
+
+def test_snapshot_from_another_version_is_rejected(csv_dir, tmp_path):
+    path = precompute(str(csv_dir), out_root=str(tmp_path))
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["pipeline_version"] = "0"
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    with pytest.raises(ValueError):
+        AnalysisSnapshot.open(path)
+
+
+def test_failed_write_removes_its_temporary_directory(reviews, tmp_path, monkeypatch):
+    def broken_write(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot_module, "_write_snapshot_files", broken_write)
+    with pytest.raises(OSError):
+        write_snapshot(AggregateState.from_frame(reviews), str(tmp_path / "reviews-v1"), {"name": "reviews"})
+    assert os.listdir(tmp_path) == []
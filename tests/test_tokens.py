@@ -0,0 +1,80 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.aggregate_state import AggregateState
+from src.analysis import build_strengths_weaknesses, preprocess_data
+from src.keyword_index import build_keyword_index
+from src.tokens import tokenize_nouns
+
+
+def _row_nouns(text):
+    return [word.strip() for word in str(text).split(',') if word.strip()]
+
+
+def _counter_top(nouns_column, k):
+    # 토큰 배열 도입 전 방식: 그룹 안의 명사를 Counter로 세어 most_common (동률이면 그룹 안 첫 등장 순서)
+    counter = Counter(word for text in nouns_column.fillna('') for word in _row_nouns(text))
+    return counter.most_common(k)
+
+
+@pytest.fixture(scope="module")
+def processed(reviews):
+    return preprocess_data(reviews.copy())
+
+
+def test_tokenize_matches_per_row_split():
+    series = pd.Series(["crew, meal,,seat", None, "", " seat ,crew", "라운지,\t좌석 ,"])
+    tokens = tokenize_nouns(series)
+    assert [tokens.row_tokens(i) for i in range(len(tokens))] == [_row_nouns(text) for text in series.fillna('')]
+    assert list(tokens.vocab) == ["crew", "meal", "seat", "라운지", "좌석"]
+
+
+def test_ties_break_by_first_appearance_within_the_group():
+    # 전체 파일에서는 meal이 먼저 나오지만, 퍼스트 비추천 그룹 안에서는 crew가 먼저 나옴
+    frame = pd.DataFrame({
+        'SeatType': ['Economy Class', 'First Class', 'First Class', 'First Class'],
+        'Recommended': ['no', 'no', 'no', 'yes'],
+        'Nouns': ['meal', 'crew, meal', 'meal, crew', 'seat'],
+    })
+    processed = preprocess_data(frame)
+    seat = processed['SeatType'].iloc[1]
+    tokens = tokenize_nouns(processed['Nouns'])
+
+    _, weaknesses = build_strengths_weaknesses(processed, tokens)
+    assert weaknesses[seat] == "crew, meal"
+    mask = (processed['SeatType'] == seat).to_numpy() & (processed['sentiment'] == '비추천').to_numpy()
+    assert tokens.top_k(mask, 2) == [("crew", 2), ("meal", 2)]
+    index = build_keyword_index(processed, tokens)
+    assert index.top_k(2, SeatType=seat, sentiment='비추천') == [("crew", 2), ("meal", 2)]
+
+
+def test_strengths_weaknesses_match_counter(processed):
+    tokens = tokenize_nouns(processed['Nouns'])
+    strengths, weaknesses = build_strengths_weaknesses(processed, tokens)
+    for seat_class in processed['SeatType'].dropna().unique():
+        for result, sentiment in ((strengths, '추천'), (weaknesses, '비추천')):
+            group = processed[(processed['SeatType'] == seat_class) & (processed['sentiment'] == sentiment)]
+            expected = [word for word, _ in _counter_top(group['Nouns'], 5)] or ["데이터 없음"]
+            assert result[seat_class] == ", ".join(expected)
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"sentiment": "추천"},
+    {"SeatType": "이코노미", "sentiment": "비추천", "month": 6},
+])
+def test_keyword_index_top_k_matches_counter(processed, filters):
+    index = build_keyword_index(processed, tokenize_nouns(processed['Nouns']))
+    mask = np.ones(len(processed), dtype=bool)
+    for dim, value in filters.items():
+        mask &= (processed[dim] == value).to_numpy()
+    assert index.top_k(10, **filters) == _counter_top(processed['Nouns'][mask], 10)
+
+
+def test_merged_state_keeps_per_group_tie_order(reviews, processed):
+    half = len(reviews) // 2
+    merged = AggregateState.from_frame(reviews.iloc[:half]).merge(AggregateState.from_frame(reviews.iloc[half:]))
+    assert merged.strengths_weaknesses() == build_strengths_weaknesses(processed, tokenize_nouns(processed['Nouns']))
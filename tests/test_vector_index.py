@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from src.vector_index import ReviewIndex
+
+N_LISTS = 16
+
+
+@pytest.fixture(scope="module")
+def indexes(reviews, tmp_path_factory):
+    root = tmp_path_factory.mktemp("review_index")
+    flat = ReviewIndex.build(reviews, str(root / "flat"), n_lists=0)
+    ivf = ReviewIndex.build(reviews, str(root / "ivf"), n_lists=N_LISTS)
+    return flat, ivf
+
+
+def _queries(flat, count=10):
+    rng = np.random.default_rng(0)
+    return [np.asarray(flat.vectors[i], dtype=np.float32) for i in rng.choice(len(flat), count, replace=False)]
+
+
+def _assert_same_results(result, expected):
+    rows, scores = result
+    expected_rows, expected_scores = expected
+    np.testing.assert_allclose(scores, expected_scores, rtol=1e-6)
+    # 동점인 마지막 순위는 탐색 순서에 따라 다른 행이 나올 수 있으므로 그보다 높은 점수의 행만 비교
+    strict = expected_scores > expected_scores[-1]
+    assert set(rows[scores > scores[-1]]) == set(expected_rows[strict])
+
+
+def test_ivf_stores_the_same_vectors_in_list_order(indexes):
+    flat, ivf = indexes
+    assert not flat.is_ivf and ivf.is_ivf
+    assert len(ivf.list_offsets) == N_LISTS + 1 and ivf.list_offsets[-1] == len(flat)
+    np.testing.assert_array_equal(np.asarray(ivf.vectors)[ivf.positions], np.asarray(flat.vectors))
+
+
+def test_flat_search_matches_brute_force(indexes):
+    flat, _ = indexes
+    vectors = np.asarray(flat.vectors, dtype=np.float32)
+    for query in _queries(flat):
+        scores = vectors @ query
+        expected = np.argsort(-scores, kind='stable')[:5]
+        _assert_same_results(flat.search(query, k=5), (expected, scores[expected]))
+
+
+def test_ivf_probing_every_list_equals_flat_search(indexes):
+    flat, ivf = indexes
+    for query in _queries(flat):
+        _assert_same_results(ivf.search(query, k=5, n_probe=N_LISTS), flat.search(query, k=5))
+
+
+def test_ivf_with_few_probes_returns_correctly_scored_neighbours(indexes):
+    flat, ivf = indexes
+    vectors = np.asarray(flat.vectors, dtype=np.float32)
+    for query in _queries(flat):
+        rows, scores = ivf.search(query, k=5, n_probe=2)
+        np.testing.assert_allclose(scores, vectors[rows] @ query, rtol=1e-6)
+        assert list(scores) == sorted(scores, reverse=True)
+        # 질의 벡터 자신은 가장 가까운 리스트에 있으므로 항상 찾음
+        assert scores[0] == pytest.approx(flat.search(query, k=1)[1][0], rel=1e-6)
+
+
+def test_restricted_search_and_centroid_match_between_layouts(indexes, reviews):
+    flat, ivf = indexes
+    rows = np.flatnonzero((reviews['ClusterID'] == 1).to_numpy())
+    for query in _queries(flat, 3):
+        result = ivf.search(query, k=5, rows=rows)
+        assert set(result[0]) <= set(rows)
+        _assert_same_results(result, flat.search(query, k=5, rows=rows))
+    _assert_same_results(ivf.nearest_to_centroid(rows), flat.nearest_to_centroid(rows))
+
+
+def test_loading_into_memory_gives_the_same_results(reviews, indexes, tmp_path):
+    flat, ivf = indexes
+    path = str(tmp_path / "ivf")
+    ReviewIndex.build(reviews, path, n_lists=N_LISTS)
+    loaded = ReviewIndex.load(path, mmap=False)
+    assert not isinstance(loaded.vectors, np.memmap)
+    for query in _queries(flat, 3):
+        _assert_same_results(loaded.search(query, k=5), ivf.search(query, k=5))